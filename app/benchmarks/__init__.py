@@ -0,0 +1 @@
+"""Benchmarks run against local fixtures; see each module's usage line."""
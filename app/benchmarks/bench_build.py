@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental vs clean zensical builds after a one-episode change.
+
+Copies a site's config and static docs into a temporary directory, generates
+synthetic episode pages with transcript tables, builds once to warm
+zensical's cache, then edits one episode and times a clean build
+(`zensical build --clean`, the old behaviour) against the incremental build
+build_site now chooses.
+
+Usage:
+    cd app && uv run python -m benchmarks.bench_build --episodes 200
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from constants import SITE_ROOT
+from tasks.build import BUILD_MANIFEST, _NON_SOURCES, needs_clean_build, run_zensical
+from utils.manifest import build_manifest, save_manifest
+
+
+def _episode_page(n: int, rows: int, edit: str = "") -> str:
+    lines = "".join(
+        f"|Speaker {k % 3}|Line {k} of the transcript for episode {n}, about watches and straps.|\n"
+        for k in range(rows))
+    return (f"# Episode {n}\n\n## Synopsis\nSynthetic episode {n}.{edit}\n\n"
+            f"## Transcript\n|*Speaker*||\n|----|----|\n{lines}")
+
+
+def _build(site_dir: Path, clean: bool) -> float:
+    start = time.perf_counter()
+    run_zensical(site_dir, clean)
+    elapsed = time.perf_counter() - start
+    save_manifest(site_dir / BUILD_MANIFEST, build_manifest(site_dir, exclude=_NON_SOURCES))
+    return elapsed
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--podcast", default="tgn", help="Site to copy config and static docs from")
+    p.add_argument("--episodes", type=int, default=200)
+    p.add_argument("--rows", type=int, default=800, help="Transcript rows per episode")
+    args = p.parse_args()
+
+    logger.remove()  # zensical's per-page warnings would drown the results
+    with tempfile.TemporaryDirectory() as tmp:
+        site_dir = Path(tmp) / args.podcast
+        shutil.copytree(Path(SITE_ROOT, args.podcast), site_dir,
+                        ignore=shutil.ignore_patterns(*_NON_SOURCES))
+        for n in range(1, args.episodes + 1):
+            (site_dir / "docs" / str(n)).mkdir(exist_ok=True)
+            (site_dir / "docs" / str(n) / "episode.md").write_text(_episode_page(n, args.rows))
+
+        print(f"{args.episodes} episodes x {args.rows} transcript rows")
+        print(f"  initial clean build {_build(site_dir, clean=True):7.2f}s")
+
+        results = {}
+        for label, clean in [("clean", True), ("incremental", False)]:
+            edit = f" Edited for the {label} run."
+            (site_dir / "docs" / "1" / "episode.md").write_text(_episode_page(1, args.rows, edit))
+            if not clean:
+                reason = needs_clean_build(site_dir, build_manifest(site_dir, exclude=_NON_SOURCES))
+                assert reason is None, f"expected an incremental build, got: {reason}"
+            results[label] = _build(site_dir, clean)
+            assert edit in (site_dir / "site" / "1" / "episode" / "index.html").read_text()
+            print(f"  {label:<19} {results[label]:7.2f}s  (after a one-episode edit)")
+        print(f"  speedup             {results['clean'] / results['incremental']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
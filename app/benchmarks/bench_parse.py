@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark parsing Substack episode pages for show-note links.
+
+Compares how scrape.run used to handle a Substack page (a full lxml soup that
+was thrown away, then a second full parse inside extract_substack_any) with a
+single full parse and with the body-only parse extract_substack_any now does.
+
+Pages come from --pages-dir (saved *.html Substack posts) or, by default,
+are generated to resemble one: a large head with inline scripts and styles,
+navigation, the post body with show notes, and a comment section.
+
+Usage:
+    cd app && uv run python -m benchmarks.bench_parse
+    cd app && uv run python -m benchmarks.bench_parse --pages-dir ~/saved-substack
+"""
+import argparse
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from related_links_collector.extractors import extract_substack_any
+
+BASE_URL = "https://thegreynato.substack.com/p/episode"
+
+
+def _synthetic_page(n: int) -> str:
+    scripts = "".join(
+        f"<script>window._preloads_{k} = {{\"post\": {{\"id\": {n}, \"body\": \"{'x' * 400}\"}}}};</script>"
+        for k in range(30))
+    styles = "".join(f"<style>.c{k} {{ color: #{k:06x}; margin: 0 {k}px; }}</style>" for k in range(30))
+    nav = "".join(f'<li><a href="/p/other-{k}" class="nav-link">Post {k}</a></li>' for k in range(60))
+    intro = "".join(f"<p>Paragraph {k} about watches, straps and movements.</p>" for k in range(15))
+    notes = "<br/>".join(
+        f'Link {k}: <a href="https://bit.ly/tgn{n}x{k}">https://bit.ly/tgn{n}x{k}</a>'
+        for k in range(25))
+    comments = "".join(
+        f'<div class="comment"><div class="comment-meta"><a href="/@user{k}">user{k}</a>'
+        f'<span>Jan {k % 28 + 1}</span></div><div class="comment-body"><p>Great episode! '
+        f'{"More thoughts. " * 10}</p></div><button class="like">Like</button></div>'
+        for k in range(80))
+    return (f"<!DOCTYPE html><html><head><title>Episode {n}</title>{styles}{scripts}</head><body>"
+            f"<nav><ul>{nav}</ul></nav><div class=\"post\"><h1>Episode {n}</h1>"
+            f"<div class=\"available-content\"><div dir=\"auto\" class=\"body markup\">"
+            f"{intro}<h3>Show Notes</h3><p>{notes}</p></div></div></div>"
+            f"<div class=\"comments\">{comments}</div><footer>{nav}</footer></body></html>")
+
+
+def _double_parse(html: str) -> list:
+    BeautifulSoup(html, "lxml")
+    return extract_substack_any(BeautifulSoup(html, "lxml"), BASE_URL)
+
+
+def _full_parse(html: str) -> list:
+    return extract_substack_any(BeautifulSoup(html, "lxml"), BASE_URL)
+
+
+def _body_parse(html: str) -> list:
+    return extract_substack_any(html, BASE_URL)
+
+
+def bench(pages: list, fn, repeat: int) -> tuple[float, int]:
+    """Return (best milliseconds per page, links found) over `repeat` passes."""
+    best, found = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = sum(len(fn(html)) for html in pages)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 / len(pages), found
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--pages-dir", type=Path, help="Directory of saved Substack *.html pages")
+    p.add_argument("--pages", type=int, default=50, help="Synthetic pages to generate")
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    if args.pages_dir:
+        pages = [f.read_text(encoding="utf-8") for f in sorted(args.pages_dir.glob("*.html"))]
+    else:
+        pages = [_synthetic_page(n) for n in range(args.pages)]
+    if not pages:
+        p.error("no pages to parse")
+
+    size_kb = sum(len(h) for h in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size_kb:.0f} KB average")
+    results = {}
+    for label, fn in [("two parses", _double_parse), ("one parse", _full_parse),
+                      ("body only", _body_parse)]:
+        ms, found = bench(pages, fn, args.repeat)
+        results[label] = ms
+        print(f"  {label:<11} {ms:7.2f} ms/page  {found} links")
+    print(f"  body only vs two parses {results['two parses'] / results['body only']:.1f}x, "
+          f"vs one parse {results['one parse'] / results['body only']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
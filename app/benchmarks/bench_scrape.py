@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark related_links_collector.scrape.run against a local HTTP fixture server.
+
+Serves synthetic episode pages from several ports (each port is a separate
+"domain" to the per-domain rate limiter) plus a fake shortener that redirects
+to a local destination. Every response is delayed to mimic network latency.
+Compares a serial configuration (one page, one link lookup at a time) with
+the concurrent defaults.
+
+Usage:
+    cd app && uv run python -m benchmarks.bench_scrape --domains 3 --pages 20
+"""
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from related_links_collector import resolvers, shortlinks
+from related_links_collector.scrape import run as scrape_run
+
+LINKS_PER_PAGE = 10
+
+
+def _handler(latency: float, shortener: str):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _respond(self, body: bytes = b""):
+            time.sleep(latency)
+            if self.path.startswith("/s/"):
+                self.send_response(302)
+                self.send_header("Location", f"/dest/{self.path[3:]}")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command == "GET":
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            self._respond()
+
+        def do_GET(self):
+            body = b"ok"
+            if self.path.startswith("/p/"):
+                n = f"{self.server.server_address[1]}-{self.path[3:]}"
+                links = "".join(
+                    f'<li><a href="http://{shortener}/s/{n}-{k}">Link {k}</a></li>'
+                    for k in range(LINKS_PER_PAGE))
+                body = (f"<html><body><h1>Episode {n}</h1><p>Notes.</p>"
+                        f"<h2>Related</h2><ul>{links}</ul></body></html>").encode()
+            self._respond(body)
+
+    return Handler
+
+
+def _serve(latency: float, shortener: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(latency, shortener))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench(domains: int, pages: int, latency: float, rate: float,
+          concurrency: int, link_concurrency: int) -> float:
+    """Scrape domains * pages fixture pages and return elapsed seconds."""
+    short = _serve(latency, "")
+    shortener = f"127.0.0.1:{short.server_address[1]}"
+    short.RequestHandlerClass = _handler(latency, shortener)
+    servers = [_serve(latency, shortener) for _ in range(domains)]
+    resolvers.SHORTENER_HOSTS.add(shortener)
+    saved_store = shortlinks._default
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            # Fresh shortlink store so every run resolves over the network
+            shortlinks._default = shortlinks.ShortlinkStore(tmp / "shortlinks.db")
+            urls = [f"http://127.0.0.1:{s.server_address[1]}/p/{n}"
+                    for n in range(pages) for s in servers]
+            (tmp / "urls.txt").write_text("\n".join(urls) + "\n")
+            start = time.perf_counter()
+            scrape_run(str(tmp / "urls.txt"), str(tmp / "out.jsonl"), str(tmp / "exc.jsonl"),
+                       rate=rate, log=logging.getLogger("bench"),
+                       concurrency=concurrency, link_concurrency=link_concurrency)
+            elapsed = time.perf_counter() - start
+            lines = (tmp / "out.jsonl").read_text().splitlines()
+            assert len(lines) == len(urls), f"expected {len(urls)} records, got {len(lines)}"
+            return elapsed
+    finally:
+        resolvers.SHORTENER_HOSTS.discard(shortener)
+        shortlinks._default = saved_store
+        for s in [short, *servers]:
+            s.shutdown()
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--domains", type=int, default=3)
+    p.add_argument("--pages", type=int, default=20, help="Pages per domain")
+    p.add_argument("--latency", type=float, default=0.03, help="Seconds added to every response")
+    p.add_argument("--rate", type=float, default=0.05, help="Per-domain delay between page fetches")
+    args = p.parse_args()
+
+    total = args.domains * args.pages
+    print(f"{total} pages x {LINKS_PER_PAGE} shortlinks, {args.latency * 1000:.0f} ms latency, "
+          f"{args.rate:.2f}s per-domain rate")
+    results = {}
+    for label, conc, link_conc in [("serial", 1, 1), ("concurrent", 8, 4)]:
+        elapsed = bench(args.domains, args.pages, args.latency, args.rate, conc, link_conc)
+        results[label] = elapsed
+        print(f"  {label:<11} {elapsed:6.2f}s  {total / elapsed:6.1f} pages/s")
+    print(f"  speedup     {results['serial'] / results['concurrent']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
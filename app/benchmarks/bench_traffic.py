@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark decoding and analyzing Caddy JSON access logs.
+
+Writes a synthetic log shaped like Caddy's (full request, TLS and response
+header blocks; a realistic mix of IPs, pages, assets, bots and browsers),
+then times, per million lines:
+
+- legacy:  json.loads of the stripped line, then walking request.headers
+           the way load_logs/analyze used to
+- decode:  traffic_analytics.decode_line with the stdlib json parser
+- orjson:  decode_line with orjson (what read_records uses when installed)
+- analyze: read_records + rollup, the whole per-file path of the report
+
+Usage:
+    cd app && uv run python -m benchmarks.bench_traffic
+    cd app && uv run python -m benchmarks.bench_traffic --lines 200000
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import traffic_analytics as ta
+
+UAS = [
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_{} like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+    "Version/17.0 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/12{}.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:12{}.0) Gecko/20100101 Firefox/12{}.0",
+    "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/12{}.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html) v{}",
+    "Mozilla/5.0 AppleWebKit/537.36 (KHTML, like Gecko; compatible; GPTBot/1.{}; +https://openai.com/gptbot)",
+    "Mozilla/5.0 (compatible; AhrefsBot/7.{}; +http://ahrefs.com/robot/)",
+]
+ASSETS = ["/assets/javascripts/bundle.js", "/assets/stylesheets/main.css", "/img/logo.png",
+          "/pagefind/pagefind.js", "/pagefind/shards.json", "/favicon.ico"]
+PAGES = ["/", "/episodes/", "/search/", "/shownotes/"]
+REFERERS = ["", "", "", "https://tgn.phfactor.net/", "https://www.google.com/",
+            "https://thegreynato.substack.com/", "https://www.reddit.com/r/Watches/"]
+
+
+def _line(rng: random.Random, ts: float) -> str:
+    roll = rng.random()
+    if roll < 0.4:
+        uri = rng.choice(ASSETS)
+    elif roll < 0.8:
+        uri = f"/{rng.randint(1, 380)}/episode/"
+    else:
+        uri = rng.choice(PAGES)
+    headers = {
+        "Accept": ["text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"],
+        "Accept-Encoding": ["gzip, br"],
+        "Accept-Language": ["en-US,en;q=0.9"],
+        "Cdn-Loop": ["cloudflare; loops=1"],
+        "Cf-Connecting-Ip": [f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 80)}.{rng.randint(1, 254)}"],
+        "Cf-Ipcountry": [rng.choice(["US", "US", "GB", "DE", "CA", "AU", "JP"])],
+        "Cf-Ray": [f"{rng.getrandbits(64):016x}-SJC"],
+        "Cf-Visitor": ['{"scheme":"https"}'],
+        "User-Agent": [rng.choice(UAS).format(rng.randint(0, 9), rng.randint(0, 9))],
+        "X-Forwarded-For": ["172.70.1.1"],
+        "X-Forwarded-Proto": ["https"],
+    }
+    referer = rng.choice(REFERERS)
+    if referer:
+        headers["Referer"] = [referer]
+    return json.dumps({
+        "level": "info", "ts": ts, "logger": "http.log.access.log0", "msg": "handled request",
+        "request": {"remote_ip": "172.70.1.1", "remote_port": "40000", "client_ip": "172.70.1.1",
+                    "proto": "HTTP/2.0", "method": "GET", "host": "tgn.phfactor.net", "uri": uri,
+                    "headers": headers,
+                    "tls": {"resumed": False, "version": 772, "cipher_suite": 4865, "proto": "h2",
+                            "server_name": "tgn.phfactor.net"}},
+        "bytes_read": 0, "user_id": "", "duration": rng.random() / 100, "size": rng.randint(200, 90000),
+        "status": rng.choice([200, 200, 200, 200, 304, 404]),
+        "resp_headers": {"Server": ["Caddy"], "Content-Type": ["text/html; charset=utf-8"],
+                         "Etag": [f'"{rng.getrandbits(32):x}"'], "Vary": ["Accept-Encoding"]},
+    })
+
+
+def _legacy(line: bytes):
+    """Decode as load_logs + analyze did before decode_line."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        rec = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    req = rec.get('request', {})
+    headers = req.get('headers', {})
+    cf_ip_list = headers.get('Cf-Connecting-Ip', [])
+    ua_list = headers.get('User-Agent', [''])
+    country_list = headers.get('Cf-Ipcountry', ['??'])
+    referer_list = headers.get('Referer', [])
+    return (rec.get('ts', 0), req.get('uri', ''), req.get('method', ''), rec.get('status', 0),
+            rec.get('size', 0), cf_ip_list[0] if cf_ip_list else req.get('remote_ip', 'unknown'),
+            ua_list[0] if ua_list else '', country_list[0] if country_list else '??',
+            referer_list[0] if referer_list else '')
+
+
+def _time_decode(path: Path, decode) -> float:
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        for line in f:
+            decode(line)
+    return time.perf_counter() - start
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--lines", type=int, default=1_000_000)
+    p.add_argument("--days", type=int, default=30, help="Days the synthetic traffic spans")
+    args = p.parse_args()
+
+    rng = random.Random(42)
+    start_ts = time.time() - args.days * 86400
+    step = args.days * 86400 / args.lines
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tgn.log"
+        with open(path, "w") as f:
+            for i in range(args.lines):
+                f.write(_line(rng, start_ts + i * step) + "\n")
+        print(f"{args.lines:,} lines, {path.stat().st_size / 1024 / 1024:.0f} MB")
+
+        results = {
+            "legacy": _time_decode(path, _legacy),
+            "decode": _time_decode(path, lambda line: ta.decode_line(line, loads=json.loads)),
+            "orjson": _time_decode(path, ta.decode_line),
+        }
+        if ta._json_loads is json.loads:
+            print("  (orjson not installed: 'orjson' row uses json)")
+        start = time.perf_counter()
+        days = ta.rollup(ta.read_records(path))
+        results["analyze"] = time.perf_counter() - start
+        assert sum(d["total_requests"] for d in days.values()) == args.lines
+
+        per_million = 1_000_000 / args.lines
+        for label, elapsed in results.items():
+            print(f"  {label:<8} {elapsed * per_million:6.2f}s per million lines  "
+                  f"({args.lines / elapsed:,.0f} lines/s)")
+        cache = ta.ua_cache_stats()
+        print(f"  User-Agent cache hit rate {cache['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
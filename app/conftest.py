@@ -0,0 +1,71 @@
+"""Shared test fixtures: a local SMTP stand-in for mail tests."""
+import socketserver
+import threading
+from email import message_from_bytes
+
+import pytest
+
+from utils.email import Mailer
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Just enough of an SMTP server for smtplib: EHLO, AUTH PLAIN, MAIL/RCPT/DATA, QUIT."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.drop_after_message = False  # close the session after each message, like an idle timeout
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, text):
+        self.wfile.write(text.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stand-in ESMTP")
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                self.reply("250-stand-in\r\n250 AUTH PLAIN")
+            elif command.startswith("AUTH"):
+                server.logins += 1
+                self.reply("235 Authentication successful")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data += chunk
+                server.messages.append(message_from_bytes(data))
+                self.reply("250 Queued")
+                if server.drop_after_message:
+                    return
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+@pytest.fixture
+def smtp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # no stray .no_email
+    server = SMTPStandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mailer(smtp):
+    """A Mailer pointed at the stand-in (plain SMTP, dummy credentials)."""
+    return Mailer(host="127.0.0.1", port=smtp.server_address[1], username="u",
+                  password="p", use_ssl=False, timeout=5)
@@ -14,6 +14,7 @@ from pathlib import Path
 
 # Use absolute path to avoid issues when running from different directories
 SITE_ROOT = str(Path(__file__).parent.parent / 'sites')
+PODCAST_ROOT = str(Path(__file__).parent.parent / 'podcasts')
 system_admin = getenv('SYSTEM_ADMIN_EMAIL', 'tgn-whisperer@phfactor.net')
 
 # SMTP Configuration
@@ -27,6 +28,15 @@ TRANSCRIPTION_API_BASE_URL = getenv('TRANSCRIPTION_API_BASE_URL', 'http://stt.ph
 
 # Deployment Configuration
 DEPLOY_BASE_PATH = getenv('DEPLOY_BASE_PATH', '/usr/local/www')
+# 'release': delta copy into a new release directory, then atomic symlink swap; 'rsync': legacy in-place rsync
+DEPLOY_MODE = getenv('DEPLOY_MODE', 'release')
+DEPLOY_KEEP_RELEASES = int(getenv('DEPLOY_KEEP_RELEASES', '5'))
+# 'link': episode MP3s stay in podcasts/<name>/<n>/ and are symlinked into the deployed site;
+# 'copy': legacy, MP3s are copied into sites/<name>/docs/<n>/ and go through the build
+MEDIA_MODE = getenv('MEDIA_MODE', 'link')
+
+# Pipeline state database (episode stage records, notification history)
+PIPELINE_STATE_DB = getenv('PIPELINE_STATE_DB', str(Path(__file__).parent.parent / 'pipeline-state.db'))
 
 # Claude/Anthropic Configuration
 CLAUDE_MODEL = getenv('CLAUDE_MODEL', 'claude-sonnet-4-5')
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Per-episode audience analytics from Caddy logs joined with the podcast feed.
+
+The traffic dashboard counts /N/episode/ page views in total, but not when
+they happened relative to publication, and MP3 requests never count as page
+views. This report folds the same log records (traffic_analytics.load_logs)
+once, joins them with episode numbers and publish dates from the feed, and
+produces for each episode:
+
+- read curve: human views of /N/episode/ per day since publication
+- listen curve: MP3 downloads per day since publication, counting a
+  download when a request covers the start of the file (no Range header,
+  or Range starting at byte 0), as podcast players issue many
+  byte-range requests per listen
+- audio bytes served, unique listeners (UniqueCounter, with error bound)
+- hours from publication to the first view and the first download
+
+Usage:
+    uv run python app/episode_analytics.py
+    uv run python app/episode_analytics.py --feed tgn_feed.rss --days 60 --output audience.json
+"""
+import argparse
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import xmltodict
+
+import traffic_analytics as ta
+from utils.uniques import UniqueCounter
+
+FEED_PATH = Path(__file__).parent.parent / f"{ta.LOG_PREFIX}_feed.rss"
+OUTPUT_PATH = Path(f"{ta.LOG_PREFIX}_episode_audience.json")
+# Statuses of MP3 responses that delivered audio (full or partial)
+AUDIO_STATUSES = (200, 206)
+
+
+@dataclass
+class Episode:
+    """An episode from the feed: the join key and its publication time."""
+    number: str
+    title: str
+    published: float  # Unix timestamp
+
+
+@dataclass
+class EpisodeAudience:
+    """Read and listen activity for one episode, bucketed by days since publication."""
+    views: Counter = field(default_factory=Counter)
+    downloads: Counter = field(default_factory=Counter)
+    audio_bytes: Counter = field(default_factory=Counter)
+    listeners: UniqueCounter = field(default_factory=UniqueCounter)
+    first_view: float | None = None
+    first_download: float | None = None
+
+
+def load_episodes(feed_path: Path) -> dict[str, Episode]:
+    """Return {episode number: Episode} for feed items with an itunes:episode and pubDate."""
+    channel = xmltodict.parse(Path(feed_path).read_text())['rss']['channel']
+    items = channel.get('item', [])
+    if not isinstance(items, list):
+        items = [items]
+    episodes = {}
+    for item in items:
+        number, pub_date = item.get('itunes:episode'), item.get('pubDate')
+        if not number or not pub_date:
+            continue
+        try:
+            published = parsedate_to_datetime(pub_date).timestamp()
+        except (TypeError, ValueError):
+            continue
+        number = ta.normalize_episode_number(str(number))
+        episodes[number] = Episode(number, item.get('title', ''), published)
+    return episodes
+
+
+def starts_download(byte_range: str) -> bool:
+    """True for a request that covers the start of the file (whole file, or bytes=0-...)."""
+    return not byte_range or byte_range.replace(' ', '').startswith('bytes=0-')
+
+
+def fold_audience(records, episodes: dict[str, Episode]) -> dict[str, EpisodeAudience]:
+    """
+    Fold log records into per-episode audience stats in a single pass.
+
+    Only human GET requests for episodes in the feed are counted. Each
+    record is matched against the page and MP3 URI patterns once and
+    dropped, so memory is bounded by the number of episodes.
+    """
+    audience = {}
+    for rec in records:
+        if rec.method != 'GET':
+            continue
+        ep = ta.parse_episode_from_uri(rec.uri)
+        is_audio = ep is None
+        if is_audio:
+            ep = ta.parse_episode_audio_uri(rec.uri)
+        episode = episodes.get(ep) if ep else None
+        if episode is None or ta.classify_user_agent(rec.user_agent).is_bot:
+            continue
+
+        stats = audience.get(ep)
+        if stats is None:
+            stats = audience[ep] = EpisodeAudience()
+        day = max(int((rec.ts - episode.published) // 86400), 0)
+        if not is_audio:
+            stats.views[day] += 1
+            if stats.first_view is None or rec.ts < stats.first_view:
+                stats.first_view = rec.ts
+        elif rec.status in AUDIO_STATUSES:
+            stats.audio_bytes[day] += rec.size
+            stats.listeners.add(rec.client_ip)
+            if starts_download(rec.range):
+                stats.downloads[day] += 1
+                if stats.first_download is None or rec.ts < stats.first_download:
+                    stats.first_download = rec.ts
+    return audience
+
+
+def _curve(counts: Counter, days: int) -> list[int]:
+    """Cumulative counts for days 0..days-1 since publication."""
+    total, curve = 0, []
+    for day in range(days):
+        total += counts.get(day, 0)
+        curve.append(total)
+    return curve
+
+
+def _hours_after(ts: float | None, published: float) -> float | None:
+    return None if ts is None else round(max(ts - published, 0) / 3600, 1)
+
+
+def audience_report(audience: dict[str, EpisodeAudience], episodes: dict[str, Episode],
+                    days: int = 30) -> list[dict]:
+    """
+    Build per-episode rows, newest episode first.
+
+    Episodes in the feed with no traffic are included with zero counts, so
+    the report also shows what nobody has read or listened to.
+    """
+    rows = []
+    for number, episode in sorted(episodes.items(), key=lambda e: e[1].published, reverse=True):
+        stats = audience.get(number, EpisodeAudience())
+        rows.append({
+            'episode': number,
+            'title': episode.title,
+            'published': episode.published,
+            'views': sum(stats.views.values()),
+            'downloads': sum(stats.downloads.values()),
+            'audio_mb': round(sum(stats.audio_bytes.values()) / 1024 / 1024, 1),
+            'listeners': len(stats.listeners),
+            'listeners_error': stats.listeners.error_bound(),
+            'hours_to_first_view': _hours_after(stats.first_view, episode.published),
+            'hours_to_first_download': _hours_after(stats.first_download, episode.published),
+            'read_curve': _curve(stats.views, days),
+            'listen_curve': _curve(stats.downloads, days),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-episode read and listen analytics")
+    parser.add_argument("--feed", type=Path, default=FEED_PATH, help=f"Podcast feed (default: {FEED_PATH})")
+    parser.add_argument("--days", type=int, default=30, help="Days since publication covered by the curves")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    episodes = load_episodes(args.feed)
+    print(f"Loaded {len(episodes)} episodes from {args.feed}", flush=True)
+    audience = fold_audience(ta.load_logs(), episodes)
+    rows = audience_report(audience, episodes, args.days)
+    args.output.write_text(json.dumps(rows, indent=1))
+    print(f"Report written to {args.output.resolve()}")
+    for row in rows[:10]:
+        print(f"  {row['episode']:>6}  {row['views']:6,} views  {row['downloads']:5,} downloads  "
+              f"first view after {row['hours_to_first_view']}h  {row['title'][:50]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 from pathlib import Path
 from prefect import flow
 from utils.logging import get_logger
+from utils.state import PipelineState, hash_inputs
 
 from models.podcast import Podcast
 from tasks.download import (
@@ -38,6 +39,9 @@ def process_episode(podcast: Podcast, episode_entry: dict):
     7. Generate episode markdown
     8. Copy files to site directory
 
+    Each stage run is recorded in the pipeline state store with its timing,
+    input hash and any error.
+
     Args:
         podcast: Podcast configuration object
         episode_entry: Episode RSS entry dictionary
@@ -52,22 +56,27 @@ def process_episode(podcast: Podcast, episode_entry: dict):
 
     log.info(f"Processing episode: {podcast.name} #{episode_number}")
 
+    state = PipelineState()
+
     # Step 1: Create directories
     episode_dir, site_dir = create_episode_directories(podcast.name, episode_number)
 
     # Step 2: Download MP3
-    mp3_path = download_mp3(episode_dir, episode_data['mp3_url'])
+    with state.track(podcast.name, episode_number, 'download', hash_inputs(episode_data['mp3_url'])):
+        mp3_path = download_mp3(episode_dir, episode_data['mp3_url'])
 
     # Step 3: Transcribe audio (blocking call to Mac Studio)
     # Note: This blocks for ~90 seconds, which is fine since it's a LAN call
-    transcript_path = transcribe_audio(episode_dir, podcast.name, episode_number, mp3_path)
+    with state.track(podcast.name, episode_number, 'transcribe', hash_inputs(mp3_path)):
+        transcript_path = transcribe_audio(episode_dir, podcast.name, episode_number, mp3_path)
 
     # Step 4: Download HTML in parallel with attribution (skip for Hodinkee - no episode pages)
     if podcast.name != 'hodinkee':
         html_future = download_episode_html.submit(episode_dir, episode_data['episode_url'])
 
     # Step 5: Attribute speakers using Claude
-    speaker_map_path, synopsis_path = attribute_speakers(episode_dir, transcript_path, podcast.name)
+    with state.track(podcast.name, episode_number, 'attribute', hash_inputs(transcript_path)):
+        speaker_map_path, synopsis_path = attribute_speakers(episode_dir, transcript_path, podcast.name)
 
     # Wait for HTML download to complete (best-effort, non-blocking)
     if podcast.name != 'hodinkee':
@@ -75,10 +84,12 @@ def process_episode(podcast: Podcast, episode_entry: dict):
 
     # Step 6: Get episode shownotes and generate markdown
     episode_shownotes = get_episode_shownotes(podcast.name, episode_entry)
-    md_path = generate_episode_markdown(episode_dir, episode_data, speaker_map_path, synopsis_path, podcast.name, episode_shownotes)
+    with state.track(podcast.name, episode_number, 'markdown', hash_inputs(speaker_map_path, synopsis_path)):
+        md_path = generate_episode_markdown(episode_dir, episode_data, speaker_map_path, synopsis_path, podcast.name, episode_shownotes)
 
     # Step 7: Copy files to site directory
-    copy_episode_files(episode_dir, site_dir)
+    with state.track(podcast.name, episode_number, 'publish', hash_inputs(md_path)):
+        copy_episode_files(episode_dir, site_dir)
 
     log.info(f"Episode processing complete: {podcast.name} #{episode_number}")
     return md_path
@@ -2,7 +2,8 @@
 import traceback
 from prefect import flow, tags
 from utils.logging import get_logger
-from utils.email import send_failure_alert
+from utils.email import mail_session, send_failure_alert
+from utils.outbox import outbox_worker
 
 from models.podcast import get_all_podcasts
 from flows.podcast import process_podcast
@@ -16,29 +17,33 @@ def process_all_podcasts():
     Each podcast flow runs independently and handles its own site generation.
     Sequential processing ensures proper resource management (transcription service, etc).
 
-    Sends email alert on failure for monitoring.
+    Sends email alert on failure for monitoring. All email in the run shares
+    one SMTP session, and failure alerts go out as a single digest at the end.
+    New-episode notifications are queued in the outbox and delivered by a
+    background worker, so mail never blocks processing.
     """
     log = get_logger()
     log.info("Starting podcast processing for all feeds")
 
-    try:
-        podcasts = get_all_podcasts()
+    with mail_session(), outbox_worker():
+        try:
+            podcasts = get_all_podcasts()
 
-        # Process all podcasts sequentially
-        results = []
-        for podcast in podcasts:
-            log.info(f"Processing podcast: {podcast.name}")
-            # Add tags to identify the podcast in the UI
-            with tags(podcast.name, "podcast"):
-                result = process_podcast(podcast)
-            results.append(result)
+            # Process all podcasts sequentially
+            results = []
+            for podcast in podcasts:
+                log.info(f"Processing podcast: {podcast.name}")
+                # Add tags to identify the podcast in the UI
+                with tags(podcast.name, "podcast"):
+                    result = process_podcast(podcast)
+                results.append(result)
 
-        log.info(f"Completed processing {len(podcasts)} podcasts")
-        return results
+            log.info(f"Completed processing {len(podcasts)} podcasts")
+            return results
 
-    except Exception as e:
-        # Send email alert on failure
-        error_msg = f"""TGN Whisperer podcast processing flow failed.
+        except Exception as e:
+            # Send email alert on failure
+            error_msg = f"""TGN Whisperer podcast processing flow failed.
 
 Error: {type(e).__name__}: {str(e)}
 
@@ -47,15 +52,15 @@ Traceback:
 
 Check Prefect UI for details: http://webserver.phfactor.net:4200
 """
-        log.error(f"Flow failed with error: {e}")
+            log.error(f"Flow failed with error: {e}")
 
-        try:
-            send_failure_alert(error_msg)
-        except Exception as email_error:
-            log.error(f"Failed to send failure alert email: {email_error}")
+            try:
+                send_failure_alert(error_msg)
+            except Exception as email_error:
+                log.error(f"Failed to send failure alert email: {email_error}")
 
-        # Re-raise to mark flow as failed in Prefect
-        raise
+            # Re-raise to mark flow as failed in Prefect
+            raise
 
 
 if __name__ == "__main__":
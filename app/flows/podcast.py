@@ -4,7 +4,8 @@ import traceback
 from pathlib import Path
 from prefect import flow
 from utils.logging import get_logger
-from utils.email import send_failure_alert
+from utils.email import mail_session, send_failure_alert
+from utils.outbox import outbox_worker
 
 from models.podcast import Podcast
 from tasks.rss import (
@@ -23,6 +24,9 @@ from tasks.shownotes import (
 from tasks.build import (
     update_episodes_index,
     update_home_timestamp,
+    evict_site_audio,
+    check_site_changes,
+    save_content_manifest,
     build_site,
     generate_search_index,
     deploy_site
@@ -56,71 +60,72 @@ def process_podcast(podcast: Podcast):
     log = get_logger()
     log.info(f"Processing podcast: {podcast.name}")
 
-    try:
-        # Step 1: Fetch RSS feed
-        rss_content = fetch_rss_feed(podcast)
-
-        # Step 2: Process feed to add episode numbers and parse XML
-        feed_data = process_rss_feed(rss_content, podcast.name)
-        episodes = feed_data['episodes']
-
-        # Step 3: Check for new episodes (for notifications)
-        new_ep_numbers = check_new_episodes(podcast.name, episodes)
-
-        # Step 4: Send notifications for truly new episodes
-        if new_ep_numbers:
-            log.info(f"Found {len(new_ep_numbers)} new episodes")
-            send_notification_email(podcast, new_ep_numbers, episodes)
-        else:
-            log.info(f"No new episodes found")
-
-        # Step 5: Check ALL episodes for incomplete processing
-        # Get all episode numbers from the feed
-        all_ep_numbers = []
-        for entry in episodes:
-            ep_num = entry.get('itunes:episode')
-            if ep_num:
-                all_ep_numbers.append(float(ep_num))
-
-        log.info(f"Checking {len(all_ep_numbers)} total episodes for completion status")
-
-        # Filter to find incomplete episodes (new or previously failed)
-        incomplete_ep_numbers = filter_incomplete_episodes(podcast.name, all_ep_numbers)
-
-        if not incomplete_ep_numbers:
-            log.info(f"All episodes for {podcast.name} are complete")
-        else:
-            log.info(f"Processing {len(incomplete_ep_numbers)} incomplete episodes")
-
-            # Step 6: Process each incomplete episode sequentially
-            # Note: For parallel processing, episodes should be submitted to a work pool
-            # For now, process sequentially to ensure reliability
-            for ep_number in incomplete_ep_numbers:
-                episode_entry = get_episode_details(episodes, ep_number)
-                if episode_entry:
-                    log.info(f"Processing episode {ep_number}...")
-                    process_episode(podcast, episode_entry)
-                else:
-                    log.warning(f"Could not find episode {ep_number} in feed")
-
-            log.info(f"All {len(incomplete_ep_numbers)} episodes processed successfully")
-
-        # Step 7: Update episodes index and generate/deploy site
-        # Always run this even when no episodes were processed, so that
-        # shownotes and episodes.md stay up to date with the RSS feed.
-        update_episodes_index(podcast.name, episodes)
-
-        if os.environ.get("SKIP_SITE_DEPLOY"):
-            log.info("Skipping site deployment (SKIP_SITE_DEPLOY is set)")
-        else:
-            generate_and_deploy_site(podcast)
-
-        log.info(f"Completed processing for {podcast.name}")
-        return incomplete_ep_numbers or []
-
-    except Exception as e:
-        # Send email alert for individual podcast failure
-        error_msg = f"""Podcast processing failed for {podcast.name}.
+    with mail_session(), outbox_worker():
+        try:
+            # Step 1: Fetch RSS feed
+            rss_content = fetch_rss_feed(podcast)
+
+            # Step 2: Process feed to add episode numbers and parse XML
+            feed_data = process_rss_feed(rss_content, podcast.name)
+            episodes = feed_data['episodes']
+
+            # Step 3: Check for new episodes (for notifications)
+            new_ep_numbers = check_new_episodes(podcast.name, episodes)
+
+            # Step 4: Send notifications for truly new episodes
+            if new_ep_numbers:
+                log.info(f"Found {len(new_ep_numbers)} new episodes")
+                send_notification_email(podcast, new_ep_numbers, episodes)
+            else:
+                log.info(f"No new episodes found")
+
+            # Step 5: Check ALL episodes for incomplete processing
+            # Get all episode numbers from the feed
+            all_ep_numbers = []
+            for entry in episodes:
+                ep_num = entry.get('itunes:episode')
+                if ep_num:
+                    all_ep_numbers.append(float(ep_num))
+
+            log.info(f"Checking {len(all_ep_numbers)} total episodes for completion status")
+
+            # Filter to find incomplete episodes (new or previously failed)
+            incomplete_ep_numbers = filter_incomplete_episodes(podcast.name, all_ep_numbers)
+
+            if not incomplete_ep_numbers:
+                log.info(f"All episodes for {podcast.name} are complete")
+            else:
+                log.info(f"Processing {len(incomplete_ep_numbers)} incomplete episodes")
+
+                # Step 6: Process each incomplete episode sequentially
+                # Note: For parallel processing, episodes should be submitted to a work pool
+                # For now, process sequentially to ensure reliability
+                for ep_number in incomplete_ep_numbers:
+                    episode_entry = get_episode_details(episodes, ep_number)
+                    if episode_entry:
+                        log.info(f"Processing episode {ep_number}...")
+                        process_episode(podcast, episode_entry)
+                    else:
+                        log.warning(f"Could not find episode {ep_number} in feed")
+
+                log.info(f"All {len(incomplete_ep_numbers)} episodes processed successfully")
+
+            # Step 7: Update episodes index and generate/deploy site
+            # Always run this even when no episodes were processed, so that
+            # shownotes and episodes.md stay up to date with the RSS feed.
+            update_episodes_index(podcast.name, episodes)
+
+            if os.environ.get("SKIP_SITE_DEPLOY"):
+                log.info("Skipping site deployment (SKIP_SITE_DEPLOY is set)")
+            else:
+                generate_and_deploy_site(podcast)
+
+            log.info(f"Completed processing for {podcast.name}")
+            return incomplete_ep_numbers or []
+
+        except Exception as e:
+            # Send email alert for individual podcast failure
+            error_msg = f"""Podcast processing failed for {podcast.name}.
 
 Error: {type(e).__name__}: {str(e)}
 
@@ -129,15 +134,15 @@ Traceback:
 
 Check Prefect UI for details: http://webserver.phfactor.net:4200
 """
-        log.error(f"Podcast {podcast.name} failed with error: {e}")
+            log.error(f"Podcast {podcast.name} failed with error: {e}")
 
-        try:
-            send_failure_alert(error_msg)
-        except Exception as email_error:
-            log.error(f"Failed to send failure alert email: {email_error}")
+            try:
+                send_failure_alert(error_msg)
+            except Exception as email_error:
+                log.error(f"Failed to send failure alert email: {email_error}")
 
-        # Re-raise to mark flow as failed in Prefect
-        raise
+            # Re-raise to mark flow as failed in Prefect
+            raise
 
 
 @flow(
@@ -145,18 +150,20 @@ Check Prefect UI for details: http://webserver.phfactor.net:4200
     flow_run_name="{podcast.name}-deploy",
     log_prints=True
 )
-def generate_and_deploy_site(podcast: Podcast):
+def generate_and_deploy_site(podcast: Podcast, force: bool = False):
     """
     Generate and deploy the static site for a podcast.
 
     Workflow:
     1. Generate shownotes if applicable
-    2. Build site with zensical
-    3. Generate search index with Pagefind
-    4. Deploy to caddy2 static hosting
+    2. Stop here if the site sources match the last deploy (unless forced)
+    3. Build site with zensical
+    4. Generate search index with Pagefind
+    5. Deploy to caddy2 static hosting
 
     Args:
         podcast: Podcast configuration object
+        force: Build and deploy even if no source content changed
     """
     log = get_logger()
     log.info(f"Generating and deploying site for {podcast.name}")
@@ -187,7 +194,17 @@ def generate_and_deploy_site(podcast: Podcast):
     else:
         log.warning(f"RSS feed not found for shownotes: {rss_path}")
 
-    # Step 1c: Refresh the "last updated" timestamp on the home page
+    # Step 1c: Drop MP3 copies from the site sources; deploy links them instead
+    evict_site_audio(podcast.name)
+
+    # Step 1d: Skip the rest if nothing but timestamps changed since the last deploy
+    manifest = check_site_changes(podcast.name)
+    if manifest is None and not force:
+        log.info(f"Site for {podcast.name} is unchanged, skipping build and deploy")
+        return
+
+    # Step 1e: Refresh the "last updated" timestamp on the home page
+    # (excluded from the manifest, so it marks the last content change)
     update_home_timestamp(podcast.name)
 
     # Step 2: Build site with zensical
@@ -198,5 +215,7 @@ def generate_and_deploy_site(podcast: Podcast):
 
     # Step 4: Deploy to caddy2 static hosting
     deploy_site(podcast.name, site_path)
+    if manifest is not None:
+        save_content_manifest(podcast.name, manifest)
 
     log.info(f"Site deployed for {podcast.name}")
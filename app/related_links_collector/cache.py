@@ -0,0 +1,125 @@
+"""
+In-memory index over the related-links JSONL cache.
+
+The cache file is append-only, so a URL can have several records. The index
+keeps the latest good record per source URL and is shared by the scraper,
+the shownotes markdown generator and per-episode shownotes lookups. It is
+parsed once per process and reloaded only when the file's mtime or size
+changes.
+
+A compacted cache (see compact.py) may also carry an offset index beside it
+(<jsonl>.idx). While that index matches the file's size and mtime, single
+lookups seek straight to the record instead of parsing the whole file.
+"""
+import json
+import os
+from typing import Dict, Optional
+
+# Statuses that mean "this URL has been handled and needn't be scraped again"
+GOOD_STATUSES = ("ok", "skipped_robots")
+
+# abspath -> (mtime_ns, size, index); offset indexes are cached under <abspath>.idx
+_loaded: Dict[str, tuple] = {}
+
+
+def _parse(jsonl_path: str) -> Dict[str, dict]:
+    index = {}
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            url = rec.get("source_url")
+            if url and rec.get("status") in GOOD_STATUSES:
+                # Later records supersede earlier ones
+                index[url] = rec
+    return index
+
+
+def load_related_index(jsonl_path: str) -> Dict[str, dict]:
+    """
+    Return {source_url: latest good record} for a related-links JSONL file.
+
+    The parsed index is memoized per path and invalidated by mtime and size,
+    so repeated calls within a run cost one stat(). Returns an empty dict if
+    the file doesn't exist. Callers must not mutate the returned dict.
+    """
+    key = os.path.abspath(jsonl_path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        _loaded.pop(key, None)
+        return {}
+
+    cached = _loaded.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    index = _parse(key)
+    _loaded[key] = (st.st_mtime_ns, st.st_size, index)
+    return index
+
+
+def offset_index_path(jsonl_path: str) -> str:
+    """Return the path of the offset index that belongs to a JSONL file."""
+    return jsonl_path + ".idx"
+
+
+def _fresh_offsets(jsonl_path: str, st: os.stat_result) -> Optional[Dict[str, list]]:
+    """Load the offset index if it still describes the JSONL file, else None."""
+    key = offset_index_path(jsonl_path)
+    cached = _loaded.get(key)
+    if cached is None:
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                idx = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        cached = (idx.get("jsonl_mtime_ns"), idx.get("jsonl_size"), idx.get("offsets", {}))
+        _loaded[key] = cached
+    if cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    # The JSONL has been appended to or rewritten since compaction
+    _loaded.pop(key, None)
+    return None
+
+
+def lookup_record(jsonl_path: str, source_url: str) -> Optional[dict]:
+    """
+    Return the latest good record for a URL, or None.
+
+    Uses an already-loaded in-memory index if current, then a fresh offset
+    index, and only falls back to parsing the whole file when neither applies.
+    """
+    key = os.path.abspath(jsonl_path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        return None
+
+    cached = _loaded.get(key)
+    if not (cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size):
+        offsets = _fresh_offsets(key, st)
+        if offsets is not None:
+            entry = offsets.get(source_url)
+            if entry is None:
+                return None
+            with open(key, "rb") as f:
+                f.seek(entry[0])
+                return json.loads(f.read(entry[1]).decode("utf-8"))
+
+    return load_related_index(jsonl_path).get(source_url)
+
+
+def get_related_record(jsonl_path: str, source_url: str) -> Optional[dict]:
+    """Return the latest successfully scraped record for a URL, or None."""
+    rec = lookup_record(jsonl_path, source_url)
+    if rec and rec.get("status") == "ok":
+        return rec
+    return None
+
+
+def clear_index_cache() -> None:
+    """Drop all memoized indexes (mainly for tests)."""
+    _loaded.clear()
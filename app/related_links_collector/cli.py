@@ -13,6 +13,10 @@ def build_parser():
     p.add_argument("--exceptions", default="exceptions.jsonl", help="Exceptions JSONL file (default: exceptions.jsonl)")
     p.add_argument("--overrides", default=None, help="Optional YAML of per-domain CSS selectors")
     p.add_argument("--rate", type=float, default=1.2, help="Per-domain polite delay in seconds (default: 1.2)")
+    p.add_argument("--concurrency", type=int, default=8, help="Maximum pages in flight across all domains (default: 8)")
+    p.add_argument("--link-concurrency", type=int, default=4, help="Concurrent shortlink lookups per shortener host (default: 4)")
+    p.add_argument("--revalidate", action="store_true", help="Conditionally re-request already-cached pages (ETag / Last-Modified)")
+    p.add_argument("--newer-than", type=float, default=None, metavar="DAYS", help="With --revalidate, only pages first scraped within DAYS days")
     p.add_argument("--log-level", default="INFO", choices=["DEBUG","INFO","WARNING","ERROR","CRITICAL"], help="Console log level")
     return p
 
@@ -33,7 +37,11 @@ def main():
         exceptions_path=args.exceptions,
         overrides_path=args.overrides,
         rate=args.rate,
-        log=log
+        log=log,
+        concurrency=args.concurrency,
+        link_concurrency=args.link_concurrency,
+        revalidate=args.revalidate,
+        newer_than_days=args.newer_than
     )
 
 if __name__ == "__main__":
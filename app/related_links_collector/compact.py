@@ -0,0 +1,104 @@
+"""
+Compact a related-links JSONL cache.
+
+scrape.run appends a record on every successful scrape and fix_shortlinks
+rewrites records in place, so the cache accumulates duplicate and superseded
+entries. Compaction keeps only the latest good record per source URL and
+rewrites the file atomically. It can also sort records by URL and emit an
+offset index beside the file (<jsonl>.idx) for constant-time lookups.
+"""
+import json
+import logging
+import os
+from typing import Optional
+
+from .cache import GOOD_STATUSES, offset_index_path
+from .utils import atomic_write_lines
+
+
+def compact(jsonl_path: str, output_path: Optional[str] = None,
+            sort: bool = False, write_index: bool = False,
+            log: Optional[logging.Logger] = None) -> dict:
+    """
+    Rewrite a JSONL cache with one (latest good) record per source URL.
+
+    Records keep the position of the URL's first appearance unless sort is
+    set, in which case they are ordered by source URL.
+
+    Args:
+        jsonl_path: Path to the input JSONL file
+        output_path: Path for output (defaults to overwriting input)
+        sort: Order records by source URL
+        write_index: Also write an offset index beside the output file
+        log: Optional logger instance
+
+    Returns:
+        Dict of counts: read, kept, superseded, dropped, unparseable
+    """
+    log = log or logging.getLogger(__name__)
+    output_path = output_path or jsonl_path
+
+    latest = {}
+    stats = {"read": 0, "kept": 0, "superseded": 0, "dropped": 0, "unparseable": 0}
+
+    log.info("Reading records from %s", jsonl_path)
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            stats["read"] += 1
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                stats["unparseable"] += 1
+                continue
+            url = rec.get("source_url")
+            if not url or rec.get("status") not in GOOD_STATUSES:
+                stats["dropped"] += 1
+                continue
+            if url in latest:
+                stats["superseded"] += 1
+            # Assigning an existing key keeps its first-seen position
+            latest[url] = rec
+
+    urls = sorted(latest) if sort else list(latest)
+    lines = [json.dumps(latest[url], ensure_ascii=False) + "\n" for url in urls]
+    stats["kept"] = len(lines)
+
+    log.info("Writing %d records to %s", len(lines), output_path)
+    atomic_write_lines(output_path, lines)
+
+    if write_index:
+        offsets, pos = {}, 0
+        for url, line in zip(urls, lines):
+            length = len(line.encode("utf-8"))
+            offsets[url] = [pos, length]
+            pos += length
+        st = os.stat(output_path)
+        index = {"jsonl_size": st.st_size, "jsonl_mtime_ns": st.st_mtime_ns, "offsets": offsets}
+        idx_path = offset_index_path(output_path)
+        atomic_write_lines(idx_path, [json.dumps(index, ensure_ascii=False, sort_keys=True)])
+        log.info("Wrote offset index for %d URLs to %s", len(offsets), idx_path)
+
+    log.info("Compaction summary: read %d, kept %d, superseded %d, dropped %d, unparseable %d",
+             stats["read"], stats["kept"], stats["superseded"], stats["dropped"], stats["unparseable"])
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    p = argparse.ArgumentParser(description="Keep the latest good record per source URL in a related-links JSONL file.")
+    p.add_argument("jsonl", help="JSONL cache file to compact")
+    p.add_argument("--out", default=None, help="Output file (default: rewrite input in place)")
+    p.add_argument("--sort", action="store_true", help="Order records by source URL")
+    p.add_argument("--index", action="store_true", help="Write an offset index (<out>.idx) for fast lookups")
+    args = p.parse_args()
+
+    result = compact(args.jsonl, args.out, sort=args.sort, write_index=args.index)
+    print(f"\nSummary:")
+    print(f"  Read {result['read']} records, kept {result['kept']}")
+    print(f"  Superseded duplicates removed: {result['superseded']}")
+    print(f"  Non-ok records dropped: {result['dropped']}")
@@ -0,0 +1,84 @@
+"""
+Asyncio helpers for polite concurrent HTTP work in the collector.
+
+The collector's HTTP calls go through requests (Substack rejects some other
+clients), so blocking calls run in worker threads via asyncio.to_thread while
+these helpers decide when each one may start.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Iterable, Optional
+
+from .utils import domain as dom_of
+
+
+class DomainLimiter:
+    """
+    Per-domain politeness for concurrent requests.
+
+    At most per_domain requests to one domain are in flight, and a request
+    starts no sooner than `rate` seconds after the previous one to that domain
+    finished. Different domains proceed independently.
+    """
+
+    def __init__(self, rate: float = 0.0, per_domain: int = 1):
+        self.rate = rate
+        self.per_domain = per_domain
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._ready_at: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, domain: str):
+        sem = self._slots.get(domain)
+        if sem is None:
+            sem = self._slots[domain] = asyncio.Semaphore(self.per_domain)
+        async with sem:
+            wait = self._ready_at.get(domain, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                if self.rate:
+                    self._ready_at[domain] = time.monotonic() + self.rate
+
+
+class AsyncResolver:
+    """
+    Run a blocking resolve(url) function concurrently, once per distinct URL.
+
+    Calls are made in worker threads under a DomainLimiter keyed by the URL's
+    host. Concurrent requests for the same URL share one call.
+    """
+
+    def __init__(self, resolve: Callable[[str], str], limiter: DomainLimiter):
+        self._resolve = resolve
+        self.limiter = limiter
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    async def _run(self, url: str) -> str:
+        async with self.limiter.slot(dom_of(url)):
+            return await asyncio.to_thread(self._resolve, url)
+
+    async def resolve(self, url: str) -> str:
+        task = self._tasks.get(url)
+        if task is None:
+            task = self._tasks[url] = asyncio.ensure_future(self._run(url))
+        return await task
+
+    async def resolve_many(self, urls: Iterable[str],
+                           on_done: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """
+        Resolve every distinct URL and return {url: result}.
+
+        on_done(url, result) is called as each resolution finishes, e.g. for
+        progress reporting.
+        """
+        async def one(url):
+            result = await self.resolve(url)
+            if on_done:
+                on_done(url, result)
+            return url, result
+
+        return dict(await asyncio.gather(*(one(u) for u in dict.fromkeys(urls))))
@@ -1,25 +1,32 @@
 import re
 import xml.etree.ElementTree as ET
-from typing import Optional, Dict
+from typing import Optional
 import logging
 import json
 import os
+import requests
+from .resolvers import expand_shortlink
+from .shortlinks import ShortlinkStore, default_store
 
 
-def load_bitly_mapping(bitly_json_path: str, log: logging.Logger) -> Dict[str, str]:
-    """Load bit.ly shortlink mappings from JSON file."""
+def load_shortlink_store(bitly_json_path: str, log: logging.Logger) -> ShortlinkStore:
+    """
+    Return the shared shortlink store, with a bitly.json mapping merged in.
+
+    Shortlinks missing from both are resolved over the network on lookup
+    (see resolvers.expand_shortlink) and remembered in the store.
+    """
+    store = default_store()
     if not os.path.exists(bitly_json_path):
-        log.warning("bitly.json not found at %s", bitly_json_path)
-        return {}
+        log.debug("No bitly.json at %s, using the shortlink store only", bitly_json_path)
+        return store
 
     try:
-        with open(bitly_json_path, 'r', encoding='utf-8') as f:
-            mapping = json.load(f)
-            log.info("Loaded %d bit.ly mappings", len(mapping))
-            return mapping
+        count = store.import_json(bitly_json_path)
+        log.info("Loaded %d bit.ly mappings", count)
     except Exception as e:
         log.warning("Failed to load bitly.json: %s", e)
-        return {}
+    return store
 
 
 def extract_urls_from_rss(rss_path: str, output_path: str,
@@ -39,7 +46,8 @@ def extract_urls_from_rss(rss_path: str, output_path: str,
 
     # Load bit.ly mapping
     bitly_json_path = os.path.join(os.path.dirname(rss_path), 'bitly.json')
-    bitly_mapping = load_bitly_mapping(bitly_json_path, log)
+    store = load_shortlink_store(bitly_json_path, log)
+    session = requests.Session()
 
     # Parse the RSS file
     tree = ET.parse(rss_path)
@@ -63,9 +71,9 @@ def extract_urls_from_rss(rss_path: str, output_path: str,
                 # Look for bit.ly shortlinks
                 bitly_matches = re.findall(r'https?://bit\.ly/[^\s<>\]]+', summary.text)
                 for shortlink in bitly_matches:
-                    # Look up in mapping
-                    expanded = bitly_mapping.get(shortlink)
-                    if expanded:
+                    # Look up in the shortlink store, resolving unknown links once
+                    expanded = expand_shortlink(shortlink, session, store=store)
+                    if expanded != shortlink:
                         # Ensure it has /p/ in the URL
                         if '/p/' not in expanded:
                             expanded = expanded.replace('thegreynato.substack.com/', 'thegreynato.substack.com/p/')
@@ -73,7 +81,8 @@ def extract_urls_from_rss(rss_path: str, output_path: str,
                         shortlinks_expanded += 1
                         log.debug("Expanded %s -> %s", shortlink, expanded)
                     else:
-                        log.warning("No mapping found for shortlink: %s", shortlink)
+                        log.warning("Unable to resolve shortlink: %s", shortlink)
+    session.close()
 
     if shortlinks_expanded > 0:
         log.info("Expanded %d bit.ly shortlinks", shortlinks_expanded)
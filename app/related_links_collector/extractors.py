@@ -1,12 +1,19 @@
 import re
-from typing import List, Optional
-from bs4 import BeautifulSoup, NavigableString, Tag
+from typing import List, Optional, Union
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
 from urllib.parse import urljoin, urlparse
 from .resolvers import resolve_redirectors
 from .utils import markdown_link
 
 HEADING_RE = re.compile(r'^(related|see also|further reading|more|you might also like)\b', re.I)
 
+SUBSTACK_BODY_SELECTOR = "div.body.markup"
+
+# Only the post body is turned into a tree; the rest of a Substack page
+# (scripts, navigation, comments, footer) is skipped while parsing.
+_SUBSTACK_BODY = SoupStrainer(
+    "div", class_=lambda c: bool(c) and {"body", "markup"} <= set(c.split()))
+
 def _segment_children_by_br(parent: Tag):
     seg = []
     for child in parent.children:
@@ -117,9 +124,30 @@ def _extract_substack_fallback(container: Tag, base_url: str, client=None) -> Li
 
     return deduped
 
-def extract_substack_any(html: str, base_url: str, client=None) -> List[dict]:
-    soup = BeautifulSoup(html, "lxml")
-    container = soup.select_one("div.body.markup")
+def parse_substack_body(html: Union[str, bytes]) -> Optional[Tag]:
+    """
+    Parse only the post body (div.body.markup) of a Substack page.
+
+    Returns the body container, or None if the page has none.
+    """
+    soup = BeautifulSoup(html, "lxml", parse_only=_SUBSTACK_BODY)
+    return soup.select_one(SUBSTACK_BODY_SELECTOR)
+
+
+def extract_substack_any(page: Union[str, bytes, Tag], base_url: str, client=None) -> List[dict]:
+    """
+    Extract show-note links from a Substack post.
+
+    page may be raw HTML, which is parsed with parse_substack_body, or an
+    already-parsed soup or body container, which is used as is.
+    """
+    if isinstance(page, Tag):
+        if page.name == "div" and {"body", "markup"} <= set(page.get("class") or []):
+            container = page
+        else:
+            container = page.select_one(SUBSTACK_BODY_SELECTOR)
+    else:
+        container = parse_substack_body(page)
     if not container:
         return []
 
@@ -249,3 +277,13 @@ def extract_items(nodes, base_url, client=None):
             continue
         seen.add(key); deduped.append(it)
     return deduped
+
+def dedupe_items(items: List[dict]) -> List[dict]:
+    """Drop repeated (href, text) pairs, keeping the first occurrence."""
+    seen, deduped = set(), []
+    for it in items:
+        key = (it["href"], (it["text"] or "").lower())
+        if key in seen:
+            continue
+        seen.add(key); deduped.append(it)
+    return deduped
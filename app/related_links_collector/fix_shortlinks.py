@@ -1,38 +1,91 @@
 """
 Utility to re-resolve unresolved shortlinks in an existing related.jsonl file.
 This is useful after improving the resolver logic to fix previously failed resolutions.
+
+Distinct shortlinks are resolved concurrently (a few at a time per shortener
+host, optionally spaced out), then the file is streamed through once more and
+rewritten atomically, so a large cache is repaired without holding it all in
+memory or risking a half-written file.
 """
+import asyncio
 import json
 import logging
-from typing import Optional
+from typing import Iterator, List, Optional
 import requests
+import requests.adapters
 from .resolvers import expand_shortlink, SHORTENER_HOSTS
+from .concurrency import AsyncResolver, DomainLimiter
+from .utils import atomic_write_lines
 from urllib.parse import urlparse
 
 
+def _is_shortlink(href: str) -> bool:
+    try:
+        return urlparse(href).netloc.lower() in SHORTENER_HOSTS
+    except Exception:
+        return False
+
+
+def _unresolved_links(jsonl_path: str) -> List[str]:
+    """Return distinct shortlink hrefs still present in ok records, in file order."""
+    links = {}
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get('status') != 'ok':
+                continue
+            for link in rec.get('related', []):
+                href = link.get('href', '')
+                if _is_shortlink(href):
+                    links[href] = None
+    return list(links)
+
+
+def _rewritten_lines(jsonl_path: str, resolved: dict) -> Iterator[str]:
+    """Yield the file's lines with resolved shortlinks substituted."""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                yield line
+                continue
+            changed = False
+            if rec.get('status') == 'ok':
+                for link in rec.get('related', []):
+                    new_href = resolved.get(link.get('href', ''))
+                    if new_href:
+                        link['href'] = new_href
+                        changed = True
+            yield json.dumps(rec, ensure_ascii=False) + '\n' if changed else line
+
+
 def fix_shortlinks(jsonl_path: str, output_path: Optional[str] = None,
-                  log: Optional[logging.Logger] = None) -> None:
+                  log: Optional[logging.Logger] = None, per_host: int = 4,
+                  rate: float = 0.0) -> dict:
     """
     Re-resolve unresolved shortlinks in a JSONL file.
-    
+
     Args:
         jsonl_path: Path to the input JSONL file
         output_path: Path for output (defaults to overwriting input)
         log: Optional logger instance
+        per_host: Maximum concurrent lookups per shortener host
+        rate: Minimum seconds between lookups to the same shortener host
+
+    Returns:
+        Dict of counts: unresolved (distinct shortlinks found) and resolved
     """
     log = log or logging.getLogger(__name__)
     output_path = output_path or jsonl_path
-    
-    records = []
-    unresolved_count = 0
-    resolved_count = 0
-    
-    # Read all records
+
     log.info("Reading records from %s", jsonl_path)
-    with open(jsonl_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            records.append(json.loads(line))
-    
+    links = _unresolved_links(jsonl_path)
+    log.info("Found %d distinct unresolved shortlinks", len(links))
+
     # Process records with HTTP session
     session = requests.Session()
     session.headers.update({
@@ -40,68 +93,56 @@ def fix_shortlinks(jsonl_path: str, output_path: Optional[str] = None,
         "Accept-Language": "en-US,en;q=0.9",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
     })
+    # Worker threads share the session, so size its pool for them
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, per_host))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    done = 0
+
+    def progress(href: str, result: str) -> None:
+        nonlocal done
+        done += 1
+        if result != href:
+            log.info("[%d/%d] ✓ %s -> %s", done, len(links), href, result)
+        else:
+            log.warning("[%d/%d] ✗ Still unresolved: %s", done, len(links), href)
 
+    # Re-resolve, bypassing failures remembered in the shortlink store
+    resolver = AsyncResolver(lambda u: expand_shortlink(u, session, retry_failed=True),
+                             DomainLimiter(rate=rate, per_domain=per_host))
     try:
-        
-        for rec in records:
-            if rec.get('status') != 'ok':
-                continue
-            
-            for link in rec.get('related', []):
-                href = link.get('href', '')
-                href_raw = link.get('href_raw', '')
-                
-                # Check if href is still a shortlink (unresolved)
-                try:
-                    host = urlparse(href).netloc.lower()
-                    if host in SHORTENER_HOSTS:
-                        unresolved_count += 1
-                        log.info("Re-resolving: %s", href)
-
-                        # Attempt to resolve again
-                        resolved = expand_shortlink(href, session)
-
-                        if resolved != href:
-                            # Successfully resolved!
-                            resolved_count += 1
-                            link['href'] = resolved
-                            log.info("  ✓ Resolved to: %s", resolved)
-                        else:
-                            log.warning("  ✗ Still unresolved: %s", href)
-                except Exception as e:
-                    log.error("Error processing %s: %s", href, e)
+        results = asyncio.run(resolver.resolve_many(links, on_done=progress)) if links else {}
     finally:
         session.close()
+    resolved = {href: dest for href, dest in results.items() if dest != href}
 
     # Write updated records
     log.info("Writing updated records to %s", output_path)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for rec in records:
-            f.write(json.dumps(rec, ensure_ascii=False) + '\n')
-    
+    atomic_write_lines(output_path, _rewritten_lines(jsonl_path, resolved))
+
     log.info("Summary: Found %d unresolved shortlinks, successfully resolved %d",
-             unresolved_count, resolved_count)
-    print(f"\nSummary:")
-    print(f"  Found {unresolved_count} unresolved shortlinks")
-    print(f"  Successfully resolved {resolved_count}")
-    print(f"  Still unresolved: {unresolved_count - resolved_count}")
+             len(links), len(resolved))
+    return {"unresolved": len(links), "resolved": len(resolved)}
 
 
 if __name__ == '__main__':
-    import sys
-    
+    import argparse
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(message)s"
     )
-    
-    if len(sys.argv) < 2:
-        print("Usage: python fix_shortlinks.py <jsonl_file> [output_file]")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
-    
-    fix_shortlinks(input_file, output_file)
 
+    p = argparse.ArgumentParser(description="Re-resolve unresolved shortlinks in a related-links JSONL file.")
+    p.add_argument("jsonl", help="JSONL cache file to repair")
+    p.add_argument("output", nargs="?", default=None, help="Output file (default: rewrite input in place)")
+    p.add_argument("--per-host", type=int, default=4, help="Concurrent lookups per shortener host (default: 4)")
+    p.add_argument("--rate", type=float, default=0.0, help="Seconds between lookups to one host (default: 0)")
+    args = p.parse_args()
 
+    result = fix_shortlinks(args.jsonl, args.output, per_host=args.per_host, rate=args.rate)
+    print(f"\nSummary:")
+    print(f"  Found {result['unresolved']} unresolved shortlinks")
+    print(f"  Successfully resolved {result['resolved']}")
+    print(f"  Still unresolved: {result['unresolved'] - result['resolved']}")
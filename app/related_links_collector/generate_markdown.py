@@ -1,10 +1,17 @@
-import json
+import hashlib
 import re
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from typing import Optional
 import logging
 
+from .cache import load_related_index
+from .utils import atomic_write_lines
+
+# Marks the content digest in a generated file's header
+DIGEST_RE = re.compile(r'<!-- shownotes-digest: ([0-9a-f]+) -->')
+HEADER_RULE = '---\n\n'
+
 
 def parse_rss_episodes(rss_path: str) -> dict:
     """Parse RSS feed and extract episode metadata."""
@@ -46,21 +53,65 @@ def parse_rss_episodes(rss_path: str) -> dict:
 
 
 def load_related_links(jsonl_path: str) -> dict:
-    """Load related links from JSONL file."""
-    related_links = {}
-    with open(jsonl_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            rec = json.loads(line)
-            url = rec.get('source_url')
-            if rec.get('status') == 'ok':
-                related_links[url] = rec.get('related', [])
-    
-    return related_links
+    """Load related links from JSONL file (latest successful record per URL)."""
+    return {url: rec.get('related', [])
+            for url, rec in load_related_index(jsonl_path).items()
+            if rec.get('status') == 'ok'}
+
+
+def _render_section(metadata: dict, url: str, links: list) -> str:
+    """Render one episode's section, including its trailing separator."""
+    lines = [f'## [{metadata["title"]}]({url})\n\n',
+             f'**Published:** {metadata["pubdate"]}\n\n']
+    if links:
+        lines.append(f'**Related Links ({len(links)}):**\n\n')
+        for link in links:
+            text = link.get('text', '').strip()
+            href = link.get('href', '').strip()
+            context = link.get('context') or ''
+            context = context.strip() if context else ''
+
+            # If text is just a shortlink, prefer context or href as display text
+            if text and any(shortener in text.lower() for shortener in
+                           ['bit.ly', 'amzn.to', 'youtu.be', 'goo.gl', 't.co', 'tinyurl.com']):
+                if context:
+                    text = context
+                else:
+                    text = href
+
+            if text and href:
+                lines.append(f'- [{text}]({href})\n')
+            elif href:
+                lines.append(f'- {href}\n')
+    else:
+        lines.append('*No related links found*\n')
+    lines.append('\n---\n\n')
+    return ''.join(lines)
+
+
+def _read_digest(output_path: str) -> Optional[str]:
+    """Return the content digest embedded in a previously generated file, if any."""
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+    match = DIGEST_RE.search(text)
+    return match.group(1) if match else None
 
 
 def generate_markdown(rss_path: str, jsonl_path: str, output_path: str,
-                     log: Optional[logging.Logger] = None) -> None:
-    """Generate a markdown file combining RSS metadata with related links."""
+                     log: Optional[logging.Logger] = None) -> bool:
+    """
+    Generate a markdown file combining RSS metadata with related links.
+
+    The document's content digest is embedded in its header. When the digest
+    of the freshly rendered content matches, the file is left untouched (so
+    its mtime, and whatever the site build derived from it, stay valid).
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
     log = log or logging.getLogger(__name__)
     
     log.info("Parsing RSS feed from %s", rss_path)
@@ -68,8 +119,6 @@ def generate_markdown(rss_path: str, jsonl_path: str, output_path: str,
     
     log.info("Loading related links from %s", jsonl_path)
     related_links = load_related_links(jsonl_path)
-    
-    log.info("Generating markdown file at %s", output_path)
 
     # Calculate statistics from ALL scraped episodes (not just those in RSS)
     total_links = 0
@@ -85,49 +134,34 @@ def generate_markdown(rss_path: str, jsonl_path: str, output_path: str,
             episodes_without_links += 1
 
     avg_links = total_links / episodes_with_links if episodes_with_links > 0 else 0
+    stats = f'**{total_links} total links from {episodes_with_links} episodes (out of {total_episodes_scraped} episodes scraped, {episodes_without_links} without any links), averaging {avg_links:.1f} per episode.**\n\n'
 
-    with open(output_path, 'w', encoding='utf-8') as out:
-        out.write('# The Grey NATO - Show Notes Collection\n\n')
-        out.write(f'Generated on {datetime.now().strftime("%B %d, %Y")}\n\n')
-        out.write(f'**{total_links} total links from {episodes_with_links} episodes (out of {total_episodes_scraped} episodes scraped, {episodes_without_links} without any links), averaging {avg_links:.1f} per episode.**\n\n')
-        out.write('---\n\n')
-
-        # Iterate through episodes in the order they appear in RSS (newest first)
-        episodes_processed = 0
-        for url, metadata in episodes.items():
-            if url in related_links:
-                out.write(f'## [{metadata["title"]}]({url})\n\n')
-                out.write(f'**Published:** {metadata["pubdate"]}\n\n')
-                
-                links = related_links[url]
-                if links:
-                    out.write(f'**Related Links ({len(links)}):**\n\n')
-                    for link in links:
-                        text = link.get('text', '').strip()
-                        href = link.get('href', '').strip()
-                        context = link.get('context') or ''
-                        context = context.strip() if context else ''
-                        
-                        # If text is just a shortlink, prefer context or href as display text
-                        if text and any(shortener in text.lower() for shortener in 
-                                       ['bit.ly', 'amzn.to', 'youtu.be', 'goo.gl', 't.co', 'tinyurl.com']):
-                            if context:
-                                text = context
-                            else:
-                                text = href
-                        
-                        if text and href:
-                            out.write(f'- [{text}]({href})\n')
-                        elif href:
-                            out.write(f'- {href}\n')
-                else:
-                    out.write('*No related links found*\n')
-                
-                out.write('\n---\n\n')
-                episodes_processed += 1
-    
-    log.info("Generated %s with %d episodes", output_path, episodes_processed)
-    print(f"Generated {output_path} with {episodes_processed} episodes")
+    # Iterate through episodes in the order they appear in RSS (newest first)
+    sections = [_render_section(metadata, url, related_links[url])
+                for url, metadata in episodes.items() if url in related_links]
+
+    digest = hashlib.sha256(stats.encode('utf-8'))
+    for section in sections:
+        digest.update(section.encode('utf-8'))
+    digest = digest.hexdigest()[:16]
+
+    if _read_digest(output_path) == digest:
+        log.info("%s is up to date (%d episodes), not rewriting", output_path, len(sections))
+        return False
+
+    log.info("Generating markdown file at %s", output_path)
+    body = ''.join(sections)
+
+    header = ('# The Grey NATO - Show Notes Collection\n\n'
+              f'Generated on {datetime.now().strftime("%B %d, %Y")}\n\n'
+              + stats
+              + f'<!-- shownotes-digest: {digest} -->\n\n'
+              + HEADER_RULE)
+    atomic_write_lines(output_path, [header, body])
+
+    log.info("Generated %s with %d episodes", output_path, len(sections))
+    print(f"Generated {output_path} with {len(sections)} episodes")
+    return True
 
 
 if __name__ == '__main__':
@@ -1,8 +1,8 @@
 import re
-from functools import lru_cache
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, unquote
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import requests
+from .shortlinks import default_store
 
 MEDIUM_TRACKING_KEYS = {"source", "gi", "sk", "ref"}
 MEDIUM_TRACKING_PREFIXES = ("utm_",)
@@ -70,10 +70,6 @@ STRIP_KEYS = {"ref", "ref_src", "feature", "tag", "ascsubtag", "linkCode", "crea
 def strip_tracking(u: str) -> str:
     return _strip_params(u, STRIP_KEYS, UTM_PREFIXES)
 
-@lru_cache(maxsize=4096)
-def _cache_get(url: str) -> str:
-    return url
-
 class TransientResolveError(Exception):
     """Temporary error that should be retried."""
     pass
@@ -111,25 +107,47 @@ def _resolve_with_retry(u: str, client) -> str:
         except Exception:
             raise
 
-def expand_shortlink(u: str, client) -> str:
+def expand_shortlink(u: str, client, store=None, retry_failed: bool = False) -> str:
+    """
+    Expand a shortener URL, consulting the persistent shortlink store first.
+
+    Only links missing from the store (or whose failure has outlived its TTL,
+    or any failure when retry_failed is set) cause a network request, and its
+    outcome is recorded. Returns the original URL if it can't be resolved.
+    """
     try:
         host = urlparse(u).netloc.lower()
         if host not in SHORTENER_HOSTS:
             return u
-        cached = _cache_get(u)
-        if cached != u:
-            return cached
+        store = store or default_store()
+        known = store.get(u, include_failed=not retry_failed)
+        if known is not None:
+            return known
+        if client is None:
+            return u
+    except Exception:
+        return u
 
+    try:
         dest = _resolve_with_retry(u, client)
-
-        # Cache hack: clear and then seed both keys so subsequent calls are O(1)
-        _cache_get.cache_clear()
-        _cache_get(u)
-        _cache_get(dest)
-        return dest
-    except Exception:
+    except Exception as e:
         # If all retries fail, return original URL
+        store.put_failure(u, f"{type(e).__name__}: {e}")
         return u
+    if dest == u:
+        store.put_failure(u, "no redirect")
+    else:
+        store.put(u, dest)
+    return dest
+
+def needs_network(u: str) -> bool:
+    """True if resolve_redirectors(u, client) would make HTTP requests for u."""
+    try:
+        if urlparse(u).netloc.lower() == "link.medium.com":
+            return True
+        return urlparse(resolve_medium_redirect(u)).netloc.lower() in SHORTENER_HOSTS
+    except Exception:
+        return False
 
 def resolve_redirectors(u: str, client=None) -> str:
     cleaned = resolve_medium_redirect(u, client=client)
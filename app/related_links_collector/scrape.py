@@ -1,12 +1,18 @@
+import asyncio
+import calendar
 import json
 import time
 import logging
 from typing import Optional
 import requests
+import requests.adapters
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from bs4 import BeautifulSoup
-from .utils import domain as dom_of
-from .extractors import extract_substack_any, nearest_related_container, extract_items
+from .utils import domain as dom_of, markdown_link
+from .extractors import extract_substack_any, nearest_related_container, extract_items, dedupe_items
+from .resolvers import needs_network, resolve_redirectors
+from .cache import load_related_index
+from .concurrency import AsyncResolver, DomainLimiter
 
 class Transient(Exception):
     pass
@@ -14,9 +20,9 @@ class Transient(Exception):
 @retry(reraise=True, stop=stop_after_attempt(3),
        wait=wait_exponential(multiplier=1, min=1, max=10),
        retry=retry_if_exception_type(Transient))
-def fetch(url: str, session: requests.Session) -> requests.Response:
+def fetch(url: str, session: requests.Session, headers: Optional[dict] = None) -> requests.Response:
     try:
-        r = session.get(url, timeout=30)
+        r = session.get(url, timeout=30, headers=headers)
         if r.status_code in (429, 502, 503, 504):
             raise Transient(f"HTTP {r.status_code}")
         r.raise_for_status()
@@ -26,15 +32,159 @@ def fetch(url: str, session: requests.Session) -> requests.Response:
             raise Transient(str(e))
         raise
 
+def _extract(html: str, base_url: str, d: str, overrides: dict) -> tuple[list, str]:
+    """
+    Extract related-link items from a page without any network access.
+
+    Shortlinks are left unexpanded here; _resolve_items expands them afterwards.
+    """
+    if d.endswith("substack.com"):
+        return extract_substack_any(html, base_url), "substack_show_notes_any"
+    soup = BeautifulSoup(html, "lxml")
+    ovr = (overrides.get(d, {}) or {}).get("selector")
+    nodes = nearest_related_container(soup, override_selector=ovr)
+    return extract_items(nodes, base_url), ovr or "heuristic"
+
+
+async def _resolve_items(items: list, resolver: AsyncResolver) -> list:
+    """Expand shortlinks and redirectors in extracted items concurrently."""
+    pending = [it for it in items if needs_network(it["href_raw"])]
+    if not pending:
+        return items
+    resolved = await resolver.resolve_many(it["href_raw"] for it in pending)
+    for it in pending:
+        old_href, new_href = it["href"], resolved[it["href_raw"]]
+        if new_href == old_href:
+            continue
+        it["href"] = new_href
+        if it["text"] == old_href:
+            it["text"] = new_href
+        it["markdown_url"] = markdown_link(it["text"], new_href)
+    return dedupe_items(items)
+
+
+def _conditional_headers(previous: Optional[dict]) -> Optional[dict]:
+    """Build If-None-Match / If-Modified-Since headers from a cached record's validators."""
+    if not previous:
+        return None
+    headers = {}
+    if previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous.get("last_modified"):
+        headers["If-Modified-Since"] = previous["last_modified"]
+    return headers or None
+
+
+def _first_fetched(rec: dict) -> Optional[str]:
+    return rec.get("first_fetched_at") or rec.get("fetched_at")
+
+
+def _within_days(rec: dict, days: Optional[float]) -> bool:
+    """True if the page was first scraped less than `days` ago (always True for None)."""
+    if days is None:
+        return True
+    first = _first_fetched(rec)
+    if not first:
+        return False
+    try:
+        first_ts = calendar.timegm(time.strptime(first, "%Y-%m-%dT%H:%M:%SZ"))
+    except ValueError:
+        return False
+    return time.time() - first_ts < days * 86400
+
+
+async def _scrape_one(url: str, session: requests.Session, pages: DomainLimiter,
+                      resolver: AsyncResolver, overrides: dict,
+                      previous: Optional[dict] = None) -> tuple[Optional[dict], Optional[dict]]:
+    """
+    Fetch, extract and resolve one page. Returns (record, None) or (None, error).
+
+    With a previous record the request is conditional on its validators, and
+    (None, None) is returned when the server answers 304 Not Modified, or
+    when it sends the page again with the same links and validators (e.g. it
+    sends none). Unchanged links with new validators still produce a record,
+    so the next revalidation can be answered with a 304.
+    """
+    d = dom_of(url)
+    try:
+        async with pages.slot(d):
+            r = await asyncio.to_thread(fetch, url, session, _conditional_headers(previous))
+        if r.status_code == 304:
+            return None, None
+        items, selector_used = await asyncio.to_thread(_extract, r.text, str(r.url), d, overrides)
+        items = await _resolve_items(items, resolver)
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        if (previous and items == previous.get("related")
+                and (etag, last_modified) == (previous.get("etag"), previous.get("last_modified"))):
+            return None, None
+        fetched_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return {
+            "source_url": str(r.url),
+            "fetched_at": fetched_at,
+            "first_fetched_at": (previous and _first_fetched(previous)) or fetched_at,
+            "etag": etag,
+            "last_modified": last_modified,
+            "status": "ok",
+            "selector_used": selector_used,
+            "related": items
+        }, None
+    except Exception as e:
+        return None, {"source_url": url, "status": "error", "error": str(e)}
+
+
+async def _scrape_all(urls: list, session: requests.Session, overrides: dict, rate: float,
+                      concurrency: int, link_concurrency: int, out, exc_out, log,
+                      previous: Optional[dict] = None) -> None:
+    pages = DomainLimiter(rate=rate, per_domain=1)
+    resolver = AsyncResolver(lambda u: resolve_redirectors(u, client=session),
+                             DomainLimiter(per_domain=link_concurrency))
+    in_flight = asyncio.Semaphore(concurrency)
+
+    previous = previous or {}
+
+    async def bounded(url):
+        async with in_flight:
+            return await _scrape_one(url, session, pages, resolver, overrides, previous.get(url))
+
+    tasks = [asyncio.ensure_future(bounded(url)) for url in urls]
+    # Write results in input order as soon as each prefix is complete
+    for url, task in zip(urls, tasks):
+        rec, err = await task
+        if rec is not None:
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+            log.info("OK %s -> %d items", url, len(rec["related"]))
+        elif err is None:
+            log.info("Not modified: %s", url)
+        else:
+            exc_out.write(json.dumps(err, ensure_ascii=False) + "\n")
+            log.error("ERROR %s -> %s", url, err["error"])
+
+
 def run(urls_path: str, out_path: str, exceptions_path: str,
         overrides_path: Optional[str] = None, rate: float = 1.2,
-        log: Optional[logging.Logger] = None) -> None:
+        log: Optional[logging.Logger] = None, concurrency: int = 8,
+        link_concurrency: int = 4, revalidate: bool = False,
+        newer_than_days: Optional[float] = None) -> None:
     """
     Scrape related links from episode pages.
 
     IMPORTANT: The out_path file is a PERMANENT CACHE. It should never be deleted.
     This function appends to the file and skips URLs that already have successful scrapes.
-    Scraping is expensive (1-2 hours for 361 episodes), so preserving this cache is critical.
+    Scraping is expensive (1-2 hours for 361 episodes when run serially), so preserving
+    this cache is critical.
+
+    Pages are scraped concurrently with asyncio. Each domain still gets one
+    request at a time, spaced `rate` seconds apart, but different domains run
+    in parallel, and shortlinks found on a page are expanded concurrently
+    (while the next page is fetched). Results are appended in input order.
+
+    With revalidate, already-cached pages are re-requested conditionally using
+    the ETag / Last-Modified stored with their record. A 304 skips parsing and
+    writes nothing, as does a page whose links and validators are unchanged;
+    a page with new links or new validators is appended as the latest record.
+    newer_than_days limits revalidation to pages first scraped within that
+    many days, i.e. recent episodes whose notes may still change.
 
     Args:
         urls_path: File with one URL per line to scrape
@@ -43,6 +193,10 @@ def run(urls_path: str, out_path: str, exceptions_path: str,
         overrides_path: Optional YAML file with custom CSS selectors per domain
         rate: Minimum seconds between requests to the same domain
         log: Logger instance
+        concurrency: Maximum pages being fetched or processed at once
+        link_concurrency: Maximum concurrent shortlink lookups per shortener host
+        revalidate: Conditionally re-request already-cached pages
+        newer_than_days: Only revalidate pages first scraped within this many days
     """
     log = log or logging.getLogger(__name__)
     overrides = {}
@@ -58,22 +212,29 @@ def run(urls_path: str, out_path: str, exceptions_path: str,
 
     # Load already processed URLs from existing cache file
     # This allows incremental scraping - only new episodes need to be scraped
-    processed_urls = set()
-    try:
-        with open(out_path, "r", encoding="utf-8") as existing:
-            for line in existing:
-                try:
-                    rec = json.loads(line)
-                    if rec.get("status") in ("ok", "skipped_robots"):
-                        processed_urls.add(rec.get("source_url"))
-                except Exception:
-                    pass
-        if processed_urls:
-            log.info("Found %d already-scraped URLs in cache, will skip them", len(processed_urls))
-    except FileNotFoundError:
-        pass
-
-    per_domain_sleep = {}
+    cached = load_related_index(out_path)
+    if cached:
+        log.info("Found %d already-scraped URLs in cache, will %s them", len(cached),
+                 "revalidate" if revalidate else "skip")
+
+    urls, previous = [], {}
+    with open(urls_path, "r", encoding="utf-8") as f_urls:
+        for raw in f_urls:
+            url = raw.strip()
+            if not url:
+                continue
+            # Skip if already processed, unless it is due for revalidation
+            if url in cached:
+                if not (revalidate and _within_days(cached[url], newer_than_days)):
+                    log.info("Skipping already-processed URL: %s", url)
+                    continue
+                previous[url] = cached[url]
+            urls.append(url)
+
+    if not urls:
+        return
+
+    # Robots.txt check disabled (see utils.can_fetch)
 
     session = requests.Session()
     session.headers.update({
@@ -81,64 +242,17 @@ def run(urls_path: str, out_path: str, exceptions_path: str,
         "Accept-Language": "en-US,en;q=0.9",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
     })
+    # Worker threads share the session, so size its pool for them
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max(10, concurrency),
+                                            pool_maxsize=max(10, concurrency * link_concurrency))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
 
-    with open(out_path, "a", encoding="utf-8") as out, \
-        open(exceptions_path, "a", encoding="utf-8") as exc_out, \
-        open(urls_path, "r", encoding="utf-8") as f_urls:
-
-        for raw in f_urls:
-            url = raw.strip()
-            if not url:
-                continue
-
-            # Skip if already processed
-            if url in processed_urls:
-                log.info("Skipping already-processed URL: %s", url)
-                continue
-
-            d = dom_of(url)
-            try:
-                # Robots.txt check disabled
-                # if not can_fetch(url):
-                #     msg = {"source_url": url, "status": "skipped_robots", "related": []}
-                #     out.write(json.dumps(msg) + "\n")
-                #     log.info("Skipped by robots.txt: %s", url)
-                #     continue
-
-                last = per_domain_sleep.get(d)
-                if rate and last is not None:
-                    delta = time.time() - last
-                    if delta < rate:
-                        time.sleep(rate - delta)
-
-                r = fetch(url, session)
-                per_domain_sleep[d] = time.time()
-
-                html = r.text
-                soup = BeautifulSoup(html, "lxml")
-
-                if d.endswith("substack.com"):
-                    items = extract_substack_any(html, str(r.url), client=session)
-                    selector_used = "substack_show_notes_any"
-                else:
-                    ovr = (overrides.get(d, {}) or {}).get("selector")
-                    nodes = nearest_related_container(soup, override_selector=ovr)
-                    items = extract_items(nodes, str(r.url), client=session)
-                    selector_used = ovr or "heuristic"
-
-                rec = {
-                    "source_url": str(r.url),
-                    "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                    "status": "ok",
-                    "selector_used": selector_used,
-                    "related": items
-                }
-                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                log.info("OK %s -> %d items", url, len(items))
-
-            except Exception as e:
-                err = {"source_url": url, "status": "error", "error": str(e)}
-                exc_out.write(json.dumps(err, ensure_ascii=False) + "\n")
-                log.error("ERROR %s -> %s", url, e)
-
-    session.close()
+    log.info("Scraping %d URLs (concurrency %d, %.1fs per-domain rate)", len(urls), concurrency, rate)
+    try:
+        with open(out_path, "a", encoding="utf-8") as out, \
+            open(exceptions_path, "a", encoding="utf-8") as exc_out:
+            asyncio.run(_scrape_all(urls, session, overrides, rate, concurrency,
+                                    link_concurrency, out, exc_out, log, previous))
+    finally:
+        session.close()
@@ -0,0 +1,149 @@
+"""
+Persistent store of shortlink resolutions shared across the project.
+
+Every path that expands shortlinks (the scraper via resolvers.expand_shortlink,
+fix_shortlinks, tasks/rss._unwrap_bitly, extract_rss_urls and unwrap-bitly.py)
+looks here before making a network request, so a link is resolved over the
+network at most once. Failed resolutions are stored too and suppress retries
+until their TTL expires; successful ones never expire.
+
+The store is an SQLite file (SHORTLINK_DB, default shortlinks.db in the repo
+root). The committed app/bitly.json mapping is imported into it whenever the
+default store is opened, so hand-maintained entries always win over failures.
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+SHORTLINK_DB = os.getenv("SHORTLINK_DB", str(_REPO_ROOT / "shortlinks.db"))
+BITLY_JSON = _REPO_ROOT / "app" / "bitly.json"
+
+# Seconds before a failed resolution may be retried over the network
+NEGATIVE_TTL = 24 * 3600
+
+OK = "ok"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shortlink (
+    url         TEXT PRIMARY KEY,
+    resolved    TEXT,
+    status      TEXT NOT NULL,
+    checked_at  REAL NOT NULL,
+    failures    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT
+);
+"""
+
+
+class ShortlinkStore:
+    """
+    Shortlink -> destination records backed by SQLite.
+
+    Connections are opened per operation, so one instance can be shared by
+    the worker threads that resolve links concurrently.
+    """
+
+    def __init__(self, db_path: str | Path = SHORTLINK_DB, negative_ttl: float = NEGATIVE_TTL):
+        self.db_path = Path(db_path)
+        self.negative_ttl = negative_ttl
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, url: str, include_failed: bool = True) -> Optional[str]:
+        """
+        Return the known resolution of a shortlink, or None if it must be fetched.
+
+        A failure younger than the negative TTL returns the shortlink itself,
+        meaning "known unresolvable, don't retry yet". Pass include_failed=False
+        to treat every failure as a miss.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT resolved, status, checked_at FROM shortlink WHERE url = ?",
+                               (url,)).fetchone()
+        if row is None:
+            return None
+        if row["status"] == OK:
+            return row["resolved"]
+        if include_failed and time.time() - row["checked_at"] < self.negative_ttl:
+            return url
+        return None
+
+    def put(self, url: str, resolved: str) -> None:
+        """Record a successful resolution."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO shortlink (url, resolved, status, checked_at, failures, error) "
+                "VALUES (?, ?, ?, ?, 0, NULL)", (url, resolved, OK, time.time()))
+
+    def put_failure(self, url: str, error: str = None) -> None:
+        """Record a failed resolution; a previous success is kept."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO shortlink (url, resolved, status, checked_at, failures, error) "
+                "VALUES (?, NULL, ?, ?, 1, ?) "
+                "ON CONFLICT(url) DO UPDATE SET checked_at = excluded.checked_at, "
+                "failures = failures + 1, error = excluded.error WHERE status != ?",
+                (url, FAILED, time.time(), error, OK))
+
+    def import_mapping(self, mapping: Dict[str, str]) -> int:
+        """Add {shortlink: destination} pairs, overriding failures. Returns the count."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO shortlink (url, resolved, status, checked_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET resolved = excluded.resolved, status = excluded.status, "
+                "checked_at = excluded.checked_at, failures = 0, error = NULL "
+                "WHERE status != ? OR resolved != excluded.resolved",
+                [(url, dest, OK, now, OK) for url, dest in mapping.items()])
+        return len(mapping)
+
+    def import_json(self, json_path: str | Path) -> int:
+        """Import a bitly.json-style mapping file. Returns 0 if it doesn't exist."""
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                mapping = json.load(f)
+        except FileNotFoundError:
+            return 0
+        return self.import_mapping(mapping)
+
+    def resolved(self, host: str = None) -> Dict[str, str]:
+        """Return {shortlink: destination} for every success, optionally for one host."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT url, resolved FROM shortlink WHERE status = ? ORDER BY url",
+                                (OK,)).fetchall()
+        links = {row["url"]: row["resolved"] for row in rows}
+        if host:
+            links = {u: d for u, d in links.items() if urlparse(u).netloc.lower() == host}
+        return links
+
+
+_default: Optional[ShortlinkStore] = None
+
+
+def default_store() -> ShortlinkStore:
+    """Return the process-wide store, opening it and importing bitly.json on first use."""
+    global _default
+    if _default is None:
+        store = ShortlinkStore()
+        store.import_json(BITLY_JSON)
+        _default = store
+    return _default
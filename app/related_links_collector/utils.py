@@ -1,4 +1,6 @@
+import os
 import re
+import tempfile
 from urllib.parse import urlparse
 import urllib.robotparser as rp
 
@@ -32,3 +34,26 @@ def can_fetch(url: str, ua: str = "Mozilla/5.0") -> bool:
     except Exception:
         # If robots.txt is unavailable or malformed, proceed conservatively.
         return True
+
+def atomic_write_lines(path: str, lines) -> None:
+    """
+    Write an iterable of text lines to path atomically.
+
+    Lines go to a temporary file in the same directory, which is fsynced and
+    then renamed over the target, so readers never see a partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.basename(path), dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -15,6 +15,10 @@ Flags control which files are removed:
     --markdown    Remove episode.md/html (forces regeneration)
     --all         Remove all generated files (full reprocess)
     --make        Run make to rebuild after removing files
+    --status      Show the episode's recorded pipeline stages and exit
+
+The matching stages are reset to pending in the pipeline state store, so the
+next pipeline run treats the episode as incomplete and reprocesses it.
 """
 
 import argparse
@@ -23,6 +27,26 @@ import subprocess
 from pathlib import Path
 from loguru import logger as log
 from constants import format_episode_number
+from utils.state import PipelineState, STAGES
+
+
+def show_status(state: PipelineState, podcast: str, episode: float) -> None:
+    """Log the current state and run history of each stage for an episode."""
+    current = state.episode_status(podcast, episode)
+    if not current:
+        log.info(f"No pipeline state recorded for {podcast} episode {format_episode_number(episode)}")
+        return
+    for stage in STAGES:
+        rec = current.get(stage)
+        if rec is None:
+            log.info(f"  {stage:<11} -")
+            continue
+        duration = f"{rec['duration_s']:.1f}s" if rec['duration_s'] is not None else ''
+        line = f"  {stage:<11} {rec['status']:<8} {rec['finished_at']} {duration}"
+        if rec['error']:
+            line += f" ({rec['error']})"
+        log.info(line)
+    log.info(f"  {len(state.history(podcast, episode))} stage runs recorded")
 
 
 def main():
@@ -59,11 +83,18 @@ Examples:
                        help="Run make to rebuild after removing files")
     parser.add_argument("--dry-run", action="store_true",
                        help="Show what would be removed without actually removing")
+    parser.add_argument("--status", action="store_true",
+                       help="Show recorded pipeline stages for the episode and exit")
 
     args = parser.parse_args()
 
     # Format episode number for directory naming
     episode = format_episode_number(float(args.episode))
+    state = PipelineState()
+
+    if args.status:
+        show_status(state, args.podcast, float(args.episode))
+        sys.exit(0)
 
     # Find episode directory
     project_root = Path(__file__).parent.parent
@@ -76,8 +107,9 @@ Examples:
     log.info(f"Reprocessing {args.podcast} episode {episode}")
     log.info(f"Episode directory: {episode_dir}")
 
-    # Determine which files to remove
+    # Determine which files to remove and which pipeline stages to reset
     files_to_remove = []
+    stages_to_reset = []
 
     if args.all:
         log.info("Full reprocess requested (--all)")
@@ -89,21 +121,29 @@ Examples:
             "episode.md",
             "episode.html"
         ]
+        stages_to_reset = list(STAGES)
     else:
         if args.download:
             files_to_remove.append("episode.mp3")
+            stages_to_reset.append("download")
         if args.transcribe:
             files_to_remove.extend(["episode-transcribed.json", "whisperx.json"])
+            stages_to_reset.append("transcribe")
         if args.attribute:
             files_to_remove.append("speaker-map.json")
+            stages_to_reset.append("attribute")
         if args.markdown:
             files_to_remove.extend(["episode.md", "episode.html"])
+            stages_to_reset.append("markdown")
 
     if not files_to_remove:
         log.error("No action specified. Use --all or specify individual flags.")
         log.info("Available flags: --download, --transcribe, --attribute, --markdown, --all")
         sys.exit(1)
 
+    # Publishing is always redone so the pipeline sees the episode as incomplete
+    stages_to_reset = list(dict.fromkeys(stages_to_reset + ['publish']))
+
     # Show what will be removed
     log.info(f"Files to remove: {', '.join(files_to_remove)}")
 
@@ -134,9 +174,13 @@ Examples:
             log.info(f"\nWould skip {len(skipped)} files (don't exist):")
             for f in skipped:
                 log.info(f"  - {f}")
+        log.info(f"\nWould reset pipeline stages: {', '.join(stages_to_reset)}")
         log.info("\nRe-run without --dry-run to actually remove files")
         sys.exit(0)
 
+    state.reset(args.podcast, float(args.episode), stages_to_reset)
+    log.info(f"Reset pipeline stages to pending: {', '.join(stages_to_reset)}")
+
     if not removed:
         log.warning("No files were removed - they may not exist yet")
         sys.exit(0)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+List or roll back deployed site releases.
+
+Usage:
+    uv run python app/rollback_site.py tgn --list
+    uv run python app/rollback_site.py tgn                        # previous release
+    uv run python app/rollback_site.py tgn 20260101T060000123456Z # specific release
+
+Only applies to DEPLOY_MODE=release, where each deploy is a directory under
+DEPLOY_BASE_PATH/<podcast>-releases/ and the live path is a symlink to one of them.
+"""
+
+import argparse
+import sys
+
+from loguru import logger as log
+
+from tasks.build import current_release, list_releases, rollback_site
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or roll back deployed site releases")
+    parser.add_argument("podcast", choices=["tgn", "wcl", "hodinkee"])
+    parser.add_argument("release", nargs="?", help="Release to switch to (default: the previous one)")
+    parser.add_argument("--list", action="store_true", help="List releases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        live = current_release(args.podcast)
+        for release in list_releases(args.podcast):
+            print(f"{'*' if release == live else ' '} {release}")
+        return
+
+    try:
+        rollback_site(args.podcast, args.release)
+    except ValueError as e:
+        log.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from flows.podcast import process_podcast
 from models.podcast import Podcast
 from mock_server import app as mock_app
+from utils.state import PipelineState
 
 # Define mock podcast locally - not in shared models, so production never sees it
 MOCK_PODCAST = Podcast(
@@ -70,10 +71,11 @@ def cleanup_mock_data():
     deployed_dir = base_dir / "deployed"
     deployed_dir.mkdir(exist_ok=True)
 
-    # Clean mock notification file
+    # Clean mock notification file and pipeline state
     notified_file = base_dir / "mock-notified.json"
     if notified_file.exists():
         notified_file.unlink()
+    PipelineState().forget_podcast("mock")
 
     # Clear Prefect's result cache to avoid stale cached results
     prefect_storage = Path.home() / ".prefect" / "storage"
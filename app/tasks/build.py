@@ -1,22 +1,54 @@
 """Prefect tasks for building and deploying podcast sites."""
+import json
+import os
 import re
 import subprocess
 import sys
 import shutil
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from zoneinfo import ZoneInfo
 from prefect import task
 from utils.logging import get_logger
 import pagefind_bin
 
-from constants import SITE_ROOT, DEPLOY_BASE_PATH
+from constants import (SITE_ROOT, PODCAST_ROOT, DEPLOY_BASE_PATH, DEPLOY_MODE, DEPLOY_KEEP_RELEASES,
+                       MEDIA_MODE)
+from utils.manifest import build_manifest, diff_manifests, load_manifest, save_manifest
 
 # Home-page "last updated" timestamp is shown in the site owner's timezone.
 # America/Los_Angeles auto-handles PST/PDT daylight-saving transitions.
 HOME_TIMEZONE = ZoneInfo("America/Los_Angeles")
 _LAST_UPDATED_RE = re.compile(r"^_last updated .*_$", re.MULTILINE)
 _WHAT_IS_ANCHOR = "## What is this site?"
+# episodes.md heading rewritten by update_episodes_index on every run
+_PAGE_UPDATED_RE = re.compile(r"^### Page updated .*$", re.MULTILINE)
+# Shownotes collection date, rewritten whenever the WCL shownotes page is regenerated
+_GENERATED_ON_RE = re.compile(r"^Generated on .*$", re.MULTILINE)
+
+# Saved after each successful deploy, relative to sites/<podcast>/
+CONTENT_MANIFEST = '.content-manifest.json'
+# Sources as of the last successful build, used to choose incremental vs clean
+BUILD_MANIFEST = '.build-manifest.json'
+# zensical's differential build cache
+ZENSICAL_CACHE = '.cache'
+# Pagefind bundle per shard of pages, kept outside site/ (which zensical wipes)
+SEARCH_SHARDS = '.pagefind'
+# Built pages as of the last index, for finding shards to re-index
+SEARCH_MANIFEST = '.search-manifest.json'
+# Deployed releases live in <DEPLOY_BASE_PATH>/<podcast>-releases/<release>/, each
+# with a file hash manifest beside it
+RELEASES_SUFFIX = '-releases'
+RELEASE_MANIFEST_SUFFIX = '.manifest.json'
+# Episodes per search shard
+SEARCH_SHARD_SIZE = 50
+# Episode audio, kept in podcasts/<podcast>/<n>/ and linked at /<n>/episode.mp3 (MEDIA_MODE=link)
+AUDIO_FILE = 'episode.mp3'
+# Not site sources: build output, zensical's cache, search shards and our own manifests
+_NON_SOURCES = ('site', ZENSICAL_CACHE, SEARCH_SHARDS, CONTENT_MANIFEST, BUILD_MANIFEST, SEARCH_MANIFEST)
+# Changes under these paths affect every page, so they force a clean build
+_CLEAN_BUILD_PREFIXES = ('mkdocs.yml', 'zensical.toml', 'overrides/',
+                         'docs/stylesheets/', 'docs/javascripts/')
 
 
 def apply_home_timestamp(text: str, stamp: str) -> str:
@@ -138,54 +170,166 @@ def update_episodes_index(podcast_name: str, episodes_data: list[dict]) -> Path:
     return episodes_md
 
 
+def _strip_volatile_lines(text: str) -> str:
+    """Blank out lines that change on every run without changing the content."""
+    for pattern in (_LAST_UPDATED_RE, _PAGE_UPDATED_RE, _GENERATED_ON_RE):
+        text = pattern.sub('', text)
+    return text
+
+
+def content_manifest(podcast_name: str) -> dict[str, str]:
+    """
+    Fingerprint a site's sources: docs/ plus top-level config, excluding build output.
+
+    Markdown is hashed with the home-page timestamp, the episodes.md
+    "Page updated" line and the shownotes "Generated on" date removed, so
+    refreshing them alone isn't a change.
+    """
+    site_dir = Path(SITE_ROOT, podcast_name)
+    return build_manifest(site_dir, exclude=_NON_SOURCES,
+                          normalizers={'.md': _strip_volatile_lines})
+
+
 @task(
-    name="build-site",
-    retries=2,
-    retry_delay_seconds=60,
+    name="check-site-changes",
     log_prints=True
 )
-def build_site(podcast_name: str) -> Path:
+def check_site_changes(podcast_name: str) -> dict[str, str] | None:
     """
-    Build static site with zensical.
+    Compare a site's sources with the manifest saved at its last deploy.
 
     Args:
         podcast_name: Name of the podcast
 
     Returns:
-        Path to built site directory
+        The new content manifest if anything changed, or None if the site
+        is unchanged and build, index and deploy can be skipped
+    """
+    log = get_logger()
+    manifest = content_manifest(podcast_name)
+    previous = load_manifest(Path(SITE_ROOT, podcast_name, CONTENT_MANIFEST))
+    changed, removed = diff_manifests(previous, manifest)
+    if not changed and not removed:
+        log.info(f"No content changes for {podcast_name} since last deploy")
+        return None
+    log.info(f"{podcast_name}: {len(changed)} files added or changed, {len(removed)} removed "
+             f"since last deploy")
+    log.debug(f"Changed: {changed[:20]}")
+    return manifest
 
-    Raises:
-        subprocess.CalledProcessError: If zensical build fails
+
+def save_content_manifest(podcast_name: str, manifest: dict[str, str]) -> None:
+    """Record the sources that were just deployed (see check_site_changes)."""
+    save_manifest(Path(SITE_ROOT, podcast_name, CONTENT_MANIFEST), manifest)
+
+
+def episode_audio(podcast_name: str) -> dict[str, Path]:
+    """Return {episode directory name: MP3 path} for a podcast's downloaded audio."""
+    root = Path(PODCAST_ROOT, podcast_name)
+    if not root.is_dir():
+        return {}
+    return {mp3.parent.name: mp3.resolve() for mp3 in sorted(root.glob(f'*/{AUDIO_FILE}'))}
+
+
+@task(
+    name="evict-site-audio",
+    log_prints=True
+)
+def evict_site_audio(podcast_name: str) -> int:
+    """
+    Remove MP3 copies from sites/<podcast>/docs that duplicate podcasts/ (MEDIA_MODE=link).
+
+    Sites populated with MEDIA_MODE=copy carry every episode's audio through
+    zensical, Pagefind and deploy. A copy is only removed when the original is
+    present with the same size, so nothing is lost.
+
+    Args:
+        podcast_name: Name of the podcast
+
+    Returns:
+        Number of files removed
     """
     log = get_logger()
-    site_dir = Path(SITE_ROOT, podcast_name)
-    site_output = site_dir / 'site'
+    if MEDIA_MODE == 'copy':
+        return 0
+    docs = Path(SITE_ROOT, podcast_name, 'docs')
+    removed = freed = 0
+    for episode, mp3 in episode_audio(podcast_name).items():
+        copy = docs / episode / AUDIO_FILE
+        if copy.is_file() and not copy.is_symlink() and copy.stat().st_size == mp3.stat().st_size:
+            freed += copy.stat().st_size
+            copy.unlink()
+            removed += 1
+    if removed:
+        log.info(f"Removed {removed} MP3 copies ({freed / 1024 / 1024:.0f} MB) from {docs}")
+    return removed
+
+
+def link_episode_audio(podcast_name: str, target_dir: Path) -> int:
+    """
+    Symlink each episode's MP3 into its directory of a deployed site.
 
-    log.info(f"Building site for {podcast_name} with zensical")
-    log.debug(f"Site directory: {site_dir}")
+    The link keeps the /<n>/episode.mp3 URL the episode pages already use,
+    while the audio itself never enters the build tree.
 
-    # Find zensical - check virtualenv first
+    Args:
+        podcast_name: Name of the podcast
+        target_dir: Deployed site root (a release or the rsync target)
+
+    Returns:
+        Number of episodes linked
+    """
+    linked = 0
+    for episode, mp3 in episode_audio(podcast_name).items():
+        page_dir = target_dir / episode
+        dst = page_dir / AUDIO_FILE
+        if not page_dir.is_dir() or (dst.exists() and not dst.is_symlink()):
+            continue  # no page for it yet, or a copy deployed with MEDIA_MODE=copy
+        if dst.is_symlink():
+            if Path(os.readlink(dst)) == mp3:
+                linked += 1
+                continue
+            dst.unlink()
+        os.symlink(mp3, dst)
+        linked += 1
+    return linked
+
+
+def find_zensical() -> str:
+    """Locate the zensical executable, preferring the running virtualenv."""
+    log = get_logger()
     venv_bin = Path(sys.executable).parent / 'zensical'
     log.debug(f"Checking for zensical at: {venv_bin}")
     log.debug(f"sys.executable: {sys.executable}")
     log.debug(f"venv_bin exists: {venv_bin.exists()}")
 
     if venv_bin.exists():
-        zensical_bin = str(venv_bin)
-        log.debug(f"Found zensical in virtualenv: {zensical_bin}")
-    else:
-        # Fall back to PATH
-        log.debug("zensical not in virtualenv, checking PATH")
-        zensical_bin = shutil.which('zensical')
-        if not zensical_bin:
-            raise FileNotFoundError(f"zensical not found in virtualenv ({venv_bin}) or PATH")
-        log.debug(f"Found zensical in PATH: {zensical_bin}")
+        log.debug(f"Found zensical in virtualenv: {venv_bin}")
+        return str(venv_bin)
 
+    # Fall back to PATH
+    log.debug("zensical not in virtualenv, checking PATH")
+    zensical_bin = shutil.which('zensical')
+    if not zensical_bin:
+        raise FileNotFoundError(f"zensical not found in virtualenv ({venv_bin}) or PATH")
+    log.debug(f"Found zensical in PATH: {zensical_bin}")
+    return zensical_bin
+
+
+def run_zensical(site_dir: Path, clean: bool) -> None:
+    """
+    Run zensical build in site_dir, with --clean to discard its cache.
+
+    Raises:
+        subprocess.CalledProcessError: If zensical build fails
+    """
+    log = get_logger()
+    zensical_bin = find_zensical()
     log.info(f"Using zensical: {zensical_bin}")
 
-    # Run zensical build --clean
+    args = [zensical_bin, 'build'] + (['--clean'] if clean else [])
     result = subprocess.run(
-        [zensical_bin, 'build', '--clean'],
+        args,
         cwd=str(site_dir),
         capture_output=True,
         text=True
@@ -202,40 +346,107 @@ def build_site(podcast_name: str) -> Path:
         log.error(f"Command: {' '.join(result.args)}")
         raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
 
-    log.info(f"Site built successfully: {site_output}")
-    return site_output
+
+def needs_clean_build(site_dir: Path, sources: dict[str, str]) -> str | None:
+    """
+    Decide whether an incremental build is safe.
+
+    Returns:
+        The reason a clean build is required, or None if zensical's cache
+        can be reused (only pages were added or edited since the last build)
+    """
+    if not (site_dir / ZENSICAL_CACHE).is_dir() or not (site_dir / 'site').is_dir():
+        return "no previous build output"
+    previous = load_manifest(site_dir / BUILD_MANIFEST)
+    if not previous:
+        return "no record of the previous build"
+    changed, removed = diff_manifests(previous, sources)
+    for path in changed + removed:
+        if path.startswith(_CLEAN_BUILD_PREFIXES):
+            return f"{path} changed"
+    if removed:
+        # An incremental build would leave the removed pages' output behind
+        return f"{len(removed)} source files removed"
+    return None
 
 
 @task(
-    name="generate-search-index",
+    name="build-site",
     retries=2,
     retry_delay_seconds=60,
     log_prints=True
 )
-def generate_search_index(site_path: Path) -> bool:
+def build_site(podcast_name: str, clean: bool | None = None) -> Path:
     """
-    Generate search index with Pagefind.
+    Build static site with zensical.
+
+    By default the build is incremental: zensical's cache is kept, so only
+    added or edited pages are re-rendered. A clean build is used instead when
+    there is no previous build, or config, theme or stylesheet files changed,
+    or source files were removed since the last successful build.
 
     Args:
-        site_path: Path to built site directory
+        podcast_name: Name of the podcast
+        clean: Force a clean (True) or incremental (False) build; None decides automatically
 
     Returns:
-        True if search index generated successfully
+        Path to built site directory
 
     Raises:
-        subprocess.CalledProcessError: If pagefind fails
+        subprocess.CalledProcessError: If zensical build fails
     """
     log = get_logger()
-    log.info(f"Generating search index with Pagefind for {site_path}")
+    site_dir = Path(SITE_ROOT, podcast_name)
+    site_output = site_dir / 'site'
 
-    # Get pagefind binary path
-    pagefind_bin_path = str(pagefind_bin.get_executable())
+    log.info(f"Building site for {podcast_name} with zensical")
+    log.debug(f"Site directory: {site_dir}")
+
+    sources = build_manifest(site_dir, exclude=_NON_SOURCES)
+    if clean is None:
+        reason = needs_clean_build(site_dir, sources)
+        clean = reason is not None
+        log.info(f"Clean build: {reason}" if clean else "Incremental build (reusing zensical cache)")
 
-    # Run pagefind on the built site
-    # Use glob pattern to only index index.html files (generated content)
-    # This excludes episode.html files (downloaded web page snapshots)
+    # Forget the previous build first, so a failed build is followed by a clean one
+    (site_dir / BUILD_MANIFEST).unlink(missing_ok=True)
+    run_zensical(site_dir, clean)
+    save_manifest(site_dir / BUILD_MANIFEST, sources)
+
+    log.info(f"Site built successfully: {site_output}")
+    return site_output
+
+
+_EPISODE_DIR_RE = re.compile(r"^\d+(\.\d+)?$")
+
+
+def search_shard(page: str) -> str:
+    """
+    Name the search shard a built page belongs to.
+
+    Episode pages (<n>/...) are grouped SEARCH_SHARD_SIZE episodes to a shard,
+    e.g. '362/episode/index.html' -> 'ep-0350'; everything else is 'main'.
+    """
+    top = page.split('/', 1)[0]
+    if _EPISODE_DIR_RE.match(top):
+        start = int(float(top)) // SEARCH_SHARD_SIZE * SEARCH_SHARD_SIZE
+        return f"ep-{start:04d}"
+    return 'main'
+
+
+def run_pagefind(site_path: Path, pages: list[str], output_path: Path) -> None:
+    """
+    Index the given pages of a built site into a Pagefind bundle at output_path.
+
+    Raises:
+        subprocess.CalledProcessError: If pagefind fails
+    """
+    log = get_logger()
+    pagefind_bin_path = str(pagefind_bin.get_executable())
+    glob = pages[0] if len(pages) == 1 else '{' + ','.join(pages) + '}'
     result = subprocess.run(
-        [pagefind_bin_path, '--site', str(site_path), '--glob', '**/index.html'],
+        [pagefind_bin_path, '--site', str(site_path), '--glob', glob,
+         '--output-path', str(output_path)],
         capture_output=True,
         text=True
     )
@@ -251,35 +462,230 @@ def generate_search_index(site_path: Path) -> bool:
         log.error(f"Command: {' '.join(result.args)}")
         raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
 
-    log.info("Search index generated successfully")
-    return True
-
 
 @task(
-    name="deploy-site",
+    name="generate-search-index",
     retries=2,
     retry_delay_seconds=60,
     log_prints=True
 )
-def deploy_site(podcast_name: str, site_path: Path) -> bool:
+def generate_search_index(site_path: Path) -> bool:
     """
-    Deploy site to caddy2 static hosting via rsync.
+    Generate search index with Pagefind, re-indexing only changed shards.
+
+    Built pages are split into shards (site pages, then blocks of
+    SEARCH_SHARD_SIZE episodes), each with its own Pagefind bundle cached in
+    sites/<podcast>/.pagefind/. Only shards whose pages were added, changed or
+    removed since the last run are re-indexed; the rest are reused. The
+    'main' shard is installed as the site's /pagefind/ bundle and the others
+    under /pagefind/shards/, listed in /pagefind/shards.json for the search
+    page to merge at query time.
+
+    Only index.html files (generated content) are indexed; this excludes
+    episode.html files (downloaded web page snapshots).
 
     Args:
-        podcast_name: Name of the podcast
         site_path: Path to built site directory
 
     Returns:
-        True if deployment succeeded
+        True if search index generated successfully
 
     Raises:
-        subprocess.CalledProcessError: If rsync fails
+        subprocess.CalledProcessError: If pagefind fails
     """
     log = get_logger()
-    deploy_target = f"{DEPLOY_BASE_PATH}/{podcast_name}"
+    log.info(f"Generating search index with Pagefind for {site_path}")
+    site_path = Path(site_path)
+    site_dir = site_path.parent
+    cache_dir = site_dir / SEARCH_SHARDS
+
+    pages = build_manifest(site_path, exclude=('pagefind',))
+    pages = {p: digest for p, digest in pages.items() if p.endswith('index.html')}
+    previous = load_manifest(site_dir / SEARCH_MANIFEST)
+
+    shards: dict[str, dict[str, str]] = {}
+    for page, digest in pages.items():
+        shards.setdefault(search_shard(page), {})[page] = digest
+    stale = {search_shard(p) for p in previous if p not in pages}
+
+    reindexed = 0
+    for name, shard_pages in sorted(shards.items()):
+        old = {p: d for p, d in previous.items() if search_shard(p) == name}
+        if old == shard_pages and name not in stale and (cache_dir / name).is_dir():
+            continue
+        log.info(f"Indexing search shard {name} ({len(shard_pages)} pages)")
+        shutil.rmtree(cache_dir / name, ignore_errors=True)
+        run_pagefind(site_path, sorted(shard_pages), cache_dir / name)
+        reindexed += 1
+
+    # Drop bundles of shards that no longer have pages
+    if cache_dir.is_dir():
+        for bundle in cache_dir.iterdir():
+            if bundle.name not in shards:
+                shutil.rmtree(bundle)
+
+    # Install the bundles into the freshly built site
+    bundle_dir = site_path / 'pagefind'
+    shutil.rmtree(bundle_dir, ignore_errors=True)
+    if 'main' in shards:
+        shutil.copytree(cache_dir / 'main', bundle_dir)
+    merged = []
+    for name in sorted(shards):
+        if name != 'main':
+            shutil.copytree(cache_dir / name, bundle_dir / 'shards' / name)
+            merged.append(f"/pagefind/shards/{name}/")
+    bundle_dir.mkdir(exist_ok=True)
+    (bundle_dir / 'shards.json').write_text(json.dumps(merged))
+
+    save_manifest(site_dir / SEARCH_MANIFEST, pages)
+    log.info(f"Search index generated successfully: {reindexed} of {len(shards)} shards re-indexed")
+    return True
 
-    log.info(f"Deploying {podcast_name} site to {deploy_target}")
-    log.debug(f"Source: {site_path}")
+
+def releases_dir(podcast_name: str) -> Path:
+    """Directory holding a podcast's deployed releases, beside its live path."""
+    return Path(DEPLOY_BASE_PATH, f"{podcast_name}{RELEASES_SUFFIX}")
+
+
+def list_releases(podcast_name: str) -> list[str]:
+    """Return release names, oldest first (names are UTC timestamps)."""
+    root = releases_dir(podcast_name)
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.is_dir())
+
+
+def current_release(podcast_name: str) -> str | None:
+    """Return the release the live path points at, or None if it isn't a release symlink."""
+    live = Path(DEPLOY_BASE_PATH, podcast_name)
+    if not live.is_symlink():
+        return None
+    return Path(os.readlink(live)).name
+
+
+def _switch_release(podcast_name: str, release: str) -> None:
+    """Point the live path at a release with an atomic rename of a fresh symlink."""
+    live = Path(DEPLOY_BASE_PATH, podcast_name)
+    tmp_link = live.with_name(f".{podcast_name}.{release}.tmp")
+    tmp_link.unlink(missing_ok=True)
+    os.symlink(Path(f"{podcast_name}{RELEASES_SUFFIX}", release), tmp_link)
+    os.replace(tmp_link, live)
+
+
+def _stage_release(site_path: Path, manifest: dict[str, str], release_dir: Path,
+                   previous_dir: Path | None, previous: dict[str, str]) -> tuple[int, int]:
+    """
+    Populate a new release directory from the built site.
+
+    Files whose digest matches the previous release are hard-linked from it
+    (no data copied); the rest are copied from the build.
+
+    Returns:
+        (files copied, files linked)
+    """
+    copied = linked = 0
+    for rel, digest in manifest.items():
+        dst = release_dir / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if previous_dir is not None and previous.get(rel) == digest:
+            try:
+                os.link(previous_dir / rel, dst)
+                linked += 1
+                continue
+            except OSError:
+                pass  # e.g. missing in the old release, or on another filesystem
+        shutil.copy2(site_path / rel, dst)
+        copied += 1
+    return copied, linked
+
+
+def prune_releases(podcast_name: str, keep: int = DEPLOY_KEEP_RELEASES) -> list[str]:
+    """
+    Delete the oldest releases, keeping the newest `keep` and the live one.
+
+    Returns:
+        Names of the deleted releases
+    """
+    live = current_release(podcast_name)
+    releases = list_releases(podcast_name)
+    doomed = [r for r in releases[:max(len(releases) - keep, 0)] if r != live]
+    for release in doomed:
+        shutil.rmtree(releases_dir(podcast_name) / release)
+        (releases_dir(podcast_name) / f"{release}{RELEASE_MANIFEST_SUFFIX}").unlink(missing_ok=True)
+    return doomed
+
+
+def rollback_site(podcast_name: str, release: str = None) -> str:
+    """
+    Instantly switch the live site back to an earlier release.
+
+    Args:
+        podcast_name: Name of the podcast
+        release: Release to switch to (default: the one before the live release)
+
+    Returns:
+        Name of the release now live
+    """
+    log = get_logger()
+    releases = list_releases(podcast_name)
+    if release is None:
+        live = current_release(podcast_name)
+        older = [r for r in releases if live is None or r < live]
+        if not older:
+            raise ValueError(f"No release older than {live} to roll back to for {podcast_name}")
+        release = older[-1]
+    elif release not in releases:
+        raise ValueError(f"Unknown release {release} for {podcast_name}; have {releases}")
+    _switch_release(podcast_name, release)
+    log.info(f"Rolled {podcast_name} back to release {release}")
+    return release
+
+
+def _deploy_release(podcast_name: str, site_path: Path) -> str:
+    """Deploy a built site as a new release and switch traffic to it."""
+    log = get_logger()
+    root = releases_dir(podcast_name)
+    root.mkdir(parents=True, exist_ok=True)
+    live = Path(DEPLOY_BASE_PATH, podcast_name)
+
+    # First release deploy over a legacy rsync target: keep it as a release
+    if live.is_dir() and not live.is_symlink():
+        legacy = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}-legacy"
+        log.info(f"Moving existing {live} to release {legacy}")
+        os.rename(live, root / legacy)
+        _switch_release(podcast_name, legacy)
+
+    manifest = build_manifest(site_path)
+    previous = current_release(podcast_name)
+    previous_dir = root / previous if previous else None
+    previous_manifest = (load_manifest(root / f"{previous}{RELEASE_MANIFEST_SUFFIX}")
+                         if previous else {})
+
+    release = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    release_dir = root / release
+    try:
+        copied, linked = _stage_release(site_path, manifest, release_dir, previous_dir, previous_manifest)
+    except BaseException:
+        shutil.rmtree(release_dir, ignore_errors=True)
+        raise
+    save_manifest(root / f"{release}{RELEASE_MANIFEST_SUFFIX}", manifest)
+    changed, removed = diff_manifests(previous_manifest, manifest)
+    log.info(f"Staged release {release}: {copied} files copied, {linked} unchanged files linked "
+             f"({len(changed)} changed, {len(removed)} removed since {previous or 'nothing'})")
+    if MEDIA_MODE != 'copy':
+        log.info(f"Linked audio for {link_episode_audio(podcast_name, release_dir)} episodes")
+
+    _switch_release(podcast_name, release)
+    pruned = prune_releases(podcast_name)
+    if pruned:
+        log.info(f"Pruned old releases: {', '.join(pruned)}")
+    return release
+
+
+def _deploy_rsync(podcast_name: str, site_path: Path) -> None:
+    """Copy the built site over the live directory with rsync (legacy mode)."""
+    log = get_logger()
+    deploy_target = f"{DEPLOY_BASE_PATH}/{podcast_name}"
 
     # Run rsync with same options as Makefile
     # -q: quiet
@@ -289,8 +695,10 @@ def deploy_site(podcast_name: str, site_path: Path) -> bool:
     # -D: preserve device files and special files
     # --delete: delete files in destination that aren't in source
     # --force: force deletion of directories
+    # Audio symlinks (MEDIA_MODE=link) aren't in the build, so protect them from --delete
+    exclude = [] if MEDIA_MODE == 'copy' else [f'--exclude=/*/{AUDIO_FILE}']
     result = subprocess.run(
-        ['rsync', '-qrpgD', '--delete', '--force', f'{site_path}/', deploy_target],
+        ['rsync', '-qrpgD', '--delete', '--force', *exclude, f'{site_path}/', deploy_target],
         capture_output=True,
         text=True
     )
@@ -303,6 +711,52 @@ def deploy_site(podcast_name: str, site_path: Path) -> bool:
         if result.stderr:
             log.error(f"STDERR:\n{result.stderr}")
         raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+    if MEDIA_MODE != 'copy':
+        log.info(f"Linked audio for {link_episode_audio(podcast_name, Path(deploy_target))} episodes")
+
+
+@task(
+    name="deploy-site",
+    retries=2,
+    retry_delay_seconds=60,
+    log_prints=True
+)
+def deploy_site(podcast_name: str, site_path: Path) -> bool:
+    """
+    Deploy site to caddy2 static hosting.
+
+    In the default 'release' mode (DEPLOY_MODE) each deploy becomes a new
+    directory under <DEPLOY_BASE_PATH>/<podcast>-releases/. Files unchanged
+    since the live release (per the file hash manifest saved with every
+    release) are hard-linked rather than copied, then the live path
+    <DEPLOY_BASE_PATH>/<podcast>, a symlink, is swapped atomically so visitors
+    never see a half-updated site. Old releases beyond DEPLOY_KEEP_RELEASES are
+    pruned; rollback_site switches back instantly. 'rsync' mode keeps the old
+    in-place rsync --delete behaviour.
+
+    Args:
+        podcast_name: Name of the podcast
+        site_path: Path to built site directory
+
+    Returns:
+        True if deployment succeeded
+
+    Raises:
+        OSError: In release mode, if staging (copying or hard-linking files),
+            moving a legacy target aside or swapping the live symlink fails.
+            A partly staged release is removed and the live site is unchanged.
+        subprocess.CalledProcessError: In rsync mode, if rsync fails
+    """
+    log = get_logger()
+    deploy_target = f"{DEPLOY_BASE_PATH}/{podcast_name}"
+
+    log.info(f"Deploying {podcast_name} site to {deploy_target} ({DEPLOY_MODE} mode)")
+    log.debug(f"Source: {site_path}")
+
+    if DEPLOY_MODE == 'rsync':
+        _deploy_rsync(podcast_name, Path(site_path))
+    else:
+        _deploy_release(podcast_name, Path(site_path))
 
     log.info(f"Site deployed successfully to {deploy_target}")
     return True
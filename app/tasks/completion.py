@@ -2,6 +2,7 @@
 from pathlib import Path
 from prefect import task
 from utils.logging import get_logger
+from utils.state import PipelineState, OK
 
 from constants import SITE_ROOT, format_episode_number
 
@@ -45,6 +46,11 @@ def filter_incomplete_episodes(podcast_name: str, episode_numbers: list[float])
     """
     Filter a list of episode numbers to only those that are incomplete.
 
+    Completion comes from the pipeline state store's publish stage, read in one
+    query. Episodes with no publish record at all (published before the state
+    store existed) fall back to the episode.md file check and are adopted into
+    the store, so each legacy episode is only checked on disk once.
+
     Args:
         podcast_name: Name of the podcast
         episode_numbers: List of episode numbers to check
@@ -57,9 +63,22 @@ def filter_incomplete_episodes(podcast_name: str, episode_numbers: list[float])
 
     log.info(f"Checking completion status for {len(episode_numbers)} episodes")
 
+    state = PipelineState()
+    published = state.stage_statuses(podcast_name, 'publish')
+    adopted = 0
+
     for ep_num in episode_numbers:
-        if not check_episode_completion.fn(podcast_name, ep_num):
-            incomplete.append(ep_num)
+        status = published.get(float(ep_num))
+        if status == OK:
+            continue
+        if status is None and check_episode_completion.fn(podcast_name, ep_num):
+            state.record(podcast_name, ep_num, 'publish', OK)
+            adopted += 1
+            continue
+        incomplete.append(ep_num)
+
+    if adopted:
+        log.info(f"Adopted {adopted} previously published episodes into the state store")
 
     if incomplete:
         log.info(f"Found {len(incomplete)} incomplete episodes: {sorted(incomplete)}")
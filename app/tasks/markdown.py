@@ -5,7 +5,7 @@ from pathlib import Path
 from prefect import task
 from utils.logging import get_logger
 
-from constants import SPEAKER_MAPFILE
+from constants import SPEAKER_MAPFILE, MEDIA_MODE
 from text_corrections import normalize_transcript_text
 
 
@@ -138,6 +138,9 @@ def copy_episode_files(episode_dir: Path, site_dir: Path) -> bool:
     """
     Copy episode files to site directory.
 
+    The MP3 is only copied with MEDIA_MODE=copy; otherwise it stays in the
+    episode directory and deploy_site symlinks it into the published site.
+
     Args:
         episode_dir: Source episode directory
         site_dir: Destination site directory
@@ -150,9 +153,10 @@ def copy_episode_files(episode_dir: Path, site_dir: Path) -> bool:
 
     files_to_copy = [
         'episode.md',
-        'episode.mp3',
         'episode.html'
     ]
+    if MEDIA_MODE == 'copy':
+        files_to_copy.append('episode.mp3')
 
     copied_count = 0
     for filename in files_to_copy:
@@ -3,18 +3,21 @@ from prefect import task
 from utils.logging import get_logger
 
 from models.podcast import Podcast
-from utils.email import send_notification_email as send_email_util
+from utils.email import notification_message
+from utils.outbox import queue_email
 
 
 @task(
     name="send-notification-email",
-    retries=3,
-    retry_delay_seconds=60,
     log_prints=True
 )
 def send_notification_email(podcast: Podcast, new_episodes: list[float], episodes: list[dict] = None) -> bool:
     """
-    Send email notification about new podcast episodes.
+    Queue an email notification about new podcast episodes.
+
+    The message is written to the outbox and delivered by the background
+    outbox worker (see utils.outbox), so SMTP latency or outages never hold
+    up episode processing; undelivered mail is retried, across runs if needed.
 
     Args:
         podcast: Podcast configuration object
@@ -22,14 +25,14 @@ def send_notification_email(podcast: Podcast, new_episodes: list[float], episode
         episodes: Optional list of all episode dicts from RSS feed (for titles)
 
     Returns:
-        True if email was sent successfully, False otherwise
+        True if the email was queued, False if there was nothing to send
     """
     log = get_logger()
     if not new_episodes:
         log.debug(f"No new episodes to notify about for {podcast.name}")
         return False
 
-    log.info(f"Sending notification for {len(new_episodes)} new episodes of {podcast.name}")
+    log.info(f"Queueing notification for {len(new_episodes)} new episodes of {podcast.name}")
 
     # Build episode number → title map from feed data
     ep_titles = {}
@@ -40,14 +43,6 @@ def send_notification_email(podcast: Podcast, new_episodes: list[float], episode
             if ep_num:
                 ep_titles[float(ep_num)] = title
 
-    try:
-        send_email_util(
-            email_list=podcast.emails,
-            new_ep_list=new_episodes,
-            base_url=podcast.doc_base_url,
-            ep_titles=ep_titles
-        )
-        return True
-    except Exception as e:
-        log.error(f"Failed to send notification email for {podcast.name}: {e}")
-        raise
+    subject, body = notification_message(new_episodes, podcast.doc_base_url, ep_titles)
+    queue_email(podcast.emails, subject, body)
+    return True
@@ -1,5 +1,4 @@
 """Prefect tasks for RSS feed fetching and processing."""
-import json
 import xmltodict
 from pathlib import Path
 from prefect import task
@@ -7,7 +6,10 @@ from utils.logging import get_logger
 import requests
 
 from models.podcast import Podcast
+from utils.state import PipelineState
 from rss_processor import process_feed
+from related_links_collector.resolvers import expand_shortlink
+from related_links_collector.shortlinks import default_store
 from constants import HTTP_USER_AGENT, CONTACT_EMAIL, DEFAULT_PODCAST_URL
 
 
@@ -137,7 +139,8 @@ def _episode_number_from_rss(entry: dict) -> float:
 )
 def check_new_episodes(podcast_name: str, episodes: list[dict]) -> list[float]:
     """
-    Check for new episodes by comparing current feed to saved notification list.
+    Check for new episodes by comparing current feed to the notification history
+    in the pipeline state store.
 
     Args:
         podcast_name: Name of the podcast
@@ -167,17 +170,19 @@ def check_new_episodes(podcast_name: str, episodes: list[dict]) -> list[float]:
 
     log.debug(f"Found {len(current_ep_numbers)} episodes in current feed")
 
-    # Load saved notification list
-    filename = Path(f'{podcast_name}-notified.json')
-    try:
-        old_list = json.load(open(filename, 'r'))
-        log.debug(f"Loaded {len(old_list)} previously notified episodes from {filename}")
-    except FileNotFoundError:
-        log.warning(f'Saved file {filename} not found, treating all episodes as new')
-        old_list = []
+    # Load previously notified episodes from the state store, seeding it
+    # from the legacy {podcast}-notified.json file on first use
+    state = PipelineState()
+    old_eps = state.notified_episodes(podcast_name)
+    if not old_eps:
+        filename = Path(f'{podcast_name}-notified.json')
+        if state.import_notified_json(podcast_name, filename):
+            old_eps = state.notified_episodes(podcast_name)
+        else:
+            log.warning(f'No notification history for {podcast_name}, treating all episodes as new')
+    log.debug(f"Loaded {len(old_eps)} previously notified episodes")
 
     # Find new episodes
-    old_eps = set(old_list)
     new_eps = current_ep_numbers.difference(old_eps)
     new_count = len(new_eps)
 
@@ -188,9 +193,8 @@ def check_new_episodes(podcast_name: str, episodes: list[dict]) -> list[float]:
     log.info(f"{new_count} new episodes found in {podcast_name}: {sorted(new_eps)}")
 
     # Save updated list
-    all_eps = old_eps.union(current_ep_numbers)
-    log.info(f"Saving updated notification list to {filename}")
-    json.dump(list(all_eps), open(filename, 'w'))
+    log.info(f"Recording {new_count} newly notified episodes for {podcast_name}")
+    state.mark_notified(podcast_name, new_eps)
 
     return sorted(list(new_eps))
 
@@ -222,37 +226,34 @@ def get_episode_details(episodes: list[dict], episode_number: float) -> dict:
 
 def _unwrap_bitly(url: str) -> str:
     """
-    Unwrap bit.ly URLs using lookup dictionary.
+    Unwrap bit.ly URLs using the shared shortlink store.
+
+    Known links (including everything in bitly.json) are answered from the
+    store without touching the network. Unknown ones are resolved over the
+    network (with retries, so a store miss can slow RSS processing down) and
+    remembered, so each shortlink is fetched at most once.
 
     Args:
         url: URL that may be a bit.ly shortlink
 
     Returns:
-        Resolved URL or original URL if not in lookup
+        Resolved URL or original URL if it can't be resolved
     """
-    import json
-    from pathlib import Path
-
     log = get_logger()
 
     if 'bit.ly' not in url.lower():
         return url
 
-    # Load bitly mapping
-    bitly_path = Path('./bitly.json')
-    if not bitly_path.exists():
-        bitly_path = Path('./app/bitly.json')
-
-    if bitly_path.exists():
-        lookup_map = json.load(open(bitly_path, 'r'))
-        if url in lookup_map:
-            return lookup_map[url]
-        else:
-            log.warning(f"bit.ly URL not found in lookup: {url}")
-    else:
-        log.warning(f"bitly.json not found, returning original URL: {url}")
-
-    return url
+    store = default_store()
+    resolved = store.get(url)
+    if resolved is None:
+        # Store miss: only now is an HTTP session worth setting up
+        with requests.Session() as session:
+            session.headers.update({'User-Agent': HTTP_USER_AGENT, 'From': CONTACT_EMAIL})
+            resolved = expand_shortlink(url, session, store)
+    if resolved == url:
+        log.warning(f"Unable to resolve bit.ly URL: {url}")
+    return resolved
 
 
 def _extract_episode_url(entry: dict, default_url: str = None) -> str:
@@ -6,11 +6,13 @@ from html import unescape
 from pathlib import Path
 from prefect import task
 from utils.logging import get_logger
+from utils.state import PipelineState, OK
 
 # Import TGN-specific functions from related_links_collector
 from related_links_collector.extract_rss_urls import extract_urls_from_rss
 from related_links_collector.scrape import run as scrape_run
 from related_links_collector.generate_markdown import generate_markdown
+from related_links_collector.cache import get_related_record
 
 
 @task(
@@ -66,22 +68,40 @@ def generate_tgn_shownotes(rss_path: Path, output_path: Path) -> Path:
         exceptions_path=str(exceptions_file),
         overrides_path=None,
         rate=1.2,
-        log=log
+        log=log,
+        # Recent posts still get their show notes edited; re-check them cheaply
+        # with conditional requests instead of trusting the cache forever
+        revalidate=True,
+        newer_than_days=14
     )
 
     # Step 3: Generate markdown document
     log.info("Step 3: Generating markdown document")
-    generate_markdown(
+    written = generate_markdown(
         rss_path=str(rss_path),
         jsonl_path=str(related_file),
         output_path=str(output_path),
         log=log
     )
 
-    log.info(f"TGN shownotes generated: {output_path}")
+    if written:
+        log.info(f"TGN shownotes generated: {output_path}")
+    else:
+        log.info(f"TGN shownotes unchanged: {output_path}")
     return output_path
 
 
+def _read_page_header(md_path: Path) -> str:
+    """Read an episode page up to and including its '## Transcript' heading."""
+    lines = []
+    with open(md_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            lines.append(line)
+            if line.startswith('## Transcript'):
+                break
+    return ''.join(lines)
+
+
 def backfill_episode_shownotes(podcast_name: str, episodes: list[dict]) -> int:
     """
     Inject shownotes into any episode.md that's missing them.
@@ -91,6 +111,11 @@ def backfill_episode_shownotes(podcast_name: str, episodes: list[dict]) -> int:
     per-episode shownotes even though they weren't available when the
     episode.md was first generated.
 
+    Episodes whose pages are known to carry shownotes are recorded as the
+    'shownotes' stage in the pipeline state store and skipped without any
+    file access. Other pages are only checked when links are available,
+    and then only their header (everything above the transcript) is read.
+
     Args:
         podcast_name: Name of the podcast
         episodes: List of episode entry dicts from the RSS feed
@@ -101,26 +126,34 @@ def backfill_episode_shownotes(podcast_name: str, episodes: list[dict]) -> int:
     log = get_logger()
     from constants import format_episode_number
 
+    state = PipelineState()
+    done = state.episodes_with(podcast_name, 'shownotes')
+
     updated = 0
     for entry in episodes:
         ep_num = entry.get('itunes:episode')
-        if not ep_num:
+        if not ep_num or float(ep_num) in done:
+            continue
+
+        links = get_episode_shownotes(podcast_name, entry)
+        if not links:
             continue
 
         ep_str = format_episode_number(float(ep_num))
+        pages = [base / ep_str / 'episode.md'
+                 for base in [Path(f'sites/{podcast_name}/docs'), Path(f'podcasts/{podcast_name}')]]
+        pages = [md_path for md_path in pages if md_path.exists()]
+        if not pages:
+            continue
 
-        for base in [Path(f'sites/{podcast_name}/docs'), Path(f'podcasts/{podcast_name}')]:
-            md_path = base / ep_str / 'episode.md'
-            if not md_path.exists():
+        complete = True
+        for md_path in pages:
+            header = _read_page_header(md_path)
+            if '## Show Notes' in header:
                 continue
-            content = md_path.read_text()
-            if '## Show Notes' in content:
-                continue
-            if '## Transcript' not in content:
-                continue
-
-            links = get_episode_shownotes(podcast_name, entry)
-            if not links:
+            if '## Transcript' not in header:
+                # Nowhere to put them yet; leave the episode pending
+                complete = False
                 continue
 
             lines = ['## Show Notes', '']
@@ -129,10 +162,14 @@ def backfill_episode_shownotes(podcast_name: str, episodes: list[dict]) -> int:
             lines.append('')
             shownotes_block = '\n'.join(lines)
 
-            content = content.replace('## Transcript', f'{shownotes_block}\n## Transcript')
+            content = md_path.read_text()
+            content = content.replace('## Transcript', f'{shownotes_block}\n## Transcript', 1)
             md_path.write_text(content)
             updated += 1
 
+        if complete:
+            state.record(podcast_name, float(ep_num), 'shownotes', OK)
+
     if updated:
         log.info(f"Backfilled shownotes into {updated} episode pages for {podcast_name}")
 
@@ -343,7 +380,7 @@ def _get_tgn_episode_shownotes(episode_entry: dict, log) -> list[dict]:
 
     substack_url = matches[0]
 
-    # Load related links from JSONL cache
+    # Look up related links in the JSONL cache (indexed once per run)
     data_dir = Path(__file__).parent.parent / 'data'
     related_file = data_dir / 'tgn_related.jsonl'
 
@@ -351,29 +388,26 @@ def _get_tgn_episode_shownotes(episode_entry: dict, log) -> list[dict]:
         log.warning(f"TGN related links cache not found: {related_file}")
         return []
 
-    import json
-    with open(related_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            rec = json.loads(line)
-            if rec.get('source_url') == substack_url and rec.get('status') == 'ok':
-                links = []
-                for link in rec.get('related', []):
-                    text = link.get('text', '').strip()
-                    href = link.get('href', '').strip()
-                    context = (link.get('context') or '').strip()
-
-                    # If text is a shortlink, prefer context or href
-                    if text and any(s in text.lower() for s in
-                                   ['bit.ly', 'amzn.to', 'youtu.be', 'goo.gl', 't.co', 'tinyurl.com']):
-                        text = context if context else href
-
-                    if text and href:
-                        links.append({'text': text, 'url': href})
-                    elif href:
-                        links.append({'text': href, 'url': href})
-                return links
-
-    return []
+    rec = get_related_record(str(related_file), substack_url)
+    if rec is None:
+        return []
+
+    links = []
+    for link in rec.get('related', []):
+        text = link.get('text', '').strip()
+        href = link.get('href', '').strip()
+        context = (link.get('context') or '').strip()
+
+        # If text is a shortlink, prefer context or href
+        if text and any(s in text.lower() for s in
+                       ['bit.ly', 'amzn.to', 'youtu.be', 'goo.gl', 't.co', 'tinyurl.com']):
+            text = context if context else href
+
+        if text and href:
+            links.append({'text': text, 'url': href})
+        elif href:
+            links.append({'text': href, 'url': href})
+    return links
 
 
 def _get_wcl_episode_shownotes(episode_entry: dict, log) -> list[dict]:
@@ -0,0 +1,116 @@
+"""Tests for release-based delta deploys."""
+import os
+
+import pytest
+
+import tasks.build as build
+
+
+@pytest.fixture
+def deploy(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, "DEPLOY_BASE_PATH", str(tmp_path / "www"))
+    monkeypatch.setattr(build, "DEPLOY_MODE", "release")
+    monkeypatch.setattr(build, "PODCAST_ROOT", str(tmp_path / "podcasts"))
+    (tmp_path / "www").mkdir()
+    site = tmp_path / "site"
+    (site / "14" / "episode").mkdir(parents=True)
+    (site / "index.html").write_text("home v1")
+    (site / "14" / "episode" / "index.html").write_text("episode 14")
+    return tmp_path / "www", site
+
+
+def test_deploy_links_unchanged_files_and_swaps_symlink(deploy):
+    www, site = deploy
+    build.deploy_site.fn("tgn", site)
+    first = build.current_release("tgn")
+    assert (www / "tgn").is_symlink()
+    assert (www / "tgn" / "index.html").read_text() == "home v1"
+
+    (site / "index.html").write_text("home v2")
+    (site / "15").mkdir()
+    (site / "15" / "index.html").write_text("episode 15")
+    build.deploy_site.fn("tgn", site)
+    second = build.current_release("tgn")
+    assert second > first
+    assert (www / "tgn" / "index.html").read_text() == "home v2"
+    assert (www / "tgn" / "15" / "index.html").exists()
+
+    # Unchanged file shares the old release's inode; changed one doesn't
+    old, new = build.releases_dir("tgn") / first, build.releases_dir("tgn") / second
+    assert os.stat(old / "14/episode/index.html").st_ino == os.stat(new / "14/episode/index.html").st_ino
+    assert (old / "index.html").read_text() == "home v1"
+
+    assert build.rollback_site("tgn") == first
+    assert (www / "tgn" / "index.html").read_text() == "home v1"
+    with pytest.raises(ValueError):
+        build.rollback_site("tgn")
+
+
+def test_legacy_directory_becomes_a_release(deploy):
+    www, site = deploy
+    (www / "tgn").mkdir()
+    (www / "tgn" / "index.html").write_text("rsynced")
+    build.deploy_site.fn("tgn", site)
+    releases = build.list_releases("tgn")
+    assert len(releases) == 2 and releases[0].endswith("-legacy")
+    assert build.rollback_site("tgn") == releases[0]
+    assert (www / "tgn" / "index.html").read_text() == "rsynced"
+
+
+def test_prune_keeps_newest_and_live(deploy, monkeypatch):
+    www, site = deploy
+    for n in range(4):
+        (site / "index.html").write_text(f"home {n}")
+        build.deploy_site.fn("tgn", site)
+    releases = build.list_releases("tgn")
+    build.rollback_site("tgn", releases[0])
+    assert build.prune_releases("tgn", keep=2) == releases[1:2]
+    assert build.list_releases("tgn") == [releases[0], *releases[2:]]
+    assert not (build.releases_dir("tgn") / f"{releases[1]}.manifest.json").exists()
+
+
+@pytest.fixture
+def audio(tmp_path, monkeypatch):
+    podcasts, sites = tmp_path / "podcasts", tmp_path / "sites"
+    monkeypatch.setattr(build, "PODCAST_ROOT", str(podcasts))
+    monkeypatch.setattr(build, "SITE_ROOT", str(sites))
+    monkeypatch.setattr(build, "MEDIA_MODE", "link")
+    for n in ("14", "15"):
+        (podcasts / "tgn" / n).mkdir(parents=True)
+        (podcasts / "tgn" / n / "episode.mp3").write_bytes(b"ID3" + n.encode() * 100)
+    return podcasts / "tgn", sites / "tgn" / "docs"
+
+
+def test_deploy_links_audio_instead_of_copying(deploy, audio):
+    www, site = deploy
+    episodes, _ = audio
+    build.deploy_site.fn("tgn", site)
+    mp3 = www / "tgn" / "14" / "episode.mp3"
+    assert mp3.is_symlink() and mp3.resolve() == (episodes / "14" / "episode.mp3").resolve()
+    assert mp3.read_bytes().startswith(b"ID3")
+    # No page directory for 15 in the site, so no link
+    assert not (www / "tgn" / "15").exists()
+
+
+def test_evict_site_audio_only_removes_duplicates(audio):
+    episodes, docs = audio
+    (docs / "14").mkdir(parents=True)
+    (docs / "15").mkdir()
+    (docs / "14" / "episode.mp3").write_bytes((episodes / "14" / "episode.mp3").read_bytes())
+    (docs / "15" / "episode.mp3").write_bytes(b"different")
+    assert build.evict_site_audio.fn("tgn") == 1
+    assert not (docs / "14" / "episode.mp3").exists()
+    assert (docs / "15" / "episode.mp3").exists()
+
+
+def test_copy_episode_files_leaves_audio_in_link_mode(tmp_path, monkeypatch):
+    import tasks.markdown as markdown
+    monkeypatch.setattr(markdown, "MEDIA_MODE", "link")
+    episode_dir, site_dir = tmp_path / "ep", tmp_path / "site"
+    episode_dir.mkdir()
+    site_dir.mkdir()
+    (episode_dir / "episode.md").write_text("# Ep")
+    (episode_dir / "episode.mp3").write_bytes(b"ID3")
+    markdown.copy_episode_files.fn(episode_dir, site_dir)
+    assert (site_dir / "episode.md").exists()
+    assert not (site_dir / "episode.mp3").exists()
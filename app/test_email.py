@@ -0,0 +1,46 @@
+"""Tests for the pooled mailer, against a local SMTP stand-in (see conftest.py)."""
+import utils.email as email_utils
+from utils.email import mail_session, send_failure_alert, send_notification_email
+
+
+def test_session_reuses_one_login_and_digests_alerts(smtp, mailer):
+    with mail_session(mailer):
+        send_notification_email(["a@example.com"], [363.0], "https://tgn.phfactor.net", {363.0: "Ep"})
+        send_notification_email(["b@example.com"], [14.5, 364.0], "https://tgn.phfactor.net")
+        send_failure_alert("tgn failed")
+        send_failure_alert("flow failed")
+        assert len(smtp.messages) == 2  # alerts wait for the digest
+    assert (smtp.connections, smtp.logins) == (1, 1)
+    assert len(smtp.messages) == 3
+    assert smtp.messages[1]["Subject"] == "2 new episodes are available"
+    digest = smtp.messages[2]
+    assert digest["Subject"] == "2 errors in podcast processing"
+    body = digest.get_payload()
+    assert "Alert 1 of 2" in body and "tgn failed" in body and "flow failed" in body
+    assert email_utils._session is None
+
+
+def test_nested_sessions_share_the_outer_mailer(smtp, mailer):
+    with mail_session(mailer) as outer:
+        with mail_session() as inner:
+            assert inner is outer
+            send_failure_alert("inner")
+        assert smtp.messages == []
+    assert [m["Subject"] for m in smtp.messages] == ["Error in podcast processing"]
+
+
+def test_reconnects_when_server_drops_session(smtp, mailer):
+    smtp.drop_after_message = True
+    with mailer as m:
+        m.send(to_addrs=["a@example.com"], subject="one", msg="1")
+        m.send(to_addrs=["a@example.com"], subject="two", msg="2")
+    assert [msg["Subject"] for msg in smtp.messages] == ["one", "two"]
+    assert smtp.connections == 2
+
+
+def test_no_email_file_disables_sending(smtp, mailer, tmp_path):
+    (tmp_path / ".no_email").touch()
+    with mailer as m:
+        assert m.send(to_addrs=["a@example.com"], subject="x", msg="y") is False
+        m.alert("ignored")
+    assert smtp.connections == 0
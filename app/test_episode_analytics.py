@@ -0,0 +1,62 @@
+"""Tests for per-episode audience analytics."""
+from datetime import datetime
+
+import episode_analytics as ea
+from traffic_analytics import LogRecord
+
+SAFARI = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Version/17.0 Mobile/15E148 Safari/604.1"
+PUBLISHED = datetime(2026, 3, 1, 12, 0)
+
+FEED = """<?xml version="1.0"?>
+<rss xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>
+<item><title>New one</title><itunes:episode>364</itunes:episode>
+<pubDate>Sun, 01 Mar 2026 12:00:00 {tz}</pubDate></item>
+<item><title>Old one</title><itunes:episode>363.0</itunes:episode>
+<pubDate>Sun, 22 Feb 2026 12:00:00 {tz}</pubDate></item>
+<item><title>No number</title><pubDate>Sun, 15 Feb 2026 12:00:00 +0000</pubDate></item>
+</channel></rss>"""
+
+
+def rec(hours_after: float, uri: str, ip: str = "203.0.113.1", ua: str = SAFARI,
+        status: int = 200, size: int = 1000, byte_range: str = "") -> LogRecord:
+    ts = PUBLISHED.timestamp() + hours_after * 3600
+    return LogRecord(ts, uri, "GET", status, size, ip, ua, "US", "", byte_range)
+
+
+def test_fold_joins_logs_with_feed(tmp_path):
+    tz = PUBLISHED.astimezone().strftime("%z")
+    (tmp_path / "feed.rss").write_text(FEED.format(tz=tz))
+    episodes = ea.load_episodes(tmp_path / "feed.rss")
+    assert sorted(episodes) == ["363", "364"]
+
+    records = [
+        rec(2, "/364/episode/"),
+        rec(30, "/364.0/episode/", ip="198.51.100.7"),
+        rec(3, "/364/episode.mp3", byte_range="bytes=0-1", status=206, size=2),
+        rec(3.01, "/364/episode.mp3", byte_range="bytes=2-999999", status=206, size=999998),
+        rec(26, "/364/episode.mp3", ip="198.51.100.7", size=5_000_000),
+        rec(27, "/364/episode.mp3", status=404),
+        rec(5, "/364/episode/", ua="Mozilla/5.0 (compatible; Googlebot/2.1)"),
+        rec(5, "/999/episode/"),
+        rec(5, "/364/episode.mp3?download=1", ip="192.0.2.4", byte_range="bytes=0-"),
+    ]
+    audience = ea.fold_audience(iter(records), episodes)
+    assert list(audience) == ["364"]
+    ep = audience["364"]
+    assert ep.views == {0: 1, 1: 1}
+    assert ep.downloads == {0: 2, 1: 1}
+    assert sum(ep.audio_bytes.values()) == 6_001_000
+    assert len(ep.listeners) == 3
+
+    rows = ea.audience_report(audience, episodes, days=3)
+    assert [r["episode"] for r in rows] == ["364", "363"]
+    assert rows[0]["hours_to_first_view"] == 2.0 and rows[0]["hours_to_first_download"] == 3.0
+    assert rows[0]["read_curve"] == [1, 2, 2] and rows[0]["listen_curve"] == [2, 3, 3]
+    assert rows[1]["views"] == 0 and rows[1]["hours_to_first_view"] is None
+
+
+def test_starts_download():
+    assert ea.starts_download("")
+    assert ea.starts_download("bytes=0-")
+    assert ea.starts_download("bytes= 0-1")
+    assert not ea.starts_download("bytes=1000-2000")
@@ -0,0 +1,35 @@
+"""Tests for Substack show-note extraction."""
+from bs4 import BeautifulSoup
+
+from related_links_collector.extractors import extract_substack_any, parse_substack_body
+
+BASE_URL = "https://thegreynato.substack.com/p/362-10-years-of-tgn"
+
+PAGE = """<html><head><script>var x = "<div class='body markup'>";</script></head><body>
+<nav><a href="/p/other">Other</a></nav>
+<div class="available-content"><div dir="auto" class="body markup">
+<p>Intro paragraph.</p>
+<p>Rolex: <a href="https://rolex.com">rolex.com</a><br/>
+Tudor <a href="/tudor">Tudor page</a><br/>
+<a href="https://omega.com">Omega</a> 12:30</p>
+</div></div>
+<div class="comments"><p><a href="https://spam.example">a</a><br/><a href="https://x.example">b</a><br/></p></div>
+</body></html>"""
+
+
+def test_body_only_parse_matches_full_soup():
+    from_html = extract_substack_any(PAGE, BASE_URL)
+    assert from_html == extract_substack_any(BeautifulSoup(PAGE, "lxml"), BASE_URL)
+    assert [it["href"] for it in from_html] == [
+        "https://rolex.com", "https://thegreynato.substack.com/tudor", "https://omega.com"]
+
+
+def test_parsed_body_container_is_accepted():
+    body = parse_substack_body(PAGE)
+    assert body is not None and body.find("nav") is None
+    assert len(extract_substack_any(body, BASE_URL)) == 3
+
+
+def test_page_without_post_body():
+    assert parse_substack_body("<html><body><p>nothing</p></body></html>") is None
+    assert extract_substack_any("<html><body><p>nothing</p></body></html>", BASE_URL) == []
@@ -0,0 +1,110 @@
+"""Tests for the persisted email outbox and its background worker."""
+import threading
+import time
+
+import utils.outbox as outbox_utils
+from utils.outbox import FAILED, MAX_ATTEMPTS, PENDING, SENDING, SENT, Outbox, outbox_worker, queue_email
+
+
+class FailingMailer:
+    def __init__(self):
+        self.calls = 0
+
+    def send(self, **kwargs):
+        self.calls += 1
+        raise OSError("connection refused")
+
+
+class StalledMailer:
+    """Blocks every send until released, like an SMTP server that stopped answering."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.sent = []
+
+    def send(self, *, to_addrs, subject, msg):
+        self.release.wait(5)
+        self.sent.append(subject)
+        return True
+
+
+def test_queued_mail_survives_until_a_worker_runs(smtp, mailer, tmp_path):
+    box = Outbox(tmp_path / "state.db")
+    queue_email(["a@example.com"], "New episode available", "body", outbox=box)
+    assert smtp.messages == []
+
+    # A later run: a fresh Outbox on the same database finds the message
+    with outbox_worker(Outbox(tmp_path / "state.db"), mailer):
+        pass
+    assert [m["Subject"] for m in smtp.messages] == ["New episode available"]
+    assert box.counts() == {SENT: 1}
+
+
+def test_queueing_does_not_wait_for_smtp(tmp_path):
+    stalled = StalledMailer()
+    box = Outbox(tmp_path / "state.db")
+    with outbox_worker(box, stalled, shutdown_timeout=5) as worker:
+        queue_email(["a@example.com"], "one", "1")
+        queue_email(["a@example.com"], "two", "2")
+        assert worker.outbox is box
+        assert stalled.sent == []  # still queued, the caller carried on
+        stalled.release.set()
+    assert stalled.sent == ["one", "two"]
+    assert outbox_utils._worker is None
+
+
+def test_failed_send_is_retried_with_backoff(tmp_path):
+    box = Outbox(tmp_path / "state.db")
+    box.put(["a@example.com"], "subject", "body")
+    failing = FailingMailer()
+
+    assert box.drain(failing) == (0, 1)
+    assert box.due() == []  # backing off
+    assert box.drain(failing) == (0, 0)
+    assert failing.calls == 1
+    assert box.counts() == {PENDING: 1}
+
+    with box._connect() as conn:
+        conn.execute("UPDATE outbox SET next_attempt_at = 0")
+    message = box.due()[0]
+    assert message.attempts == 1
+    before = time.time()
+    box.mark_failed(message, "still down")
+    with box._connect() as conn:
+        next_attempt, error = conn.execute("SELECT next_attempt_at, error FROM outbox").fetchone()
+    assert next_attempt - before >= 2 * outbox_utils.RETRY_BASE  # doubled on the second failure
+    assert error == "still down"
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    box = Outbox(tmp_path / "state.db")
+    box.put(["a@example.com"], "subject", "body")
+    for _ in range(MAX_ATTEMPTS):
+        with box._connect() as conn:
+            conn.execute("UPDATE outbox SET next_attempt_at = 0")
+        box.drain(FailingMailer())
+    assert box.counts() == {FAILED: 1}
+
+
+def test_overlapping_workers_send_each_message_once(smtp, mailer, tmp_path):
+    first, second = Outbox(tmp_path / "state.db"), Outbox(tmp_path / "state.db")
+    message_id = first.put(["a@example.com"], "New episode available", "body")
+    [message] = second.due()
+    assert first.claim(message_id)
+    assert not second.claim(message.id)  # already claimed by the other run
+
+    assert second.drain(mailer) == (0, 0)
+    assert smtp.messages == []
+    assert first.counts() == {SENDING: 1}
+
+
+def test_expired_claim_is_sent_again(smtp, mailer, tmp_path):
+    box = Outbox(tmp_path / "state.db")
+    message_id = box.put(["a@example.com"], "subject", "body")
+    assert box.claim(message_id)
+    assert box.due() == []
+    # The claiming worker died mid-send; once its lease runs out the message is due again
+    with box._connect() as conn:
+        conn.execute("UPDATE outbox SET next_attempt_at = 0")
+    assert box.drain(mailer) == (1, 0)
+    assert box.counts() == {SENT: 1}
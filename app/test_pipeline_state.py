@@ -0,0 +1,78 @@
+"""Tests for the SQLite pipeline state store."""
+import json
+
+import pytest
+
+from utils.state import PipelineState, hash_inputs, OK, FAILED, PENDING
+
+
+@pytest.fixture
+def state(tmp_path):
+    return PipelineState(tmp_path / "state.db")
+
+
+def test_track_records_ok_with_duration(state):
+    with state.track("tgn", 14, "download", input_hash="abc"):
+        pass
+    rec = state.episode_status("tgn", 14)["download"]
+    assert rec["status"] == OK
+    assert rec["input_hash"] == "abc"
+    assert rec["duration_s"] >= 0
+
+
+def test_track_records_failure_and_reraises(state):
+    with pytest.raises(RuntimeError):
+        with state.track("tgn", 14, "transcribe"):
+            raise RuntimeError("server down")
+    rec = state.episode_status("tgn", 14)["transcribe"]
+    assert rec["status"] == FAILED
+    assert "server down" in rec["error"]
+
+
+def test_pending_lists_episodes_ready_for_stage(state):
+    for ep in (1, 2, 3):
+        state.record("tgn", ep, "transcribe", OK)
+    state.record("tgn", 2, "attribute", OK)
+    state.record("tgn", 3, "attribute", FAILED)
+    state.record("wcl", 9, "transcribe", OK)
+    assert state.pending("tgn", "attribute") == [1.0, 3.0]
+
+
+def test_history_keeps_every_run(state):
+    state.record("tgn", 14.5, "attribute", FAILED, error="rate limited")
+    state.record("tgn", 14.5, "attribute", OK)
+    runs = state.history("tgn", 14.5)
+    assert [r["status"] for r in runs] == [FAILED, OK]
+    assert state.episode_status("tgn", 14.5)["attribute"]["status"] == OK
+
+
+def test_reset_always_includes_publish(state):
+    state.record("tgn", 14, "attribute", OK)
+    state.record("tgn", 14, "publish", OK)
+    state.reset("tgn", 14, ["attribute"])
+    statuses = state.stage_statuses("tgn", "publish")
+    assert statuses == {14.0: PENDING}
+    assert 14.0 not in state.episodes_with("tgn", "attribute")
+
+
+def test_unknown_stage_rejected(state):
+    with pytest.raises(ValueError):
+        state.record("tgn", 1, "upload", OK)
+
+
+def test_notified_import_from_legacy_json(state, tmp_path):
+    legacy = tmp_path / "tgn-notified.json"
+    legacy.write_text(json.dumps([1.0, 2.0, 14.5]))
+    assert state.import_notified_json("tgn", legacy) == 3
+    state.mark_notified("tgn", [3.0])
+    assert state.notified_episodes("tgn") == {1.0, 2.0, 3.0, 14.5}
+    assert state.notified_episodes("wcl") == set()
+
+
+def test_hash_inputs_reads_file_contents(tmp_path):
+    f = tmp_path / "a.json"
+    f.write_text("one")
+    first = hash_inputs(f)
+    f.write_text("two")
+    assert hash_inputs(f) != first
+    assert hash_inputs("x", "y") != hash_inputs("xy")
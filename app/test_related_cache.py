@@ -0,0 +1,96 @@
+"""Tests for the related-links JSONL cache index."""
+import json
+import os
+
+import pytest
+
+from related_links_collector.cache import (
+    load_related_index, get_related_record, lookup_record, clear_index_cache
+)
+from related_links_collector import cache
+from related_links_collector.compact import compact
+
+URL = "https://thegreynato.substack.com/p/362-10-years-of-tgn"
+
+
+def _write(path, records):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in records))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_index_cache()
+    yield
+    clear_index_cache()
+
+
+def test_latest_good_record_wins(tmp_path):
+    jsonl = tmp_path / "related.jsonl"
+    _write(jsonl, [
+        {"source_url": URL, "status": "ok", "related": [{"href": "https://old"}]},
+        {"source_url": URL, "status": "error", "error": "boom"},
+        {"source_url": URL, "status": "ok", "related": [{"href": "https://new"}]},
+    ])
+    rec = get_related_record(str(jsonl), URL)
+    assert rec["related"] == [{"href": "https://new"}]
+
+
+def test_index_reloads_when_file_changes(tmp_path):
+    jsonl = tmp_path / "related.jsonl"
+    _write(jsonl, [{"source_url": URL, "status": "ok", "related": []}])
+    first = load_related_index(str(jsonl))
+    assert load_related_index(str(jsonl)) is first  # memoized
+
+    _write(jsonl, [{"source_url": URL, "status": "ok", "related": []},
+                   {"source_url": URL + "-2", "status": "ok", "related": []}])
+    st = os.stat(jsonl)
+    os.utime(jsonl, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert set(load_related_index(str(jsonl))) == {URL, URL + "-2"}
+
+
+def test_missing_file_and_unknown_url(tmp_path):
+    assert load_related_index(str(tmp_path / "absent.jsonl")) == {}
+    jsonl = tmp_path / "related.jsonl"
+    _write(jsonl, [{"source_url": URL, "status": "skipped_robots", "related": []}])
+    assert URL in load_related_index(str(jsonl))
+    assert get_related_record(str(jsonl), URL) is None
+
+
+def test_compact_keeps_latest_good_record_in_first_seen_order(tmp_path):
+    jsonl = tmp_path / "related.jsonl"
+    _write(jsonl, [
+        {"source_url": "https://b", "status": "ok", "related": [1]},
+        {"source_url": "https://a", "status": "ok", "related": [2]},
+        {"source_url": "https://c", "status": "error", "error": "boom"},
+        {"source_url": "https://b", "status": "ok", "related": [3]},
+    ])
+    stats = compact(str(jsonl))
+    assert stats == {"read": 4, "kept": 2, "superseded": 1, "dropped": 1, "unparseable": 0}
+    lines = [json.loads(l) for l in jsonl.read_text().splitlines()]
+    assert [(r["source_url"], r["related"]) for r in lines] == [("https://b", [3]), ("https://a", [2])]
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_compact_sorted_with_offset_index(tmp_path):
+    jsonl = tmp_path / "related.jsonl"
+    _write(jsonl, [
+        {"source_url": "https://b", "status": "ok", "related": ["é"]},
+        {"source_url": "https://a", "status": "ok", "related": []},
+    ])
+    compact(str(jsonl), sort=True, write_index=True)
+    assert json.loads(jsonl.read_text().splitlines()[0])["source_url"] == "https://a"
+    assert (tmp_path / "related.jsonl.idx").exists()
+
+    # Served from the offset index without building the full in-memory index
+    assert lookup_record(str(jsonl), "https://b")["related"] == ["é"]
+    assert lookup_record(str(jsonl), "https://missing") is None
+    assert os.path.abspath(jsonl) not in cache._loaded
+
+
+def test_stale_offset_index_is_ignored(tmp_path):
+    jsonl = tmp_path / "related.jsonl"
+    _write(jsonl, [{"source_url": "https://a", "status": "ok", "related": []}])
+    compact(str(jsonl), write_index=True)
+    with open(jsonl, "a") as f:
+        f.write(json.dumps({"source_url": "https://new", "status": "ok", "related": [9]}) + "\n")
+    assert lookup_record(str(jsonl), "https://new")["related"] == [9]
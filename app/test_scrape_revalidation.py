@@ -0,0 +1,116 @@
+"""Tests for conditional revalidation of already-scraped pages."""
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from related_links_collector.cache import clear_index_cache, get_related_record
+from related_links_collector.scrape import run
+
+
+class Page:
+    etag = '"v1"'
+    links = ["https://rolex.com/"]
+    requests = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        Page.requests.append(self.headers.get("If-None-Match"))
+        if Page.etag and self.headers.get("If-None-Match") == Page.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        items = "".join(f'<li><a href="{u}">{u}</a></li>' for u in Page.links)
+        body = f"<html><body><h2>Related</h2><ul>{items}</ul></body></html>".encode()
+        self.send_response(200)
+        if Page.etag:
+            self.send_header("ETag", Page.etag)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def site(tmp_path):
+    clear_index_cache()
+    Page.etag, Page.links, Page.requests = '"v1"', ["https://rolex.com/"], []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/p/1"
+    (tmp_path / "urls.txt").write_text(url + "\n")
+    yield tmp_path, url
+    server.shutdown()
+    clear_index_cache()
+
+
+def _scrape(tmp_path, **kwargs):
+    run(str(tmp_path / "urls.txt"), str(tmp_path / "out.jsonl"), str(tmp_path / "exc.jsonl"),
+        rate=0, log=logging.getLogger("test"), **kwargs)
+    return [json.loads(l) for l in (tmp_path / "out.jsonl").read_text().splitlines()]
+
+
+def test_revalidation_skips_unchanged_and_picks_up_edits(site):
+    tmp_path, url = site
+    first = _scrape(tmp_path)
+    assert len(first) == 1 and first[0]["etag"] == '"v1"'
+
+    # Cached pages are skipped entirely without revalidate
+    assert len(_scrape(tmp_path)) == 1
+    assert Page.requests == [None]
+
+    # 304: nothing parsed, nothing appended
+    assert len(_scrape(tmp_path, revalidate=True)) == 1
+    assert Page.requests == [None, '"v1"']
+
+    Page.etag, Page.links = '"v2"', ["https://rolex.com/", "https://tudorwatch.com/"]
+    records = _scrape(tmp_path, revalidate=True)
+    assert len(records) == 2
+    assert records[1]["etag"] == '"v2"'
+    assert records[1]["first_fetched_at"] == first[0]["fetched_at"]
+    assert len(get_related_record(str(tmp_path / "out.jsonl"), url)["related"]) == 2
+
+
+def test_revalidation_window(site):
+    tmp_path, url = site
+    _scrape(tmp_path)
+    _scrape(tmp_path, revalidate=True, newer_than_days=0)
+    assert Page.requests == [None]
+    _scrape(tmp_path, revalidate=True, newer_than_days=14)
+    assert Page.requests == [None, '"v1"']
+
+
+def test_unchanged_page_without_validators_appends_nothing(site):
+    tmp_path, url = site
+    Page.etag = None
+    _scrape(tmp_path)
+    size = (tmp_path / "out.jsonl").stat().st_size
+    for _ in range(2):
+        assert len(_scrape(tmp_path, revalidate=True, newer_than_days=14)) == 1
+    assert Page.requests == [None, None, None]  # re-fetched in full each time
+    assert (tmp_path / "out.jsonl").stat().st_size == size
+
+    Page.links = ["https://rolex.com/", "https://tudorwatch.com/"]
+    assert len(_scrape(tmp_path, revalidate=True)) == 2
+
+
+def test_validators_are_stored_when_links_are_unchanged(site):
+    tmp_path, url = site
+    Page.etag = None
+    _scrape(tmp_path)
+
+    # The server starts sending an ETag: same links, but the validator is recorded
+    Page.etag = '"v1"'
+    records = _scrape(tmp_path, revalidate=True)
+    assert len(records) == 2 and records[1]["etag"] == '"v1"'
+    assert records[1]["related"] == records[0]["related"]
+
+    # ...so the next revalidation is conditional and answered with a 304
+    assert len(_scrape(tmp_path, revalidate=True)) == 2
+    assert Page.requests == [None, None, '"v1"']
@@ -0,0 +1,69 @@
+"""Tests for sharded, incremental Pagefind indexing."""
+import json
+
+import pytest
+
+import tasks.build as build
+
+
+@pytest.fixture
+def built(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_pagefind(site_path, pages, output_path):
+        calls.append((output_path.name, pages))
+        output_path.mkdir(parents=True)
+        (output_path / "pagefind.js").write_text(json.dumps(pages))
+
+    monkeypatch.setattr(build, "run_pagefind", fake_pagefind)
+    site = tmp_path / "tgn" / "site"
+    for page in ("index.html", "search/index.html", "14/episode/index.html",
+                 "49.5/episode/index.html", "362/episode/index.html"):
+        (site / page).parent.mkdir(parents=True, exist_ok=True)
+        (site / page).write_text(f"<html>{page}</html>")
+    (site / "14" / "episode.html").write_text("snapshot")
+    return site, calls
+
+
+def test_shard_names():
+    assert build.search_shard("362/episode/index.html") == "ep-0350"
+    assert build.search_shard("49.5/episode/index.html") == "ep-0000"
+    assert build.search_shard("shownotes/index.html") == "main"
+
+
+def test_first_run_indexes_every_shard(built):
+    site, calls = built
+    build.generate_search_index.fn(site)
+    assert dict(calls) == {
+        "ep-0000": ["14/episode/index.html", "49.5/episode/index.html"],
+        "ep-0350": ["362/episode/index.html"],
+        "main": ["index.html", "search/index.html"],
+    }
+    assert (site / "pagefind" / "pagefind.js").exists()
+    assert json.loads((site / "pagefind" / "shards.json").read_text()) == [
+        "/pagefind/shards/ep-0000/", "/pagefind/shards/ep-0350/"]
+
+
+def test_rebuilt_site_reindexes_only_changed_shards(built, tmp_path):
+    site, calls = built
+    build.generate_search_index.fn(site)
+    calls.clear()
+
+    # zensical wipes site/ on each build; unchanged shards come back from the cache
+    import shutil
+    shutil.rmtree(site / "pagefind")
+    (site / "362" / "episode" / "index.html").write_text("<html>edited</html>")
+    (site / "363" / "episode").mkdir(parents=True)
+    (site / "363" / "episode" / "index.html").write_text("<html>new</html>")
+    build.generate_search_index.fn(site)
+    assert [name for name, _ in calls] == ["ep-0350"]
+    assert (site / "pagefind" / "shards" / "ep-0000" / "pagefind.js").exists()
+
+    # Removing a page re-indexes its shard; an emptied shard is dropped
+    calls.clear()
+    shutil.rmtree(site / "14")
+    shutil.rmtree(site / "49.5")
+    build.generate_search_index.fn(site)
+    assert calls == []
+    assert not (tmp_path / "tgn" / build.SEARCH_SHARDS / "ep-0000").exists()
+    assert json.loads((site / "pagefind" / "shards.json").read_text()) == ["/pagefind/shards/ep-0350/"]
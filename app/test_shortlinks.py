@@ -0,0 +1,125 @@
+"""Tests for the persistent shortlink resolution store."""
+import json
+import time
+
+import pytest
+
+from related_links_collector.resolvers import expand_shortlink
+from related_links_collector.shortlinks import ShortlinkStore
+
+SHORT = "https://bit.ly/362tgn"
+DEST = "https://thegreynato.substack.com/p/362-10-years-of-tgn"
+
+
+class FakeClient:
+    """Stands in for a requests session, counting HEAD requests."""
+
+    def __init__(self, url=DEST, error=None):
+        self.url, self.error, self.calls = url, error, 0
+
+    def head(self, u, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+
+        class Response:
+            status_code = 200
+            url = self.url
+        return Response()
+
+    get = head
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ShortlinkStore(tmp_path / "shortlinks.db")
+
+
+def test_resolution_is_fetched_once(store):
+    client = FakeClient()
+    assert expand_shortlink(SHORT, client, store=store) == DEST
+    assert expand_shortlink(SHORT, client, store=store) == DEST
+    assert client.calls == 1
+    # Known links resolve even without a client
+    assert expand_shortlink(SHORT, None, store=store) == DEST
+
+
+def test_failures_are_remembered_until_ttl(store):
+    client = FakeClient(error=ValueError("dead link"))
+    assert expand_shortlink(SHORT, client, store=store) == SHORT
+    calls = client.calls
+    assert expand_shortlink(SHORT, client, store=store) == SHORT
+    assert client.calls == calls
+
+    # retry_failed bypasses the negative entry, and success replaces it
+    assert expand_shortlink(SHORT, FakeClient(), store=store, retry_failed=True) == DEST
+    assert store.get(SHORT) == DEST
+
+
+def test_expired_failure_is_retried(tmp_path):
+    store = ShortlinkStore(tmp_path / "shortlinks.db", negative_ttl=0.01)
+    store.put_failure(SHORT, "timeout")
+    assert store.get(SHORT) == SHORT
+    time.sleep(0.02)
+    assert store.get(SHORT) is None
+
+
+def test_failure_does_not_clobber_success(store):
+    store.put(SHORT, DEST)
+    store.put_failure(SHORT, "timeout")
+    assert store.get(SHORT) == DEST
+
+
+def test_import_json_overrides_failures(store, tmp_path):
+    store.put_failure(SHORT, "timeout")
+    mapping = tmp_path / "bitly.json"
+    mapping.write_text(json.dumps({SHORT: DEST, "https://bit.ly/other": "https://example.com"}))
+    assert store.import_json(mapping) == 2
+    assert store.get(SHORT) == DEST
+    assert store.resolved(host="bit.ly") == {SHORT: DEST, "https://bit.ly/other": "https://example.com"}
+    assert store.import_json(tmp_path / "absent.json") == 0
+
+
+def test_non_shortener_urls_skip_the_store(store):
+    client = FakeClient()
+    assert expand_shortlink("https://rolex.com/", client, store=store) == "https://rolex.com/"
+    assert client.calls == 0
+
+
+def test_fix_shortlinks_resolves_each_link_once(tmp_path, monkeypatch):
+    from related_links_collector import fix_shortlinks as fix
+
+    calls = []
+
+    def fake_expand(u, client, retry_failed=False):
+        calls.append(u)
+        return DEST if u == SHORT else u
+
+    monkeypatch.setattr(fix, "expand_shortlink", fake_expand)
+    jsonl = tmp_path / "related.jsonl"
+    error_line = json.dumps({"source_url": "https://c", "status": "error", "related": [{"href": SHORT}]}) + "\n"
+    jsonl.write_text(
+        json.dumps({"source_url": "https://a", "status": "ok",
+                    "related": [{"href": SHORT}, {"href": "https://bit.ly/dead"}]}) + "\n"
+        + "not json\n" + error_line
+        + json.dumps({"source_url": "https://b", "status": "ok", "related": [{"href": SHORT}]}) + "\n")
+
+    assert fix.fix_shortlinks(str(jsonl)) == {"unresolved": 2, "resolved": 1}
+    assert sorted(calls) == sorted([SHORT, "https://bit.ly/dead"])
+    lines = jsonl.read_text().splitlines(keepends=True)
+    assert [l["href"] for l in json.loads(lines[0])["related"]] == [DEST, "https://bit.ly/dead"]
+    assert lines[1:3] == ["not json\n", error_line]
+    assert json.loads(lines[3])["related"] == [{"href": DEST}]
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_rss_unwrap_only_opens_a_session_on_a_store_miss(store, monkeypatch):
+    import tasks.rss as rss
+    store.put(SHORT, DEST)
+    monkeypatch.setattr(rss, "default_store", lambda: store)
+
+    def no_session():
+        raise AssertionError("known shortlink should not open an HTTP session")
+
+    monkeypatch.setattr(rss.requests, "Session", no_session)
+    assert rss._unwrap_bitly(SHORT) == DEST
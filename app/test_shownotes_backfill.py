@@ -0,0 +1,74 @@
+"""Tests for backfilling per-episode shownotes into episode pages."""
+import pytest
+
+import tasks.shownotes as shownotes
+from utils.state import PipelineState
+
+PAGE = """# Episode 14
+
+## Synopsis
+Talk about watches.
+
+## Transcript
+|*Speaker*||
+|----|----|
+|Jason|## Show Notes are mentioned in passing|
+"""
+
+LINKS = [{'text': 'Rolex', 'url': 'https://rolex.com'}]
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = PipelineState(tmp_path / "state.db")
+    monkeypatch.setattr(shownotes, "PipelineState", lambda: state)
+    for base in ("sites/tgn/docs/14", "podcasts/tgn/14"):
+        (tmp_path / base).mkdir(parents=True)
+        (tmp_path / base / "episode.md").write_text(PAGE)
+    return tmp_path, state
+
+
+def test_backfill_injects_and_records_marker(site, monkeypatch):
+    tmp_path, state = site
+    monkeypatch.setattr(shownotes, "get_episode_shownotes", lambda name, entry: LINKS)
+
+    # Show Notes text inside the transcript must not count as existing shownotes
+    assert shownotes.backfill_episode_shownotes('tgn', [{'itunes:episode': '14'}]) == 2
+    page = (tmp_path / "sites/tgn/docs/14/episode.md").read_text()
+    assert "## Show Notes\n\n- [Rolex](https://rolex.com)\n\n## Transcript" in page
+    assert state.episodes_with('tgn', 'shownotes') == {14.0}
+
+
+def test_marked_episodes_are_skipped_without_lookup(site, monkeypatch):
+    tmp_path, state = site
+    state.record('tgn', 14, 'shownotes', 'ok')
+
+    def fail(name, entry):
+        raise AssertionError("marked episode should not be looked up")
+
+    monkeypatch.setattr(shownotes, "get_episode_shownotes", fail)
+    assert shownotes.backfill_episode_shownotes('tgn', [{'itunes:episode': '14'}]) == 0
+
+
+def test_episode_without_links_is_not_marked(site, monkeypatch):
+    tmp_path, state = site
+    monkeypatch.setattr(shownotes, "get_episode_shownotes", lambda name, entry: [])
+    assert shownotes.backfill_episode_shownotes('tgn', [{'itunes:episode': '14'}]) == 0
+    assert state.episodes_with('tgn', 'shownotes') == set()
+
+
+def test_page_without_transcript_stays_pending(site, monkeypatch):
+    tmp_path, state = site
+    monkeypatch.setattr(shownotes, "get_episode_shownotes", lambda name, entry: LINKS)
+    pending = tmp_path / "podcasts/tgn/14/episode.md"
+    pending.write_text("# Episode 14\n\n## Synopsis\nTalk about watches.\n")
+
+    assert shownotes.backfill_episode_shownotes('tgn', [{'itunes:episode': '14'}]) == 1
+    assert state.episodes_with('tgn', 'shownotes') == set()
+
+    # Once the transcript lands, the next pass finishes the episode
+    pending.write_text(PAGE)
+    assert shownotes.backfill_episode_shownotes('tgn', [{'itunes:episode': '14'}]) == 1
+    assert "## Show Notes" in pending.read_text()
+    assert state.episodes_with('tgn', 'shownotes') == {14.0}
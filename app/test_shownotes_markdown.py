@@ -0,0 +1,53 @@
+"""Tests for incremental generation of the TGN shownotes document."""
+import json
+
+import pytest
+
+from related_links_collector.cache import clear_index_cache
+from related_links_collector.generate_markdown import generate_markdown
+
+ITEM = """<item><title>Episode {n}</title><pubDate>Thu, 0{n} Oct 2025 06:00:00 -0400</pubDate>
+<itunes:summary>Notes: https://thegreynato.substack.com/p/{n}-episode</itunes:summary></item>"""
+
+
+@pytest.fixture
+def feed(tmp_path):
+    clear_index_cache()
+
+    def write(*numbers):
+        items = "".join(ITEM.format(n=n) for n in numbers)
+        (tmp_path / "feed.rss").write_text(
+            '<rss xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>'
+            f'{items}</channel></rss>')
+        (tmp_path / "related.jsonl").write_text("".join(
+            json.dumps({"source_url": f"https://thegreynato.substack.com/p/{n}-episode", "status": "ok",
+                        "related": [{"text": f"Watch {n}", "href": f"https://example.com/{n}"}]}) + "\n"
+            for n in numbers))
+        return generate_markdown(str(tmp_path / "feed.rss"), str(tmp_path / "related.jsonl"),
+                                 str(tmp_path / "shownotes.md"))
+
+    yield write, tmp_path / "shownotes.md"
+    clear_index_cache()
+
+
+def test_unchanged_inputs_skip_the_rewrite(feed):
+    write, out = feed
+    assert write(2, 1) is True
+    mtime = out.stat().st_mtime_ns
+    assert write(2, 1) is False
+    assert out.stat().st_mtime_ns == mtime
+
+
+def _body(out):
+    return out.read_text().split("-->\n\n---\n\n", 1)[1]
+
+
+def test_new_episode_is_added_at_the_top(feed):
+    write, out = feed
+    write(2, 1)
+    old_body = _body(out)
+
+    assert write(3, 2, 1) is True
+    assert _body(out).startswith("## [Episode 3]")
+    assert _body(out).endswith(old_body)
+    assert "3 total links from 3 episodes" in out.read_text()
@@ -0,0 +1,98 @@
+"""Tests for skipping site builds when no source content changed."""
+import pytest
+
+import tasks.build as build
+from utils.manifest import build_manifest, diff_manifests
+
+HOME = """## Welcome!
+
+_last updated July 17, 2026 at 9:13AM PDT_
+
+## What is this site?
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, "SITE_ROOT", str(tmp_path))
+    docs = tmp_path / "tgn" / "docs"
+    (docs / "14").mkdir(parents=True)
+    (docs / "index.md").write_text(HOME)
+    (docs / "episodes.md").write_text("### Page updated Jul 17 2026 09:13 - 1 episodes\n- [Ep](14/episode.md)\n")
+    (docs / "14" / "episode.md").write_text("# Episode 14\n")
+    (tmp_path / "tgn" / "mkdocs.yml").write_text("site_name: TGN\n")
+    (tmp_path / "tgn" / "site").mkdir()
+    (tmp_path / "tgn" / "site" / "index.html").write_text("built")
+    return tmp_path / "tgn"
+
+
+def test_first_run_reports_everything_changed(site):
+    manifest = build.check_site_changes.fn("tgn")
+    assert set(manifest) == {"docs/index.md", "docs/episodes.md", "docs/14/episode.md", "mkdocs.yml"}
+
+
+def test_timestamp_only_changes_are_ignored(site):
+    build.save_content_manifest("tgn", build.check_site_changes.fn("tgn"))
+    (site / "docs" / "index.md").write_text(HOME.replace("July 17", "July 18"))
+    (site / "docs" / "episodes.md").write_text(
+        "### Page updated Jul 18 2026 10:00 - 1 episodes\n- [Ep](14/episode.md)\n")
+    (site / "site" / "index.html").write_text("rebuilt")
+    assert build.check_site_changes.fn("tgn") is None
+
+
+def test_shownotes_generation_date_is_ignored(site):
+    shownotes = site / "docs" / "shownotes.md"
+    shownotes.write_text("# 40 and 20 - Show Notes Collection\n\nGenerated on July 17, 2026\n\n## [Ep](x)\n")
+    build.save_content_manifest("tgn", build.check_site_changes.fn("tgn"))
+    shownotes.write_text(shownotes.read_text().replace("July 17", "July 18"))
+    assert build.check_site_changes.fn("tgn") is None
+    shownotes.write_text(shownotes.read_text() + "- [Omega](https://omegawatches.com)\n")
+    assert build.check_site_changes.fn("tgn") is not None
+
+
+def test_content_and_config_changes_are_detected(site):
+    build.save_content_manifest("tgn", build.check_site_changes.fn("tgn"))
+    (site / "docs" / "15").mkdir()
+    (site / "docs" / "15" / "episode.md").write_text("# Episode 15\n")
+    (site / "mkdocs.yml").write_text("site_name: The Compleat TGN\n")
+    (site / "docs" / "14" / "episode.md").unlink()
+
+    old = build.load_manifest(site / build.CONTENT_MANIFEST)
+    changed, removed = diff_manifests(old, build.check_site_changes.fn("tgn"))
+    assert changed == ["docs/15/episode.md", "mkdocs.yml"]
+    assert removed == ["docs/14/episode.md"]
+
+
+def test_large_files_are_fingerprinted_by_size_and_mtime(tmp_path, monkeypatch):
+    import utils.manifest as manifest
+    monkeypatch.setattr(manifest, "HASH_SIZE_LIMIT", 4)
+    (tmp_path / "episode.mp3").write_bytes(b"0123456789")
+    st = (tmp_path / "episode.mp3").stat()
+    assert build_manifest(tmp_path) == {"episode.mp3": f"10-{st.st_mtime_ns}"}
+
+
+def _built(site):
+    """Pretend the site was built from its current sources."""
+    (site / build.ZENSICAL_CACHE).mkdir()
+    build.save_manifest(site / build.BUILD_MANIFEST,
+                        build.build_manifest(site, exclude=build._NON_SOURCES))
+
+
+def test_incremental_build_after_page_edits(site):
+    assert build.needs_clean_build(site, {}) == "no previous build output"
+    _built(site)
+    (site / "docs" / "14" / "episode.md").write_text("# Episode 14, edited\n")
+    (site / "docs" / "index.md").write_text(HOME.replace("July 17", "July 18"))
+    sources = build.build_manifest(site, exclude=build._NON_SOURCES)
+    assert build.needs_clean_build(site, sources) is None
+
+
+@pytest.mark.parametrize("change, reason", [
+    (lambda site: (site / "mkdocs.yml").write_text("site_name: New\n"), "mkdocs.yml changed"),
+    (lambda site: (site / "docs" / "14" / "episode.md").unlink(), "1 source files removed"),
+])
+def test_clean_build_on_config_change_or_removal(site, change, reason):
+    _built(site)
+    change(site)
+    sources = build.build_manifest(site, exclude=build._NON_SOURCES)
+    assert build.needs_clean_build(site, sources) == reason
@@ -0,0 +1,183 @@
+"""Tests for the Caddy log traffic report."""
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+import traffic_analytics as ta
+
+SAFARI = ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+          "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1")
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+
+
+def record(day: int, uri: str, ip: str = "203.0.113.1", ua: str = SAFARI, hour: int = 12,
+           method: str = "GET", status: int = 200, size: int = 1000, referer: str = None,
+           country: str = "US") -> dict:
+    headers = {"Cf-Connecting-Ip": [ip], "User-Agent": [ua], "Cf-Ipcountry": [country]}
+    if referer:
+        headers["Referer"] = [referer]
+    return {"ts": datetime(2026, 3, day, hour, 30).timestamp(), "status": status, "size": size,
+            "request": {"remote_ip": "172.68.0.1", "method": method, "uri": uri, "headers": headers}}
+
+
+def write_log(path, records):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
+        f.write("not json\n\n")
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(ta, "LOG_DIR", tmp_path)
+    write_log(tmp_path / "tgn-2026-03-02T00-00-00.000.log.gz", [
+        record(1, "/363/episode/", referer="https://www.google.com/"),
+        record(1, "/stylesheets/extra.css"),
+        record(1, "/363.0/episode/", ip="198.51.100.7", hour=13),
+    ])
+    write_log(tmp_path / "tgn.log", [
+        record(2, "/", ua=GOOGLEBOT, ip="66.249.66.1"),
+        record(2, "/14.5/episode/", referer="https://tgn.phfactor.net/", status=304, size=0),
+    ])
+    return tmp_path
+
+
+def test_load_logs_streams_archives_then_current(logs):
+    records = ta.load_logs()
+    assert iter(records) is records  # a generator, not a list
+    uris = [r.uri for r in records]
+    assert uris == ["/363/episode/", "/stylesheets/extra.css", "/363.0/episode/", "/", "/14.5/episode/"]
+
+
+def test_decode_line_extracts_fields():
+    line = json.dumps(record(1, "/363/episode/", referer="https://www.google.com/")).encode()
+    rec = ta.decode_line(line)
+    assert rec == ta.decode_line(line, loads=json.loads)
+    assert (rec.uri, rec.method, rec.status, rec.size) == ("/363/episode/", "GET", 200, 1000)
+    assert (rec.client_ip, rec.country, rec.referer) == ("203.0.113.1", "US", "https://www.google.com/")
+    assert rec.user_agent == SAFARI
+
+    bare = ta.decode_line(b'{"ts": 1, "request": {"remote_ip": "172.68.0.1", "headers": {}}}')
+    assert (bare.client_ip, bare.user_agent, bare.country, bare.referer) == ("172.68.0.1", "", "??", "")
+    assert ta.decode_line(b"not json") is None
+    assert ta.decode_line(b"[1, 2]") is None
+
+
+def test_analyze_folds_records(logs):
+    stats = ta.analyze(ta.load_logs())
+    assert stats["total_requests"] == 5
+    assert stats["total_bytes"] == 4000
+    assert stats["bot_requests"] == 1 and stats["bot_names"] == {"Googlebot": 1}
+    assert stats["episode_views"] == {"363": 2, "14.5": 1}
+    assert stats["daily_page_views"] == {"2026-03-01": 2, "2026-03-02": 2}
+    assert len(stats["daily_uniques"]["2026-03-01"]) == 2
+    assert len(stats["all_ips"]) == 3 and len(stats["human_ips"]) == 2
+    assert stats["referrers"] == {"www.google.com": 1}
+    assert stats["devices"] == {"iPhone": 4} and stats["browsers"] == {"Safari": 4}
+    assert stats["status_codes"] == {200: 4, 304: 1}
+    assert stats["first_date"].day == 1 and stats["last_date"].day == 2
+    assert "363" in ta.generate_html(stats)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_partials_merge_to_single_pass(logs, workers):
+    write_log(logs / "tgn-2026-03-01T00-00-00.000.log.gz", [
+        record(1, "/363/episode/", ip="192.0.2.50"),
+        record(3, "/", ua=GOOGLEBOT, ip="66.249.66.1", hour=2),
+    ])
+    assert ta.analyze_logs(workers=workers) == ta.analyze(ta.load_logs())
+
+
+def test_rollups_skip_unchanged_files(logs, monkeypatch):
+    store = ta.RollupStore(logs / "rollups.db")
+    expected = ta.analyze(ta.load_logs())
+    assert ta.analyze_logs(workers=1, store=store) == expected
+
+    parsed = []
+    real = ta.analyze_file
+    monkeypatch.setattr(ta, "analyze_file", lambda f, *args: parsed.append(f.name) or real(f, *args))
+    assert ta.analyze_logs(workers=1, store=store) == expected
+    assert parsed == []
+
+    # The current log grows: only it is parsed again
+    with open(logs / "tgn.log", "a") as f:
+        f.write(json.dumps(record(3, "/14/episode/", ip="192.0.2.9")) + "\n")
+    stats = ta.analyze_logs(workers=1, store=store)
+    assert parsed == ["tgn.log"]
+    assert stats["total_requests"] == 6 and stats["episode_views"]["14"] == 1
+
+    # A rotated-out archive's rollups are dropped
+    (logs / "tgn-2026-03-02T00-00-00.000.log.gz").unlink()
+    assert ta.analyze_logs(workers=1, store=store)["total_requests"] == 3
+
+
+def test_stats_json_round_trip(logs):
+    stats = ta.analyze(ta.load_logs())
+    assert ta.stats_from_json(ta.stats_to_json(stats)) == stats
+
+
+def test_sketched_uniques_merge_across_files(logs):
+    # Enough distinct IPs per day to switch from exact sets to sketches
+    for n in range(3):
+        write_log(logs / f"tgn-2026-04-0{n + 1}T00-00-00.000.log.gz",
+                  [record(1, "/", ip=f"10.{n}.{i // 256}.{i % 256}") for i in range(1500)])
+    stats = ta.analyze_logs(workers=2)
+    assert stats == ta.analyze(ta.load_logs())
+    assert not stats["all_ips"].is_exact
+    assert abs(len(stats["all_ips"]) - 4503) < 4503 * 3 * stats["all_ips"].error_bound()
+    assert ta.uniques_note(stats["all_ips"]) == " ±0.8%"
+    assert ta.stats_from_json(ta.stats_to_json(stats)) == stats
+
+    exact = ta.analyze_logs(workers=1, exact_uniques=True)
+    assert exact["all_ips"].is_exact and len(exact["all_ips"]) == 4503
+
+
+def test_user_agent_classification_is_memoized():
+    ta.classify_user_agent.cache_clear()
+    assert ta.classify_user_agent(GOOGLEBOT) == ta.UserAgentInfo(True, "Googlebot", None, None)
+    assert ta.classify_user_agent(SAFARI) == ta.UserAgentInfo(False, None, "iPhone", "Safari")
+    assert ta.classify_user_agent("curl/8.4.0").bot_name == "curl/wget"
+    for _ in range(3):
+        ta.classify_user_agent(SAFARI)
+    cache = ta.ua_cache_stats()
+    assert (cache["hits"], cache["misses"], cache["size"]) == (3, 3, 3)
+    assert cache["hit_rate"] == 0.5
+
+
+def test_follower_survives_rotation_and_truncation(tmp_path):
+    log = tmp_path / "tgn.log"
+    log.write_bytes(b'{"a": 1}\n{"a": 2')
+    follower = ta.LogFollower(log, chunk_size=4)
+    assert list(follower.read_lines()) == [b'{"a": 1}']
+    assert list(follower.read_lines()) == []
+
+    # Rest of the line, one more, then Caddy renames the log and starts a new one
+    with open(log, "ab") as f:
+        f.write(b'}\n{"a": 3}\n')
+    log.rename(tmp_path / "tgn-2026-03-02T00-00-00.000.log")
+    assert list(follower.read_lines()) == [b'{"a": 2}', b'{"a": 3}']
+    log.write_bytes(b'{"a": 4}\n')
+    assert list(follower.read_lines()) == [b'{"a": 4}']
+
+    log.write_bytes(b'{"a":5}\n')  # truncated in place (copytruncate), now shorter
+    assert list(follower.read_lines()) == [b'{"a":5}']
+    follower.close()
+
+
+def test_follow_logs_updates_dashboard(logs, tmp_path):
+    stats = ta.analyze_logs([f for f in ta.log_files() if f.suffix == ".gz"], workers=1)
+    assert stats["total_requests"] == 3
+    follower = ta.LogFollower(logs / "tgn.log")
+    out, data = tmp_path / "dash.html", tmp_path / "dash.json"
+    ta.follow_logs(stats, out, data, interval=0, follower=follower, max_updates=1)
+    assert stats == ta.analyze(ta.load_logs())
+    assert "Traffic Analytics" in out.read_text()
+    assert ta.stats_from_json(data.read_text()) == stats
+
+    with open(logs / "tgn.log", "a") as f:
+        f.write(json.dumps(record(3, "/400/episode/")) + "\n")
+    ta.follow_logs(stats, out, data, interval=0, follower=follower, max_updates=1)
+    assert stats["episode_views"]["400"] == 1 and stats["total_requests"] == 6
@@ -0,0 +1,39 @@
+"""Tests for the exact/HyperLogLog unique counter."""
+import pytest
+
+from utils.uniques import UniqueCounter
+
+
+def fill(counter, items):
+    for item in items:
+        counter.add(item)
+    return counter
+
+
+def test_exact_below_limit():
+    c = fill(UniqueCounter(exact_limit=100), ["a", "b", "a"])
+    assert c.is_exact and len(c) == 2 and c.error_bound() == 0.0
+
+
+@pytest.mark.parametrize("n", [2_000, 50_000])
+def test_estimate_within_error_bound(n):
+    c = fill(UniqueCounter(), (f"192.0.{i // 256}.{i % 256}-{i}" for i in range(n)))
+    assert not c.is_exact
+    assert abs(len(c) - n) <= 4 * c.error_bound() * n
+
+
+def test_merge_equals_union_in_any_state():
+    items = [str(i) for i in range(5000)]
+    whole = fill(UniqueCounter(), items)
+    small = fill(UniqueCounter(), items[:10])          # exact
+    big = fill(UniqueCounter(), items[10:])            # sketch
+    assert UniqueCounter().update(small).update(big) == whole
+    assert fill(UniqueCounter(), items[10:]).update(small) == whole
+    assert small.update(big) == whole
+
+
+def test_round_trip_and_precision_mismatch():
+    c = fill(UniqueCounter(precision=10, exact_limit=10), map(str, range(100)))
+    assert UniqueCounter.from_dict(c.to_dict()) == c
+    with pytest.raises(ValueError):
+        UniqueCounter().update(c)
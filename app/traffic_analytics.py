@@ -11,17 +11,41 @@ a self-contained HTML page with charts and tables showing:
 - Bots/crawlers vs human traffic
 - Geographic distribution (via Cloudflare country headers)
 - User agent breakdown (browser, OS, device)
+
+Usage:
+    uv run python app/traffic_analytics.py                  # one-off report
+    uv run python app/traffic_analytics.py --follow --interval 30 --json tgn_analytics.json
 """
+import argparse
 import gzip
 import json
+import os
 import re
+import sqlite3
+import tempfile
+import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from html import escape
 from pathlib import Path
+from typing import NamedTuple
+
+from utils.uniques import UniqueCounter
+
+try:
+    import orjson  # installed with prefect; several times faster than json on log lines
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 LOG_DIR = Path("/var/log/caddy")
 LOG_PREFIX = "tgn"  # matches tgn.log and tgn-*.log.gz
+OUTPUT_PATH = Path(f"{LOG_PREFIX}_analytics.html")
+# Per-day rollups of already-analyzed log files (see RollupStore)
+ROLLUP_DB = Path(os.getenv("TRAFFIC_ROLLUP_DB", "traffic-rollups.db"))
 
 # Known bot patterns in User-Agent strings
 BOT_PATTERNS = [
@@ -71,53 +95,67 @@ def is_page_view(uri: str) -> bool:
     return True
 
 
+_EPISODE_URI_RE = re.compile(r'^/(\d+(?:\.\d+)?)/episode/?$')
+_EPISODE_AUDIO_URI_RE = re.compile(r'^/(\d+(?:\.\d+)?)/episode\.mp3$')
+_REFERRER_DOMAIN_RE = re.compile(r'https?://([^/]+)')
+
+
+def normalize_episode_number(num: str) -> str:
+    """Strip a .0 suffix (123.0 -> 123) but keep real fractionals (14.5)."""
+    if '.' in num:
+        try:
+            f = float(num)
+            if f == int(f):
+                return str(int(f))
+        except ValueError:
+            pass
+    return num
+
+
 def parse_episode_from_uri(uri: str):
     """Extract episode number from URI like /363/episode/ or /363.0/episode/."""
-    m = re.match(r'^/(\d+(?:\.\d+)?)/episode/?$', uri)
-    if m:
-        num = m.group(1)
-        # Normalize: strip .0 suffix (123.0 -> 123) but keep real fractionals (14.5)
-        if '.' in num:
-            try:
-                f = float(num)
-                if f == int(f):
-                    return str(int(f))
-            except ValueError:
-                pass
-        return num
-    return None
+    m = _EPISODE_URI_RE.match(uri)
+    return normalize_episode_number(m.group(1)) if m else None
+
+
+def parse_episode_audio_uri(uri: str):
+    """Extract episode number from an MP3 URI like /363/episode.mp3."""
+    m = _EPISODE_AUDIO_URI_RE.match(uri.split('?')[0])
+    return normalize_episode_number(m.group(1)) if m else None
+
+
+# Bot names, checked in order against the lowercased User-Agent
+_BOT_CLASSIFIERS = [(name, re.compile(pattern)) for name, pattern in [
+    ('Googlebot', r'googlebot'),
+    ('Bingbot', r'bingbot'),
+    ('Applebot', r'applebot'),
+    ('GPTBot', r'gptbot'),
+    ('ClaudeBot', r'claudebot|claude-web|anthropic'),
+    ('Amazonbot', r'amazonbot'),
+    ('AhrefsBot', r'ahrefsbot'),
+    ('SemrushBot', r'semrushbot'),
+    ('Bytespider', r'bytespider'),
+    ('PetalBot', r'petalbot'),
+    ('YandexBot', r'yandexbot'),
+    ('DuckDuckBot', r'duckduckbot'),
+    ('Facebookbot', r'facebot|facebookexternalhit'),
+    ('Slackbot', r'slackbot'),
+    ('Twitterbot', r'twitterbot'),
+    ('CCBot', r'ccbot'),
+    ('DataForSeoBot', r'dataforseobot'),
+    ('DotBot', r'dotbot'),
+    ('MJ12bot', r'mj12bot'),
+    ('UptimeRobot', r'uptimerobot'),
+    ('Python/requests', r'python-requests|httpx|urllib'),
+    ('curl/wget', r'curl/|wget/'),
+]]
 
 
 def classify_bot(user_agent: str) -> str:
     """Classify a bot by name."""
     ua_lower = user_agent.lower()
-
-    classifiers = [
-        ('Googlebot', r'googlebot'),
-        ('Bingbot', r'bingbot'),
-        ('Applebot', r'applebot'),
-        ('GPTBot', r'gptbot'),
-        ('ClaudeBot', r'claudebot|claude-web|anthropic'),
-        ('Amazonbot', r'amazonbot'),
-        ('AhrefsBot', r'ahrefsbot'),
-        ('SemrushBot', r'semrushbot'),
-        ('Bytespider', r'bytespider'),
-        ('PetalBot', r'petalbot'),
-        ('YandexBot', r'yandexbot'),
-        ('DuckDuckBot', r'duckduckbot'),
-        ('Facebookbot', r'facebot|facebookexternalhit'),
-        ('Slackbot', r'slackbot'),
-        ('Twitterbot', r'twitterbot'),
-        ('CCBot', r'ccbot'),
-        ('DataForSeoBot', r'dataforseobot'),
-        ('DotBot', r'dotbot'),
-        ('MJ12bot', r'mj12bot'),
-        ('UptimeRobot', r'uptimerobot'),
-        ('Python/requests', r'python-requests|httpx|urllib'),
-        ('curl/wget', r'curl/|wget/'),
-    ]
-    for name, pattern in classifiers:
-        if re.search(pattern, ua_lower):
+    for name, pattern in _BOT_CLASSIFIERS:
+        if pattern.search(ua_lower):
             return name
     return 'Other Bot'
 
@@ -163,36 +201,134 @@ def parse_os_device(user_agent: str) -> tuple[str, str]:
     return device, browser
 
 
-def load_logs():
-    """Load all TGN log files (current + rotated archives)."""
-    records = []
+# Distinct User-Agent strings remembered by classify_user_agent
+UA_CACHE_SIZE = 8192
+
 
-    log_files = sorted(LOG_DIR.glob(f"{LOG_PREFIX}-*.log.gz"))
+class UserAgentInfo(NamedTuple):
+    """Everything the report needs from a User-Agent; device/browser only for humans."""
+    is_bot: bool
+    bot_name: str | None
+    device: str | None
+    browser: str | None
+
+
+@lru_cache(maxsize=UA_CACHE_SIZE)
+def classify_user_agent(user_agent: str) -> UserAgentInfo:
+    """
+    Classify a User-Agent in one lookup.
+
+    A handful of clients make most requests with the same few User-Agent
+    strings, so results are memoized in a bounded LRU cache; see
+    ua_cache_stats for its hit rate.
+    """
+    if is_bot(user_agent):
+        return UserAgentInfo(True, classify_bot(user_agent), None, None)
+    return UserAgentInfo(False, None, *parse_os_device(user_agent))
+
+
+def ua_cache_stats() -> dict:
+    """Return hits, misses, current size and hit rate of the User-Agent cache (this process)."""
+    info = classify_user_agent.cache_info()
+    lookups = info.hits + info.misses
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0}
+
+
+def log_files() -> list[Path]:
+    """Return the TGN log files: rotated archives oldest first, then the current log."""
+    files = sorted(LOG_DIR.glob(f"{LOG_PREFIX}-*.log.gz"))
     current = LOG_DIR / f"{LOG_PREFIX}.log"
     if current.exists():
-        log_files.append(current)
+        files.append(current)
+    return files
+
+
+class LogRecord(NamedTuple):
+    """The fields of a Caddy access-log entry that the report uses."""
+    ts: float
+    uri: str
+    method: str
+    status: int
+    size: int
+    client_ip: str
+    user_agent: str
+    country: str
+    referer: str
+    range: str
+
+
+def _header(headers: dict, name: str, default: str) -> str:
+    values = headers.get(name)
+    return values[0] if values else default
+
+
+def decode_line(line: bytes | str, loads=None) -> LogRecord | None:
+    """
+    Decode one JSON log line into a LogRecord, or None if it isn't a valid entry.
+
+    Only the needed fields are pulled out of the nested request/headers
+    dicts, once, and the parsed dict is dropped immediately. Lines are parsed
+    with orjson when it is available (loads overrides the parser).
+    """
+    try:
+        rec = (loads or _json_loads)(line)
+    except ValueError:
+        return None
+    if not isinstance(rec, dict):
+        return None
+    req = rec.get('request') or {}
+    headers = req.get('headers') or {}
+    return LogRecord(
+        ts=rec.get('ts', 0),
+        uri=req.get('uri', ''),
+        method=req.get('method', ''),
+        status=rec.get('status', 0),
+        size=rec.get('size', 0),
+        # Real client IP from Cloudflare, fallback to remote_ip
+        client_ip=_header(headers, 'Cf-Connecting-Ip', None) or req.get('remote_ip', 'unknown'),
+        user_agent=_header(headers, 'User-Agent', ''),
+        country=_header(headers, 'Cf-Ipcountry', '??'),
+        referer=_header(headers, 'Referer', ''),
+        range=_header(headers, 'Range', ''),
+    )
+
+
+def read_records(log_file: Path):
+    """Yield the LogRecords of one log file (gzipped or plain), skipping bad lines."""
+    opener = gzip.open if log_file.suffix == '.gz' else open
+    try:
+        with opener(log_file, 'rb') as f:
+            for line in f:
+                if line.isspace():
+                    continue
+                rec = decode_line(line)
+                if rec is not None:
+                    yield rec
+    except (PermissionError, OSError) as e:
+        print(f"Skipping {log_file}: {e}")
 
-    for log_file in log_files:
-        opener = gzip.open if log_file.suffix == '.gz' else open
-        try:
-            with opener(log_file, 'rt', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        records.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-        except (PermissionError, OSError) as e:
-            print(f"Skipping {log_file}: {e}")
-
-    return records
-
-
-def analyze(records):
-    """Analyze log records and return stats dict."""
-    stats = {
+
+def load_logs():
+    """
+    Yield records from all TGN log files (current + rotated archives).
+
+    Records are produced one at a time, so a consumer that folds them
+    (see analyze) never holds more than one in memory.
+    """
+    for log_file in log_files():
+        yield from read_records(log_file)
+
+
+def new_stats(exact_uniques: bool = False) -> dict:
+    """
+    Return an empty stats dict for add_record to fold records into.
+
+    Unique IPs are counted with UniqueCounter: exact for small counts, then
+    a HyperLogLog sketch (about 0.8% error) unless exact_uniques is set.
+    """
+    uniques = partial(UniqueCounter, exact_limit=None) if exact_uniques else UniqueCounter
+    return {
         'total_requests': 0,
         'total_bytes': 0,
         'first_date': None,
@@ -200,21 +336,21 @@ def analyze(records):
 
         # Daily counts
         'daily_requests': Counter(),
-        'daily_uniques': defaultdict(set),
+        'daily_uniques': defaultdict(uniques),
         'daily_page_views': Counter(),
         'daily_bot_requests': Counter(),
 
         # Weekly counts
         'weekly_requests': Counter(),
-        'weekly_uniques': defaultdict(set),
+        'weekly_uniques': defaultdict(uniques),
 
         # Pages
         'page_views': Counter(),
         'episode_views': Counter(),
 
         # Visitors
-        'all_ips': set(),
-        'human_ips': set(),
+        'all_ips': uniques(),
+        'human_ips': uniques(),
 
         # Referrers
         'referrers': Counter(),
@@ -237,81 +373,418 @@ def analyze(records):
         'hourly': Counter(),
     }
 
-    for rec in records:
-        ts = rec.get('ts', 0)
-        dt = datetime.fromtimestamp(ts)
-        date_str = dt.strftime('%Y-%m-%d')
-        week_str = dt.strftime('%Y-W%W')
-        hour = dt.hour
-
-        req = rec.get('request', {})
-        uri = req.get('uri', '')
-        method = req.get('method', '')
-        headers = req.get('headers', {})
-        status = rec.get('status', 0)
-        size = rec.get('size', 0)
 
-        # Real client IP from Cloudflare, fallback to remote_ip
-        cf_ip_list = headers.get('Cf-Connecting-Ip', [])
-        client_ip = cf_ip_list[0] if cf_ip_list else req.get('remote_ip', 'unknown')
+def analyze(records, exact_uniques: bool = False):
+    """
+    Analyze log records and return stats dict.
 
-        ua_list = headers.get('User-Agent', [''])
-        user_agent = ua_list[0] if ua_list else ''
+    A streaming fold: records may be any iterable, typically the load_logs()
+    generator, and each one is dropped as soon as it has been counted, so
+    memory doesn't grow with log retention.
+    """
+    stats = new_stats(exact_uniques)
+    for rec in records:
+        add_record(stats, rec)
+    return stats
 
-        country_list = headers.get('Cf-Ipcountry', ['??'])
-        country = country_list[0] if country_list else '??'
 
-        referer_list = headers.get('Referer', [])
-        referer = referer_list[0] if referer_list else ''
+def rollup(records, exact_uniques: bool = False) -> dict[str, dict]:
+    """Fold records into one stats dict per day: {'YYYY-MM-DD': stats}."""
+    days = {}
+    for rec in records:
+        day = datetime.fromtimestamp(rec.ts).strftime('%Y-%m-%d')
+        if day not in days:
+            days[day] = new_stats(exact_uniques)
+        add_record(days[day], rec)
+    return days
+
+
+def analyze_file(log_file: Path, exact_uniques: bool = False) -> dict[str, dict]:
+    """Analyze one log file into daily rollups (run in a worker process by analyze_logs)."""
+    return rollup(read_records(log_file), exact_uniques)
+
+
+def merge_stats(into: dict, other: dict) -> dict:
+    """
+    Merge partial stats into another stats dict, in place.
+
+    Counters add, unique-IP counters merge (per day/week too), totals add
+    and the date range widens, so partials from different files combine
+    into what one pass over all their records would give.
+
+    Returns:
+        into, for use with functools.reduce
+    """
+    for key, value in other.items():
+        current = into[key]
+        if isinstance(value, Counter):
+            current.update(value)
+        elif isinstance(value, defaultdict):
+            for k, uniques in value.items():
+                current[k] |= uniques
+        elif isinstance(value, UniqueCounter):
+            current |= value
+        elif key == 'first_date':
+            if value is not None and (current is None or value < current):
+                into[key] = value
+        elif key == 'last_date':
+            if value is not None and (current is None or value > current):
+                into[key] = value
+        else:
+            into[key] = current + value
+    return into
+
+
+def analyze_logs(files: list[Path] = None, workers: int = None,
+                 store: 'RollupStore' = None, exact_uniques: bool = False) -> dict:
+    """
+    Analyze log files in parallel, one file per task in a process pool.
+
+    Each worker gunzips and folds a single file into daily rollups; the
+    parent merges them as they finish. Files are submitted largest first so
+    one big archive doesn't leave the other cores idle at the end.
+
+    With a rollup store, files whose name, size and mtime match a stored
+    rollup aren't read at all, so a daily run only parses the current log
+    and any newly rotated archive. New rollups are saved as they arrive and
+    those of files no longer on disk are dropped.
+
+    Args:
+        files: Log files to analyze (default: log_files())
+        workers: Worker processes (default: CPU count; 1 analyzes in-process)
+        store: Optional RollupStore to load from and save to
+        exact_uniques: Count unique IPs exactly rather than with a sketch
+            (rollups already stored keep the mode they were built with)
+
+    Returns:
+        Stats dict, as from analyze(load_logs())
+    """
+    files = log_files() if files is None else files
+    stats = new_stats(exact_uniques)
+    pending = []
+    for log_file in files:
+        days = store.load(log_file) if store else None
+        if days is None:
+            pending.append((log_file, log_file.stat()))
+            continue
+        for day_stats in days.values():
+            merge_stats(stats, day_stats)
+    if store:
+        store.prune(files)
+        print(f"Loaded {len(files) - len(pending)} files from rollups, parsing {len(pending)}", flush=True)
+
+    def _collect(log_file, st, days):
+        if store:
+            store.save(log_file, st, days)
+        for day_stats in days.values():
+            merge_stats(stats, day_stats)
+
+    if workers == 1 or len(pending) <= 1:
+        for log_file, st in pending:
+            _collect(log_file, st, analyze_file(log_file, exact_uniques))
+        return stats
+
+    pending.sort(key=lambda item: item[1].st_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(analyze_file, log_file, exact_uniques): (log_file, st)
+                   for log_file, st in pending}
+        for future in as_completed(futures):
+            _collect(*futures[future], future.result())
+    return stats
 
-        if stats['first_date'] is None or dt < stats['first_date']:
-            stats['first_date'] = dt
-        if stats['last_date'] is None or dt > stats['last_date']:
-            stats['last_date'] = dt
 
-        stats['total_requests'] += 1
-        stats['total_bytes'] += size
-        stats['status_codes'][status] += 1
-        stats['all_ips'].add(client_ip)
-        stats['hourly'][hour] += 1
+# Stats keys whose Counter keys are ints (JSON turns them into strings)
+_INT_KEYED = ('status_codes', 'hourly')
 
-        bot = is_bot(user_agent)
 
-        if bot:
-            stats['bot_requests'] += 1
-            stats['bot_names'][classify_bot(user_agent)] += 1
-            stats['daily_bot_requests'][date_str] += 1
+def stats_to_json(stats: dict) -> str:
+    """Serialize a stats dict for the rollup store."""
+    data = {}
+    for key, value in stats.items():
+        if isinstance(value, defaultdict):
+            data[key] = {k: uniques.to_dict() for k, uniques in value.items()}
+        elif isinstance(value, UniqueCounter):
+            data[key] = value.to_dict()
+        elif isinstance(value, datetime):
+            data[key] = value.timestamp()
         else:
-            stats['human_ips'].add(client_ip)
-            stats['countries'][country] += 1
-            device, browser = parse_os_device(user_agent)
-            stats['devices'][device] += 1
-            stats['browsers'][browser] += 1
-
-        stats['daily_requests'][date_str] += 1
-        stats['daily_uniques'][date_str].add(client_ip)
-        stats['weekly_requests'][week_str] += 1
-        stats['weekly_uniques'][week_str].add(client_ip)
-
-        if method == 'GET' and is_page_view(uri):
-            stats['daily_page_views'][date_str] += 1
-            stats['page_views'][uri] += 1
-
-            ep = parse_episode_from_uri(uri)
-            if ep:
-                stats['episode_views'][ep] += 1
-
-        # Referrer analysis (skip self-referrals and empty)
-        if referer and 'tgn.phfactor.net' not in referer:
-            # Simplify to domain
-            m = re.match(r'https?://([^/]+)', referer)
-            if m:
-                domain = m.group(1).lower()
-                stats['referrers'][domain] += 1
-
+            data[key] = value
+    return json.dumps(data, separators=(',', ':'))
+
+
+def stats_from_json(text: str) -> dict:
+    """Rebuild a stats dict serialized by stats_to_json."""
+    stats = new_stats()
+    for key, value in json.loads(text).items():
+        current = stats[key]
+        if isinstance(current, Counter):
+            current.update({int(k) if key in _INT_KEYED else k: n for k, n in value.items()})
+        elif isinstance(current, defaultdict):
+            for k, uniques in value.items():
+                current[k] = UniqueCounter.from_dict(uniques)
+        elif isinstance(current, UniqueCounter):
+            stats[key] = UniqueCounter.from_dict(value)
+        elif key in ('first_date', 'last_date'):
+            stats[key] = datetime.fromtimestamp(value) if value is not None else None
+        else:
+            stats[key] = value
     return stats
 
 
+_ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source (
+    name         TEXT PRIMARY KEY,
+    size         INTEGER NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    analyzed_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup (
+    name   TEXT NOT NULL,
+    day    TEXT NOT NULL,
+    stats  TEXT NOT NULL,
+    PRIMARY KEY (name, day)
+);
+"""
+
+
+class RollupStore:
+    """
+    Daily stats rollups of analyzed log files, backed by SQLite.
+
+    Rollups are keyed by log file name and are only valid for the size and
+    mtime the file had when it was analyzed. Rotated archives never change,
+    so they are parsed once; the current log is re-parsed whenever it grows.
+    """
+
+    def __init__(self, db_path: str | Path = ROLLUP_DB):
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            conn.executescript(_ROLLUP_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, log_file: Path) -> dict[str, dict] | None:
+        """Return the stored daily rollups of a file, or None if missing or stale."""
+        st = log_file.stat()
+        with self._connect() as conn:
+            row = conn.execute("SELECT size, mtime_ns FROM source WHERE name = ?",
+                               (log_file.name,)).fetchone()
+            if row is None or row != (st.st_size, st.st_mtime_ns):
+                return None
+            rows = conn.execute("SELECT day, stats FROM rollup WHERE name = ?",
+                                (log_file.name,)).fetchall()
+        return {day: stats_from_json(text) for day, text in rows}
+
+    def save(self, log_file: Path, st: os.stat_result, days: dict[str, dict]) -> None:
+        """Replace a file's rollups; st is the file's stat from before it was read."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rollup WHERE name = ?", (log_file.name,))
+            conn.executemany("INSERT INTO rollup (name, day, stats) VALUES (?, ?, ?)",
+                             [(log_file.name, day, stats_to_json(s)) for day, s in days.items()])
+            conn.execute("INSERT OR REPLACE INTO source (name, size, mtime_ns, analyzed_at) "
+                         "VALUES (?, ?, ?, ?)",
+                         (log_file.name, st.st_size, st.st_mtime_ns, datetime.now().timestamp()))
+
+    def clear(self) -> None:
+        """Forget every rollup, so all log files are parsed again."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rollup")
+            conn.execute("DELETE FROM source")
+
+    def prune(self, files: list[Path]) -> int:
+        """Drop rollups of files no longer present (rotated out). Returns the count."""
+        keep = {f.name for f in files}
+        with self._connect() as conn:
+            gone = [name for (name,) in conn.execute("SELECT name FROM source") if name not in keep]
+            for name in gone:
+                conn.execute("DELETE FROM rollup WHERE name = ?", (name,))
+                conn.execute("DELETE FROM source WHERE name = ?", (name,))
+        return len(gone)
+
+
+def add_record(stats: dict, rec: LogRecord) -> None:
+    """Fold one log record into stats."""
+    dt = datetime.fromtimestamp(rec.ts)
+    date_str = dt.strftime('%Y-%m-%d')
+    week_str = dt.strftime('%Y-W%W')
+    hour = dt.hour
+
+    uri = rec.uri
+    client_ip = rec.client_ip
+    referer = rec.referer
+
+    if stats['first_date'] is None or dt < stats['first_date']:
+        stats['first_date'] = dt
+    if stats['last_date'] is None or dt > stats['last_date']:
+        stats['last_date'] = dt
+
+    stats['total_requests'] += 1
+    stats['total_bytes'] += rec.size
+    stats['status_codes'][rec.status] += 1
+    stats['all_ips'].add(client_ip)
+    stats['hourly'][hour] += 1
+
+    ua = classify_user_agent(rec.user_agent)
+
+    if ua.is_bot:
+        stats['bot_requests'] += 1
+        stats['bot_names'][ua.bot_name] += 1
+        stats['daily_bot_requests'][date_str] += 1
+    else:
+        stats['human_ips'].add(client_ip)
+        stats['countries'][rec.country] += 1
+        stats['devices'][ua.device] += 1
+        stats['browsers'][ua.browser] += 1
+
+    stats['daily_requests'][date_str] += 1
+    stats['daily_uniques'][date_str].add(client_ip)
+    stats['weekly_requests'][week_str] += 1
+    stats['weekly_uniques'][week_str].add(client_ip)
+
+    if rec.method == 'GET' and is_page_view(uri):
+        stats['daily_page_views'][date_str] += 1
+        stats['page_views'][uri] += 1
+
+        ep = parse_episode_from_uri(uri)
+        if ep:
+            stats['episode_views'][ep] += 1
+
+    # Referrer analysis (skip self-referrals and empty)
+    if referer and 'tgn.phfactor.net' not in referer:
+        # Simplify to domain
+        m = _REFERRER_DOMAIN_RE.match(referer)
+        if m:
+            domain = m.group(1).lower()
+            stats['referrers'][domain] += 1
+
+
+class LogFollower:
+    """
+    Follow a log file as it grows, like tail -F.
+
+    Caddy rotates by renaming the current log and starting a new one. When
+    the path's inode changes, the old file is drained to its end through the
+    still-open handle before switching, so no lines written just before a
+    rotation are lost. A file truncated in place is re-read from the start.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 1024 * 1024):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._file = None
+        self._inode = None
+        self._partial = b''
+
+    def _open(self) -> bool:
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._partial = b''
+        return True
+
+    def _drain(self):
+        while chunk := self._file.read(self.chunk_size):
+            lines = (self._partial + chunk).split(b'\n')
+            self._partial = lines.pop()
+            yield from (line for line in lines if line.strip())
+
+    def read_lines(self):
+        """Yield the complete lines appended since the last call."""
+        if self._file is None and not self._open():
+            return
+        while True:
+            yield from self._drain()
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return  # rotated, new file not created yet
+            if st.st_ino != self._inode:
+                if self._partial.strip():
+                    yield self._partial  # last line of the old file had no newline
+                self._file.close()
+                if not self._open():
+                    return
+            elif st.st_size < self._file.tell():
+                self._file.seek(0)
+                self._partial = b''
+            else:
+                return
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace a file's contents atomically, so a browser or web server never sees half of it."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix='.tmp-', suffix=path.name, dir=path.resolve().parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def follow_logs(stats: dict, output: Path = OUTPUT_PATH, json_output: Path = None,
+                interval: float = 30, follower: LogFollower = None, max_updates: int = None) -> dict:
+    """
+    Tail the current log into stats and rewrite the dashboard as traffic arrives.
+
+    Every `interval` seconds the lines Caddy appended are folded into the
+    in-memory stats (add_record), and if there were any, the HTML dashboard
+    and optionally a JSON data file (stats_to_json) are rewritten.
+
+    Args:
+        stats: Stats to update, usually the rotated archives from analyze_logs
+        output: Dashboard HTML path
+        json_output: Optional path for the stats as JSON
+        interval: Seconds between updates
+        follower: LogFollower to read from (default: the current log, from its start)
+        max_updates: Stop after this many updates (default: run until interrupted)
+
+    Returns:
+        The updated stats
+    """
+    follower = follower or LogFollower(LOG_DIR / f"{LOG_PREFIX}.log")
+    updates = 0
+    while True:
+        added = 0
+        for line in follower.read_lines():
+            rec = decode_line(line)
+            if rec is not None:
+                add_record(stats, rec)
+                added += 1
+        if added and stats['total_requests']:
+            write_atomic(output, generate_html(stats))
+            if json_output:
+                write_atomic(json_output, stats_to_json(stats))
+            print(f"{datetime.now():%H:%M:%S} +{added:,} requests, "
+                  f"{stats['total_requests']:,} total", flush=True)
+        updates += 1
+        if max_updates is not None and updates >= max_updates:
+            return stats
+        time.sleep(interval)
+
+
+def uniques_note(counter: UniqueCounter) -> str:
+    """Return ' ±x%' (one standard error) for an estimated unique count, '' for an exact one."""
+    return '' if counter.is_exact else f" ±{counter.error_bound():.1%}"
+
+
 def generate_html(stats):
     """Generate self-contained HTML analytics dashboard."""
     days = (stats['last_date'] - stats['first_date']).days + 1
@@ -388,8 +861,8 @@ def generate_html(stats):
 <div class="stats-grid">
   <div class="stat-card"><div class="value">{stats['total_requests']:,}</div><div class="label">Total Requests</div></div>
   <div class="stat-card"><div class="value">{stats['total_requests'] - stats['bot_requests']:,}</div><div class="label">Human Requests</div></div>
-  <div class="stat-card"><div class="value">{len(stats['all_ips']):,}</div><div class="label">Unique IPs (all)</div></div>
-  <div class="stat-card"><div class="value">{len(stats['human_ips']):,}</div><div class="label">Unique IPs (human)</div></div>
+  <div class="stat-card"><div class="value">{len(stats['all_ips']):,}</div><div class="label">Unique IPs (all{uniques_note(stats['all_ips'])})</div></div>
+  <div class="stat-card"><div class="value">{len(stats['human_ips']):,}</div><div class="label">Unique IPs (human{uniques_note(stats['human_ips'])})</div></div>
   <div class="stat-card"><div class="value">{stats['total_bytes'] / 1024 / 1024 / 1024:.1f} GB</div><div class="label">Data Served</div></div>
   <div class="stat-card"><div class="value">{stats['bot_requests']:,}</div><div class="label">Bot Requests ({human_pct:.0f}% human)</div></div>
   <div class="stat-card"><div class="value">{sum(stats['daily_page_views'].values()):,}</div><div class="label">Page Views</div></div>
@@ -561,22 +1034,56 @@ new Chart(document.getElementById('botChart'), {{
 
 
 def main():
-    print("Loading logs...", flush=True)
-    records = load_logs()
-    print(f"Loaded {len(records):,} records", flush=True)
-
-    print("Analyzing...", flush=True)
-    stats = analyze(records)
+    parser = argparse.ArgumentParser(description="Generate the TGN traffic analytics dashboard")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for parsing log files (default: CPU count)")
+    parser.add_argument("--rollups", type=Path, default=ROLLUP_DB,
+                        help=f"Rollup database of already-analyzed logs (default: {ROLLUP_DB})")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Discard stored rollups and re-parse every log file")
+    parser.add_argument("--exact-uniques", action="store_true",
+                        help="Count unique IPs exactly instead of with HyperLogLog sketches "
+                             "(use with --rebuild to redo stored rollups)")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep running: tail the current log and rewrite the dashboard as it grows")
+    parser.add_argument("--interval", type=float, default=30,
+                        help="Seconds between dashboard updates with --follow (default: 30)")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="With --follow, also write the stats as JSON to this file")
+    args = parser.parse_args()
+
+    store = RollupStore(args.rollups)
+    if args.rebuild:
+        store.clear()
+    print("Analyzing logs...", flush=True)
+    if args.follow:
+        # Rotated archives from the rollups; the current log is read by the follower
+        archives = [f for f in log_files() if f.suffix == '.gz']
+        stats = analyze_logs(archives, workers=args.workers, store=store, exact_uniques=args.exact_uniques)
+        print(f"Following {LOG_DIR / f'{LOG_PREFIX}.log'}, updating {args.output} "
+              f"every {args.interval:g}s", flush=True)
+        try:
+            follow_logs(stats, args.output, args.json, args.interval)
+        except KeyboardInterrupt:
+            pass
+        return
+    stats = analyze_logs(workers=args.workers, store=store, exact_uniques=args.exact_uniques)
+    print(f"Analyzed {stats['total_requests']:,} records", flush=True)
 
     print("Generating HTML...", flush=True)
     html = generate_html(stats)
 
-    output = Path("tgn_analytics.html")
-    output.write_text(html)
+    output = args.output
+    write_atomic(output, html)
     print(f"Report written to {output.resolve()}", flush=True)
     print(f"  Date range: {stats['first_date'].strftime('%Y-%m-%d')} to {stats['last_date'].strftime('%Y-%m-%d')}")
     print(f"  Total requests: {stats['total_requests']:,}")
-    print(f"  Unique IPs: {len(stats['all_ips']):,} (human: {len(stats['human_ips']):,})")
+    print(f"  Unique IPs: {len(stats['all_ips']):,}{uniques_note(stats['all_ips'])} "
+          f"(human: {len(stats['human_ips']):,}{uniques_note(stats['human_ips'])})")
+    cache = ua_cache_stats()
+    if cache['hits'] + cache['misses']:
+        print(f"  User-Agent cache: {cache['hit_rate']:.1%} hits ({cache['size']:,} cached, in-process only)")
     print(f"  Bot requests: {stats['bot_requests']:,} ({stats['bot_requests']/stats['total_requests']*100:.0f}%)")
 
 
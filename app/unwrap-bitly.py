@@ -7,27 +7,34 @@ import time
 
 import requests
 
+from related_links_collector.resolvers import expand_shortlink
+from related_links_collector.shortlinks import default_store
+
 
 if __name__ == '__main__':
     # read the bit.ly links
     raw_links = open('bitly', 'r').readlines()
-    links = [link.strip() for link in raw_links]
+    links = [link.strip() for link in raw_links if link.strip()]
 
-    rc = json.load(open('bitly.json', 'r'))
+    # The shortlink store already holds bitly.json and every link resolved elsewhere
+    store = default_store()
+    session = requests.Session()
 
     for link in links:
-        if link in rc:
-            log.debug(f"Skipping {link}, already in lookup table")
+        if store.get(link) is not None:
+            log.debug(f"Skipping {link}, already in shortlink store")
             continue
         log.debug(f'Fetching {link}...')
-        # get the expanded url
-        expanded = requests.get(link).url
-        rc[link] = expanded
+        # get the expanded url (recorded in the store, including failures)
+        expanded = expand_shortlink(link, session, store=store)
         log.info(f'{link} -> {expanded}')
-        # save the lookup table
-        log.info(f'Writing lookup table to bitly.json')
-        json.dump(rc, open('bitly.json', 'w'), indent=2)
         log.debug('Sleeping 15 seconds...')
         time.sleep(15)
 
-    log.info(f'Done! {len(rc)} links in lookup table')
\ No newline at end of file
+    # save the lookup table
+    rc = json.load(open('bitly.json', 'r'))
+    rc.update(store.resolved(host='bit.ly'))
+    log.info(f'Writing lookup table to bitly.json')
+    json.dump(rc, open('bitly.json', 'w'), indent=2)
+
+    log.info(f'Done! {len(rc)} links in lookup table')
@@ -1,5 +1,7 @@
 """Email utilities for podcast notifications."""
 import smtplib
+import threading
+from contextlib import contextmanager
 from email.message import EmailMessage
 from os import getenv
 from pathlib import Path
@@ -8,76 +10,177 @@ from loguru import logger as log
 from constants import system_admin, SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, format_episode_number
 
 
-class FastMailSMTP(smtplib.SMTP_SSL):
+class Mailer:
     """
-    A wrapper for handling SMTP connections to FastMail.
+    SMTP sender that keeps one logged-in session open for all its messages.
 
-    From https://alexwlchan.net/2016/python-smtplib-and-fastmail/
-    with attachments code removed and edits for this use case.
-    """
+    The connection is opened and authenticated on the first send and reused
+    until close(); a session the server dropped while idle is reopened once.
+    Failure alerts passed to alert() are held and sent as a single digest by
+    flush_alerts() (called by close()), so a run that fails in several places
+    produces one email.
 
-    def __init__(self):
-        self.no_email = True
+    Sending is disabled (logged, not raised) when a .no_email file exists in
+    the working directory or no password is configured (FASTMAIL_PASSWORD).
 
-        super().__init__(SMTP_SERVER, port=SMTP_PORT)
-        smtp_password = getenv('FASTMAIL_PASSWORD', None)
+    Args:
+        host, port, username: SMTP server and account (default: constants)
+        password: SMTP password (default: FASTMAIL_PASSWORD)
+        use_ssl: Implicit TLS (SMTP_SSL); False for a plain local server in tests
+        timeout: Socket timeout in seconds, so a stalled server can't hang a run
+    """
 
+    def __init__(self, host: str = SMTP_SERVER, port: int = SMTP_PORT,
+                 username: str = SMTP_USERNAME, password: str = None,
+                 use_ssl: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password if password is not None else getenv('FASTMAIL_PASSWORD', None)
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._smtp = None
+        self._alerts = []
+        self._lock = threading.RLock()
+
+    def _enabled(self) -> bool:
         if Path(".no_email").exists():
             log.warning('Honoring .no_email file - emails disabled')
-            return
-
-        if not smtp_password:
+            return False
+        if not self.password:
             log.error('FASTMAIL_PASSWORD not found in environment, cannot email')
-            return
-
-        self.login(SMTP_USERNAME, smtp_password)
-        self.no_email = False
-        log.debug('FastMail SMTP connection established')
-
-    def send_fm_message(self, *,
-                        from_addr: str,
-                        to_addrs: list[str],
-                        msg: str,
-                        subject: str):
+            return False
+        return True
+
+    def _connect(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(self.host, port=self.port, timeout=self.timeout)
+        try:
+            smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        log.debug(f'SMTP session to {self.host} established')
+        return smtp
+
+    def send(self, *, to_addrs: list[str], subject: str, msg: str,
+             from_addr: str = system_admin) -> bool:
         """
-        Send an email message via FastMail.
+        Send a plain-text email over the shared session.
+
+        Returns:
+            True if sent, False if email is disabled
 
-        Args:
-            from_addr: Sender email address
-            to_addrs: List of recipient email addresses
-            msg: Message body (plain text)
-            subject: Email subject line
+        Raises:
+            smtplib.SMTPException, OSError: If the message can't be sent
         """
-        if self.no_email:
-            log.info('Email send disabled')
+        message = EmailMessage()
+        message['Subject'] = subject
+        message['From'] = from_addr
+        message['To'] = ', '.join(to_addrs)
+        message.set_content(msg)
+
+        with self._lock:
+            if not self._enabled():
+                log.info('Email send disabled')
+                return False
+            reconnected = self._smtp is None
+            while True:
+                if self._smtp is None:
+                    self._smtp = self._connect()
+                try:
+                    self._smtp.send_message(message, from_addr, to_addrs)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    self._smtp = None
+                    if reconnected:
+                        raise
+                    log.debug('SMTP session was closed by the server, reconnecting')
+                    reconnected = True
+        log.info(f"Email sent to {', '.join(to_addrs)}")
+        return True
+
+    def alert(self, fail_message: str) -> None:
+        """Queue a failure alert for the next digest."""
+        with self._lock:
+            self._alerts.append(fail_message)
+
+    def flush_alerts(self) -> None:
+        """Send queued failure alerts to the system admin as one email. Never raises."""
+        with self._lock:
+            alerts, self._alerts = self._alerts, []
+        if not alerts:
             return
+        if len(alerts) == 1:
+            subject, body = 'Error in podcast processing', alerts[0]
+        else:
+            subject = f'{len(alerts)} errors in podcast processing'
+            body = '\n\n'.join(f"===== Alert {i} of {len(alerts)} =====\n\n{alert}"
+                                for i, alert in enumerate(alerts, 1))
+        try:
+            self.send(to_addrs=[system_admin], subject=subject, msg=body)
+            log.info(f'Failure alert sent ({len(alerts)} coalesced)' if len(alerts) > 1
+                     else 'Failure alert sent')
+        except Exception as e:
+            log.error(f"Failed to send failure alert: {e}")
+
+    def close(self) -> None:
+        """Send any queued alerts and log out of the SMTP session."""
+        self.flush_alerts()
+        with self._lock:
+            smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Mailer shared by everything sent inside mail_session()
+_session: Mailer | None = None
+
+
+@contextmanager
+def mail_session(mailer: Mailer = None):
+    """
+    Share one Mailer for every email sent inside the block.
 
-        msg_root = EmailMessage()
-        msg_root['Subject'] = subject
-        msg_root['From'] = from_addr
-        msg_root['To'] = ', '.join(to_addrs)
-        msg_root.set_content(msg)
-
-        self.sendmail(from_addr, to_addrs, msg_root.as_string())
-        log.info(f"Email sent to {', '.join(to_addrs)}")
+    Notifications reuse its single SMTP login, and failure alerts are
+    coalesced into one digest sent when the outermost session ends (even
+    if the block raised). Nested sessions join the outer one.
+    """
+    global _session
+    if _session is not None:
+        yield _session
+        return
+    _session = mailer or Mailer()
+    try:
+        yield _session
+    finally:
+        mailer, _session = _session, None
+        mailer.close()
 
 
-def send_notification_email(email_list: list[str], new_ep_list: list[float], base_url: str,
-                           ep_titles: dict[float, str] = None) -> None:
+def notification_message(new_ep_list: list[float], base_url: str,
+                         ep_titles: dict[float, str] = None) -> tuple[str, str]:
     """
-    Send email notification about new episodes.
+    Build the subject and body of a new-episodes email.
 
     Args:
-        email_list: List of email addresses to notify
-        new_ep_list: List of new episode numbers
+        new_ep_list: List of new episode numbers (not empty)
         base_url: Base URL for episode links
         ep_titles: Optional dict mapping episode numbers to titles
+
+    Returns:
+        (subject, body)
     """
     new_count = len(new_ep_list)
-    if new_count == 0:
-        log.debug("No new episodes to notify about")
-        return
-
     subject = f'{new_count} new episodes are available' if new_count > 1 else 'New episode available'
 
     disclaimer = ('This email goes out just as the process begins, so transcripts may be delayed '
@@ -92,17 +195,37 @@ def send_notification_email(email_list: list[str], new_ep_list: list[float], bas
         else:
             payload += f"\n{base_url}/{ep_str}/episode/"
     payload += '\n' + disclaimer
+    return subject, payload
+
+
+def send_notification_email(email_list: list[str], new_ep_list: list[float], base_url: str,
+                           ep_titles: dict[float, str] = None) -> None:
+    """
+    Send email notification about new episodes, synchronously.
+
+    The pipeline queues notifications in the outbox instead (see
+    utils.outbox) so mail delivery can't hold up episode processing.
+
+    Args:
+        email_list: List of email addresses to notify
+        new_ep_list: List of new episode numbers
+        base_url: Base URL for episode links
+        ep_titles: Optional dict mapping episode numbers to titles
+    """
+    new_count = len(new_ep_list)
+    if new_count == 0:
+        log.debug("No new episodes to notify about")
+        return
 
+    subject, payload = notification_message(new_ep_list, base_url, ep_titles)
     log.info(f'Emailing {email_list} with {new_count} episodes...')
 
     try:
-        with FastMailSMTP() as server:
-            server.send_fm_message(
-                from_addr=system_admin,
-                to_addrs=email_list,
-                msg=payload,
-                subject=subject
-            )
+        if _session is not None:
+            _session.send(to_addrs=email_list, subject=subject, msg=payload)
+        else:
+            with Mailer() as mailer:
+                mailer.send(to_addrs=email_list, subject=subject, msg=payload)
         log.info('Notification email sent successfully')
     except Exception as e:
         log.error(f"Failed to send notification email: {e}")
@@ -113,20 +236,18 @@ def send_failure_alert(fail_message: str) -> None:
     """
     Send failure alert email to system admin.
 
+    Inside a mail_session the alert is queued and sent with any others as
+    one digest when the session ends; otherwise it is sent right away.
+
     Args:
         fail_message: Error message to send
     """
     log.warning(f"Sending failure alert: {fail_message}")
 
-    try:
-        with FastMailSMTP() as server:
-            server.send_fm_message(
-                from_addr=system_admin,
-                to_addrs=[system_admin],
-                msg=fail_message,
-                subject='Error in podcast processing'
-            )
-        log.info('Failure alert sent')
-    except Exception as e:
-        log.error(f"Failed to send failure alert: {e}")
-        # Don't raise - we don't want email failures to crash the pipeline
+    if _session is not None:
+        _session.alert(fail_message)
+        return
+    # Mailer.close() sends the alert and logs (doesn't raise) on failure, so
+    # email problems never crash the pipeline
+    with Mailer() as mailer:
+        mailer.alert(fail_message)
@@ -0,0 +1,104 @@
+"""File hash manifests for change detection in the site pipeline.
+
+A manifest maps each file's path (relative to a root directory, with forward
+slashes) to a short content digest. Comparing the manifest of a tree with the
+one saved after the last successful run tells the build, index and deploy
+steps exactly which files changed, without trusting mtimes.
+
+Files larger than HASH_SIZE_LIMIT (episode audio) are fingerprinted by size
+and mtime instead of content, so a manifest of a whole site stays cheap.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable
+
+# Files above this size are fingerprinted by size and mtime rather than hashed
+HASH_SIZE_LIMIT = 8 * 1024 * 1024
+
+
+def file_digest(path: Path, normalize: Callable[[str], str] = None) -> str:
+    """
+    Return a short digest of a file.
+
+    Args:
+        path: File to fingerprint
+        normalize: Optional function applied to the decoded text before hashing,
+            e.g. to drop lines that change on every run
+
+    Returns:
+        First 16 hex digits of the SHA-256 digest, or 'size-mtime_ns' for large files
+    """
+    st = path.stat()
+    if normalize is None and st.st_size > HASH_SIZE_LIMIT:
+        return f"{st.st_size}-{st.st_mtime_ns}"
+    if normalize is not None:
+        data = normalize(path.read_text(encoding='utf-8')).encode('utf-8')
+        return hashlib.sha256(data).hexdigest()[:16]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def build_manifest(root: Path, exclude: Iterable[str] = (),
+                   normalizers: dict[str, Callable[[str], str]] = None) -> dict[str, str]:
+    """
+    Fingerprint every file under root.
+
+    Args:
+        root: Directory to walk
+        exclude: Top-level entries (files or directories) to skip, e.g. build output
+        normalizers: {suffix: normalize} applied to matching files (see file_digest)
+
+    Returns:
+        {relative/path: digest}, sorted by path
+    """
+    root = Path(root)
+    exclude = set(exclude)
+    normalizers = normalizers or {}
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root)
+        if rel_dir == Path('.'):
+            dirnames[:] = [d for d in dirnames if d not in exclude]
+            filenames = [f for f in filenames if f not in exclude]
+        dirnames.sort()
+        for name in filenames:
+            path = Path(dirpath) / name
+            if not path.is_file():
+                continue
+            manifest[(rel_dir / name).as_posix()] = file_digest(path, normalizers.get(path.suffix))
+    return dict(sorted(manifest.items()))
+
+
+def diff_manifests(old: dict[str, str], new: dict[str, str]) -> tuple[list[str], list[str]]:
+    """Return (added or changed paths, removed paths) going from old to new."""
+    changed = [p for p, digest in new.items() if old.get(p) != digest]
+    removed = [p for p in old if p not in new]
+    return changed, removed
+
+
+def load_manifest(path: Path) -> dict[str, str]:
+    """Load a saved manifest, or an empty one if it doesn't exist or is unreadable."""
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(path: Path, manifest: dict[str, str]) -> None:
+    """Write a manifest atomically (temp file in the same directory, then rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix='.tmp-', suffix=path.name, dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=0, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,268 @@
+"""Persistent email outbox, drained by a background thread.
+
+Sending mail inline put SMTP latency, stalls and retries on the episode
+pipeline's critical path. Instead, messages are written to an outbox table in
+the pipeline state database (a fast local insert) and a daemon thread started
+by outbox_worker() delivers them while the pipeline carries on.
+
+Messages stay in the outbox until delivered: a failed send is retried with
+exponential backoff, and anything still undelivered when the run ends (or the
+process dies) is sent by the next run's worker. After MAX_ATTEMPTS failures a
+message is marked failed and left for inspection. Each message is claimed
+before it is sent, so workers of overlapping runs never send it twice.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from loguru import logger as log
+
+from constants import PIPELINE_STATE_DB
+from utils import email as email_utils
+from utils.email import Mailer
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+# Delivery attempts before a message is given up on
+MAX_ATTEMPTS = 8
+# First retry delay in seconds, doubled per failed attempt (capped at RETRY_MAX)
+RETRY_BASE = 60
+RETRY_MAX = 6 * 3600
+# Seconds a claimed message is reserved for its worker; if the worker dies
+# mid-send the message becomes due again after this
+CLAIM_LEASE = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    to_addrs        TEXT NOT NULL,
+    subject         TEXT NOT NULL,
+    body            TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    created_at      TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    sent_at         TEXT,
+    error           TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, next_attempt_at);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    to_addrs: list[str]
+    subject: str
+    body: str
+    attempts: int
+
+
+class Outbox:
+    """
+    Queued outgoing emails backed by SQLite.
+
+    Connections are opened per operation, so the pipeline thread can queue
+    messages while the worker thread delivers them.
+    """
+
+    def __init__(self, db_path: str | Path = PIPELINE_STATE_DB):
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def put(self, to_addrs: list[str], subject: str, body: str) -> int:
+        """Queue a message for delivery. Returns its id."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO outbox (to_addrs, subject, body, status, created_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (json.dumps(to_addrs), subject, body, PENDING, _now(), time.time()))
+        return cur.lastrowid
+
+    def due(self) -> list[OutboxMessage]:
+        """Return messages whose next attempt is due (including expired claims), oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, to_addrs, subject, body, attempts FROM outbox "
+                "WHERE status IN (?, ?) AND next_attempt_at <= ? ORDER BY id",
+                (PENDING, SENDING, time.time())).fetchall()
+        return [OutboxMessage(row[0], json.loads(row[1]), row[2], row[3], row[4]) for row in rows]
+
+    def claim(self, message_id: int) -> bool:
+        """
+        Reserve a due message for sending, for CLAIM_LEASE seconds.
+
+        The check and the update are one statement, so when workers in
+        overlapping runs share the database only one of them gets the message.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? "
+                "WHERE id = ? AND status IN (?, ?) AND next_attempt_at <= ?",
+                (SENDING, now + CLAIM_LEASE, message_id, PENDING, SENDING, now))
+        return cur.rowcount == 1
+
+    def mark_sent(self, message_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE outbox SET status = ?, sent_at = ?, attempts = attempts + 1, "
+                         "error = NULL WHERE id = ?", (SENT, _now(), message_id))
+
+    def mark_failed(self, message: OutboxMessage, error: str) -> None:
+        """Record a failed attempt: schedule a retry with backoff, or give up after MAX_ATTEMPTS."""
+        attempts = message.attempts + 1
+        status = FAILED if attempts >= MAX_ATTEMPTS else PENDING
+        delay = min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+        with self._connect() as conn:
+            conn.execute("UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, error = ? "
+                         "WHERE id = ?", (status, attempts, time.time() + delay, error, message.id))
+
+    def counts(self) -> dict[str, int]:
+        """Return {status: number of messages}."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def drain(self, mailer: Mailer) -> tuple[int, int]:
+        """
+        Try to deliver every due message once.
+
+        Returns:
+            (messages sent, attempts failed)
+        """
+        sent = failed = 0
+        for message in self.due():
+            if not self.claim(message.id):
+                continue  # another worker got it first
+            try:
+                mailer.send(to_addrs=message.to_addrs, subject=message.subject, msg=message.body)
+            except Exception as e:
+                self.mark_failed(message, f"{type(e).__name__}: {e}")
+                log.warning(f"Outbox message {message.id} ({message.subject!r}) not sent: {e}")
+                failed += 1
+                continue
+            # A disabled mailer (.no_email, no password) counts as handled, as before
+            self.mark_sent(message.id)
+            sent += 1
+        return sent, failed
+
+
+class OutboxWorker(threading.Thread):
+    """Daemon thread that drains an outbox when woken and every poll_interval seconds."""
+
+    def __init__(self, outbox: Outbox, mailer: Mailer, poll_interval: float = 30):
+        super().__init__(name='outbox-worker', daemon=True)
+        self.outbox = outbox
+        self.mailer = mailer
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _drain(self) -> None:
+        try:
+            sent, _ = self.outbox.drain(self.mailer)
+            if sent:
+                log.info(f"Outbox: sent {sent} message{'s' if sent > 1 else ''}")
+        except Exception as e:
+            log.error(f"Outbox worker error: {e}")
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.clear()
+            self._drain()
+            self._wake.wait(self.poll_interval)
+        # Final pass for anything queued while the last one was sending
+        self._drain()
+
+    def stop(self, timeout: float) -> bool:
+        """Drain once more and stop. Returns False if still busy after timeout."""
+        self._stopping.set()
+        self._wake.set()
+        self.join(timeout)
+        return not self.is_alive()
+
+
+# Worker started by the outermost outbox_worker() block
+_worker: OutboxWorker | None = None
+
+
+def queue_email(to_addrs: list[str], subject: str, body: str, outbox: Outbox = None) -> int:
+    """
+    Queue an email and return immediately; the running worker is woken to send it.
+
+    Without a running worker the message waits in the outbox for the next one.
+
+    Returns:
+        Outbox message id
+    """
+    outbox = outbox or (_worker.outbox if _worker is not None else Outbox())
+    message_id = outbox.put(to_addrs, subject, body)
+    if _worker is not None:
+        _worker.wake()
+    else:
+        log.info(f"Queued email {message_id}; it will be sent by the next outbox worker")
+    return message_id
+
+
+@contextmanager
+def outbox_worker(outbox: Outbox = None, mailer: Mailer = None,
+                  poll_interval: float = 30, shutdown_timeout: float = 60):
+    """
+    Deliver queued email in a background thread for the duration of the block.
+
+    The worker first sends anything left over from earlier runs. On exit it
+    makes a final pass, waiting at most shutdown_timeout seconds; whatever
+    isn't delivered by then stays queued for the next run. Nested blocks
+    join the outer worker.
+
+    Args:
+        outbox: Outbox to drain (default: the one in the pipeline state database)
+        mailer: Mailer to send with (default: the mail_session's, or a new one)
+        poll_interval: Seconds between retries of due messages
+        shutdown_timeout: Longest wait for the final pass on exit
+    """
+    global _worker
+    if _worker is not None:
+        yield _worker
+        return
+    own_mailer = mailer is None and email_utils._session is None
+    mailer = mailer or email_utils._session or Mailer()
+    _worker = OutboxWorker(outbox or Outbox(), mailer, poll_interval)
+    _worker.start()
+    try:
+        yield _worker
+    finally:
+        worker, _worker = _worker, None
+        if not worker.stop(shutdown_timeout):
+            log.warning(f"Outbox still sending after {shutdown_timeout}s; "
+                        f"undelivered mail stays queued for the next run")
+        elif own_mailer:
+            mailer.close()
+        counts = worker.outbox.counts()
+        pending = counts.get(PENDING, 0) + counts.get(SENDING, 0)
+        if pending:
+            log.warning(f"{pending} email{'s' if pending > 1 else ''} waiting in the outbox for retry")
@@ -0,0 +1,265 @@
+"""SQLite-backed pipeline state for podcast episode processing.
+
+Replaces inferring stage completion from scattered files (episode.mp3,
+episode-transcribed.json, speaker-map.json, site episode.md and
+{podcast}-notified.json) with one embedded database. Every stage run is
+recorded with its timestamps, duration, input hash and error, so questions
+like "which episodes need attribution" are a single indexed query and stage
+timing history is kept for free.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from loguru import logger as log
+
+from constants import PIPELINE_STATE_DB
+
+# Episode stages in pipeline order. An episode is complete once published
+# (episode.md copied into the site directory); 'shownotes' marks that its
+# pages carry per-episode show notes, which may only arrive after publishing.
+STAGES = ('download', 'transcribe', 'attribute', 'markdown', 'publish', 'shownotes')
+
+OK = 'ok'
+FAILED = 'failed'
+PENDING = 'pending'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episode_stage (
+    podcast     TEXT NOT NULL,
+    episode     REAL NOT NULL,
+    stage       TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    started_at  TEXT,
+    finished_at TEXT,
+    duration_s  REAL,
+    input_hash  TEXT,
+    error       TEXT,
+    PRIMARY KEY (podcast, episode, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_episode_stage_status
+    ON episode_stage (podcast, stage, status);
+
+CREATE TABLE IF NOT EXISTS stage_history (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    podcast     TEXT NOT NULL,
+    episode     REAL NOT NULL,
+    stage       TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    started_at  TEXT,
+    finished_at TEXT,
+    duration_s  REAL,
+    input_hash  TEXT,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stage_history_episode
+    ON stage_history (podcast, episode);
+
+CREATE TABLE IF NOT EXISTS notified (
+    podcast     TEXT NOT NULL,
+    episode     REAL NOT NULL,
+    notified_at TEXT,
+    PRIMARY KEY (podcast, episode)
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def hash_inputs(*inputs) -> str:
+    """
+    Compute a short digest over stage inputs.
+
+    Path arguments contribute their file contents (read in 1 MB chunks);
+    anything else contributes its string form. Missing files hash as empty.
+
+    Returns:
+        First 16 hex digits of the SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for item in inputs:
+        if isinstance(item, Path):
+            if item.exists():
+                with open(item, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(chunk)
+        else:
+            digest.update(str(item).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class PipelineState:
+    """
+    Per-episode stage records backed by SQLite.
+
+    Connections are opened per operation, so a single instance is safe to
+    share between a flow and the task threads it submits.
+    """
+
+    def __init__(self, db_path: str | Path = PIPELINE_STATE_DB):
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, podcast: str, episode: float, stage: str, status: str, *,
+               started_at: str = None, duration: float = None,
+               input_hash: str = None, error: str = None) -> None:
+        """
+        Record the outcome of a stage run, replacing the previous current state.
+
+        Args:
+            podcast: Podcast name
+            episode: Episode number
+            stage: One of STAGES
+            status: OK, FAILED or PENDING
+            started_at: ISO timestamp the run started (defaults to now)
+            duration: Run time in seconds
+            input_hash: Digest of the stage inputs (see hash_inputs)
+            error: Error message for failed runs
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        finished_at = _now()
+        row = (podcast, float(episode), stage, status, started_at or finished_at,
+               finished_at, duration, input_hash, error)
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO episode_stage (podcast, episode, stage, status, started_at, '
+                'finished_at, duration_s, input_hash, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', row)
+            conn.execute(
+                'INSERT INTO stage_history (podcast, episode, stage, status, started_at, '
+                'finished_at, duration_s, input_hash, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', row)
+
+    @contextmanager
+    def track(self, podcast: str, episode: float, stage: str, input_hash: str = None):
+        """
+        Time the enclosed block and record it as a stage run.
+
+        Exceptions are recorded as FAILED with their message and re-raised.
+        """
+        started_at = _now()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(podcast, episode, stage, FAILED, started_at=started_at,
+                        duration=time.monotonic() - start, input_hash=input_hash,
+                        error=f"{type(e).__name__}: {e}")
+            raise
+        self.record(podcast, episode, stage, OK, started_at=started_at,
+                    duration=time.monotonic() - start, input_hash=input_hash)
+
+    def stage_statuses(self, podcast: str, stage: str) -> dict[float, str]:
+        """Return {episode: status} for every episode with a record of this stage."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT episode, status FROM episode_stage WHERE podcast = ? AND stage = ?',
+                (podcast, stage)).fetchall()
+        return {row['episode']: row['status'] for row in rows}
+
+    def episodes_with(self, podcast: str, stage: str, status: str = OK) -> set[float]:
+        """Return episode numbers whose current state for a stage has the given status."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT episode FROM episode_stage WHERE podcast = ? AND stage = ? AND status = ?',
+                (podcast, stage, status)).fetchall()
+        return {row['episode'] for row in rows}
+
+    def pending(self, podcast: str, stage: str) -> list[float]:
+        """
+        Return episodes ready for a stage: the previous stage succeeded but this one hasn't.
+
+        For example pending('tgn', 'attribute') lists transcribed episodes that
+        still need speaker attribution.
+        """
+        index = STAGES.index(stage)
+        if index == 0:
+            raise ValueError(f"'{stage}' is the first stage and has no prerequisite")
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT prev.episode FROM episode_stage AS prev '
+                'LEFT JOIN episode_stage AS cur ON cur.podcast = prev.podcast '
+                'AND cur.episode = prev.episode AND cur.stage = ? AND cur.status = ? '
+                'WHERE prev.podcast = ? AND prev.stage = ? AND prev.status = ? '
+                'AND cur.episode IS NULL ORDER BY prev.episode',
+                (stage, OK, podcast, STAGES[index - 1], OK)).fetchall()
+        return [row['episode'] for row in rows]
+
+    def episode_status(self, podcast: str, episode: float) -> dict[str, dict]:
+        """Return the current record of each stage for an episode, keyed by stage."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT * FROM episode_stage WHERE podcast = ? AND episode = ?',
+                (podcast, float(episode))).fetchall()
+        return {row['stage']: dict(row) for row in rows}
+
+    def history(self, podcast: str, episode: float) -> list[dict]:
+        """Return every recorded stage run for an episode, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT * FROM stage_history WHERE podcast = ? AND episode = ? ORDER BY id',
+                (podcast, float(episode))).fetchall()
+        return [dict(row) for row in rows]
+
+    def reset(self, podcast: str, episode: float, stages: list[str]) -> None:
+        """
+        Mark stages as PENDING so the next pipeline run redoes them.
+
+        The episode's publish and shownotes stages are always reset too, which
+        makes filter_incomplete_episodes pick it up again and the shownotes
+        backfill re-check the regenerated pages.
+        """
+        stages = list(dict.fromkeys([*stages, 'publish', 'shownotes']))
+        for stage in stages:
+            self.record(podcast, episode, stage, PENDING)
+
+    def notified_episodes(self, podcast: str) -> set[float]:
+        """Return episode numbers that have already been announced by email."""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT episode FROM notified WHERE podcast = ?', (podcast,)).fetchall()
+        return {row['episode'] for row in rows}
+
+    def mark_notified(self, podcast: str, episodes) -> None:
+        """Record episodes as announced."""
+        now = _now()
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO notified (podcast, episode, notified_at) VALUES (?, ?, ?)',
+                [(podcast, float(ep), now) for ep in episodes])
+
+    def import_notified_json(self, podcast: str, json_path: Path) -> int:
+        """
+        Seed the notified table from a legacy {podcast}-notified.json file.
+
+        Returns:
+            Number of episodes imported (0 if the file doesn't exist)
+        """
+        if not json_path.exists():
+            return 0
+        episodes = json.loads(json_path.read_text())
+        self.mark_notified(podcast, episodes)
+        log.info(f"Imported {len(episodes)} notified episodes for {podcast} from {json_path}")
+        return len(episodes)
+
+    def forget_podcast(self, podcast: str) -> None:
+        """Delete every record for a podcast (used to reset mock runs)."""
+        with self._connect() as conn:
+            for table in ('episode_stage', 'stage_history', 'notified'):
+                conn.execute(f'DELETE FROM {table} WHERE podcast = ?', (podcast,))
@@ -0,0 +1,138 @@
+"""Mergeable distinct counting: exact for small sets, HyperLogLog beyond.
+
+Traffic reports count unique client IPs per day, per week and overall.
+Holding every IP string in a set per bucket multiplies memory by the number
+of buckets, so a UniqueCounter keeps an exact set only up to exact_limit
+items and then switches to a HyperLogLog sketch of 2**precision one-byte
+registers (16 KB at the default precision, relative standard error ~0.8%).
+
+Counters merge (update / |=) whatever their state, so partial counts from
+different log files or days combine into the count of the union. Hashes are
+stable across processes (blake2b, not hash()), so counters can be built in
+worker processes and persisted.
+"""
+import base64
+import hashlib
+import math
+import zlib
+
+# Default register count exponent: 16384 registers, 1.04/sqrt(m) = 0.81% error
+PRECISION = 14
+# Sets up to this size are kept exactly; a sketch is smaller beyond it
+EXACT_LIMIT = 1024
+
+
+def _hash64(item: str) -> int:
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class UniqueCounter:
+    """
+    Count distinct strings, exactly while few, approximately (HyperLogLog) after.
+
+    Args:
+        precision: log2 of the number of sketch registers (4-16)
+        exact_limit: Items kept exactly before switching to the sketch;
+            None never switches (always exact)
+    """
+
+    def __init__(self, precision: int = PRECISION, exact_limit: int | None = EXACT_LIMIT):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, got {precision}")
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self._items: set[str] | None = set()
+        self._registers: bytearray | None = None
+
+    @property
+    def is_exact(self) -> bool:
+        """True while the count is exact (no sketch yet)."""
+        return self._registers is None
+
+    def add(self, item: str) -> None:
+        """Count an item."""
+        if self._registers is None:
+            self._items.add(item)
+            if self.exact_limit is not None and len(self._items) > self.exact_limit:
+                self._to_sketch()
+        else:
+            self._add_hash(_hash64(item))
+
+    def _add_hash(self, h: int) -> None:
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def _to_sketch(self) -> None:
+        self._registers = bytearray(1 << self.precision)
+        for item in self._items:
+            self._add_hash(_hash64(item))
+        self._items = None
+
+    def update(self, other: 'UniqueCounter') -> 'UniqueCounter':
+        """Merge another counter into this one (count of the union)."""
+        if other._registers is None:
+            for item in other._items:
+                self.add(item)
+            return self
+        if other.precision != self.precision:
+            raise ValueError(f"can't merge precision {other.precision} into {self.precision}")
+        if self._registers is None:
+            self._to_sketch()
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    __ior__ = update
+
+    def count(self) -> int:
+        """Return the (estimated) number of distinct items."""
+        if self._registers is None:
+            return len(self._items)
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return round(estimate)
+
+    __len__ = count
+
+    def error_bound(self) -> float:
+        """Relative standard error of count(): 0.0 while exact, else 1.04/sqrt(registers)."""
+        if self._registers is None:
+            return 0.0
+        return 1.04 / math.sqrt(len(self._registers))
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable form (see from_dict)."""
+        data = {'precision': self.precision, 'exact_limit': self.exact_limit}
+        if self._registers is None:
+            data['items'] = sorted(self._items)
+        else:
+            data['registers'] = base64.b64encode(zlib.compress(bytes(self._registers))).decode('ascii')
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'UniqueCounter':
+        """Rebuild a counter saved with to_dict."""
+        counter = cls(data['precision'], data['exact_limit'])
+        if 'registers' in data:
+            counter._items = None
+            counter._registers = bytearray(zlib.decompress(base64.b64decode(data['registers'])))
+        else:
+            counter._items = set(data['items'])
+        return counter
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, UniqueCounter):
+            return NotImplemented
+        return (self.precision, self._items, self._registers) == \
+               (other.precision, other._items, other._registers)
+
+    def __repr__(self) -> str:
+        kind = 'exact' if self.is_exact else f'±{self.error_bound():.1%}'
+        return f"UniqueCounter({self.count()}, {kind})"